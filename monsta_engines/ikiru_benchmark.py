@@ -0,0 +1,235 @@
+import os
+import io
+import sys
+import json
+import time
+import random
+import itertools
+import shutil
+import platform
+import tempfile
+import statistics
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from ikiru_htmlParser import parse_html, get_backend
+from ikiru_httpClient import extract_panel_urls
+from ikiru_crawlerV1 import extract_listing_items
+from ikiru_scraperV2CATBOX import clean_text, extract_number, find_cover_url, extract_synopsis, \
+    collect_chapter_links, fetch_panel_bytes
+from ikiru_compactFormat import serialize, decode_series, FORMAT_READABLE, FORMAT_COMPACT
+from ikiru_seriesStore import SeriesStore
+from ikiru_uploadToGitHub import summarize_series_file
+from ikiru_panelPipeline import run_panel_pipeline, DOWNLOAD_WORKERS, UPLOAD_WORKERS
+from ikiru_stubServer import start_stub_server
+
+# ==============================================================================
+# MONSTA BENCHMARK: UKUR OFFLINE DARI FIXTURE IKIRU (V1.0)
+# ------------------------------------------------------------------------------
+# 1. PARSING: Listing (ikirupage*.html), detail (cover, sinopsis, chapter),
+#    reader (panel) memakai fungsi asli crawler / worker / HTTP client.
+# 2. UTILITAS: extract_number & clean_text pada ribuan string sintetis.
+# 3. SERIALISASI: Database sintetis berskala (kecil/sedang/besar) ditulis
+#    readable & compact, dibaca ulang, ditulis via SeriesStore, dan diindeks.
+# 4. PIPELINE: Download -> upload panel melawan ikiru_stubServer (127.0.0.1).
+# 5. JSON REPORT: Hasil ke runtime/benchmark/; beri file baseline sebagai
+#    argumen untuk menandai regresi (exit 1 jika lebih lambat dari toleransi).
+#
+# Pemakaian: python ikiru_benchmark.py [baseline.json]
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime", "benchmark")
+
+REPEAT = 5                      # Putaran per kasus (median yang dilaporkan)
+REGRESSION_TOLERANCE = 0.20     # >20% lebih lambat dari baseline = regresi
+
+# Skala database sintetis: (nama, jumlah chapter, panel per chapter)
+DB_SCALES = [("small", 50, 40), ("medium", 300, 45), ("large", 1000, 50)]
+
+# Stub host panel
+STUB_PANELS = 120
+STUB_LATENCY_MS = 10            # Meniru RTT per request
+
+def load_fixture(name):
+    with open(os.path.join(BASE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def measure(name, fn, units=1, repeat=REPEAT):
+    """Menjalankan fn() sebanyak repeat kali (log forensik dibungkam), return ringkasan."""
+    times = []
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    result = {
+        "case": name,
+        "repeat": repeat,
+        "units": units,
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(median * 1000, 3),
+        "units_per_s": round(units / median, 1) if median else None,
+    }
+    print(f"   [BENCH] {name:<32} median {result['median_ms']:>10.2f} ms | {result['units_per_s']} unit/s")
+    return result
+
+# --- DATABASE SINTETIS ---
+
+def synthetic_series(slug, chapters, panels, seed=7):
+    rng = random.Random(seed)
+    return {
+        "slug": slug,
+        "title": slug.replace("-", " ").title(),
+        "cover": f"https://files.catbox.moe/{rng.getrandbits(32):08x}.webp",
+        "metadata": {"synopsis": "Lorem ipsum dolor sit amet. " * 20},
+        "chapters": [
+            {
+                "ch_num": float(n),
+                "release_date": "2025-01-01 00:00:00",
+                "images": [f"https://files.catbox.moe/{rng.getrandbits(24):06x}.jpg" for _ in range(panels)],
+            }
+            for n in range(chapters, 0, -1)
+        ],
+        "last_updated": "2025-01-01 00:00:00",
+    }
+
+# --- KASUS BENCHMARK ---
+
+def bench_parsing():
+    listing_pages = [load_fixture(f"ikirupage{i}.html") for i in range(1, 7)]
+    details = [load_fixture(f"ikiru-sample{i}-detail.html") for i in range(1, 4)]
+    readers = [load_fixture(f"ikiru-sample{i}-reader.html") for i in range(1, 4)]
+
+    def listing():
+        for html in listing_pages:
+            extract_listing_items(html)
+
+    def detail():
+        for html in details:
+            soup = parse_html(html)
+            find_cover_url(soup)
+            extract_synopsis(soup)
+            collect_chapter_links(soup)
+
+    def reader():
+        for html in readers:
+            extract_panel_urls(html, strict=True)
+
+    return [
+        measure("parse.listing", listing, units=len(listing_pages)),
+        measure("parse.detail", detail, units=len(details)),
+        measure("parse.reader", reader, units=len(readers)),
+    ]
+
+def bench_text_utils():
+    rng = random.Random(3)
+    labels = [f"Chapter {rng.randint(1, 900)}{rng.choice(['', '.5', ' END', ' - Part 2'])}" for _ in range(20000)]
+    blurbs = [f"<p>Sinopsis\n\t  {'kata ' * rng.randint(5, 60)}</p>" for _ in range(5000)]
+    return [
+        measure("text.extract_number", lambda: [extract_number(t) for t in labels], units=len(labels)),
+        measure("text.clean_text", lambda: [clean_text(t) for t in blurbs], units=len(blurbs)),
+    ]
+
+def bench_serialization():
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="monsta_bench_")
+    try:
+        for scale, chapters, panels in DB_SCALES:
+            data = synthetic_series(f"bench-{scale}", chapters, panels)
+            readable = serialize(data, FORMAT_READABLE)
+            compact = serialize(data, FORMAT_COMPACT)
+            results.append(measure(f"db.{scale}.dump_readable", lambda: serialize(data, FORMAT_READABLE)))
+            results.append(measure(f"db.{scale}.dump_compact", lambda: serialize(data, FORMAT_COMPACT)))
+            results.append(measure(f"db.{scale}.load_compact", lambda: decode_series(json.loads(compact))))
+            results[-1]["bytes_readable"] = len(readable.encode('utf-8'))
+            results[-1]["bytes_compact"] = len(compact.encode('utf-8'))
+
+            store = SeriesStore(data['slug'], work_dir, use_wal=False)
+            results.append(measure(f"db.{scale}.store_save", lambda: store.save_meta(data)))
+            results.append(measure(f"db.{scale}.store_load", lambda: store.load()))
+            results.append(measure(f"db.{scale}.index_summary",
+                                   lambda: summarize_series_file(store.single_path)))
+
+            new_nums = itertools.count(chapters + 1)
+
+            def append_chapter():
+                wal_store = SeriesStore(data['slug'], work_dir, wal_dir=os.path.join(work_dir, "wal"))
+                live = wal_store.load()
+                wal_store.add_chapter(live, {"ch_num": float(next(new_nums)), "release_date": "", "images": []})
+                wal_store.compact(wal_store.load())
+            results.append(measure(f"db.{scale}.append_chapter", append_chapter))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def bench_pipeline():
+    server = start_stub_server(latency_ms=STUB_LATENCY_MS)
+    base = server.base_url
+    panel_urls = [f"{base}/cdn.uqni.net/bench/{i:03d}.jpg" for i in range(STUB_PANELS)]
+
+    import requests
+    upload_session = requests.Session()
+
+    def upload_fn(p_idx, p_url, img_bytes):
+        # Tanpa upload cache: yang diukur murni throughput pipeline
+        resp = upload_session.post(f"{base}/user/api.php", files={"fileToUpload": (f"panel_{p_idx}.jpg", img_bytes)}, timeout=30)
+        return resp.text.strip() if resp.status_code == 200 else None
+
+    def run():
+        links = run_panel_pipeline(panel_urls, fetch_panel_bytes, upload_fn,
+                                   DOWNLOAD_WORKERS, UPLOAD_WORKERS)
+        assert all(links), "Stub host gagal melayani sebagian panel"
+
+    try:
+        result = measure("pipeline.panels", run, units=len(panel_urls), repeat=3)
+        result.update({"download_workers": DOWNLOAD_WORKERS, "upload_workers": UPLOAD_WORKERS,
+                       "panel_bytes": len(server.panel), "latency_ms": STUB_LATENCY_MS})
+        return [result]
+    finally:
+        server.shutdown()
+
+# --- LAPORAN & PERBANDINGAN ---
+
+def compare_with_baseline(report, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['case']: r for r in json.load(f)['results']}
+    regressions = []
+    for result in report['results']:
+        old = baseline.get(result['case'])
+        if not old or not old['median_ms']:
+            continue
+        ratio = result['median_ms'] / old['median_ms']
+        if ratio > 1 + REGRESSION_TOLERANCE:
+            regressions.append(result['case'])
+            print(f"   [REGRESI] {result['case']}: {old['median_ms']} ms -> {result['median_ms']} ms (x{ratio:.2f})")
+    return regressions
+
+def run_benchmark(baseline_path=None):
+    print("=== MONSTA BENCHMARK: OFFLINE FIXTURE SUITE ===")
+    print(f"[*] Parser backend: {get_backend().name}")
+    results = bench_parsing() + bench_text_utils() + bench_serialization() + bench_pipeline()
+
+    report = {
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parser_backend": get_backend().name,
+        "results": results,
+    }
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    out_path = os.path.join(REPORT_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Laporan JSON: {out_path}")
+
+    if baseline_path:
+        regressions = compare_with_baseline(report, baseline_path)
+        print(f"[BASELINE] {len(regressions)} regresi (toleransi {int(REGRESSION_TOLERANCE*100)}%).")
+        return not regressions
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None) else 1)
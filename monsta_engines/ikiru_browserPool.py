@@ -0,0 +1,143 @@
+import os
+import asyncio
+import threading
+from playwright.async_api import async_playwright
+from ikiru_httpClient import SOURCE_BASE, USER_AGENT, SETTLE_TIMEOUT_MS, SETTLE_JS
+from ikiru_rateLimiter import rate_limiter
+
+# ==============================================================================
+# MONSTA BROWSER POOL: N TAB DALAM SATU CHROMIUM (V1.0)
+# ------------------------------------------------------------------------------
+# 1. SATU PROSES: Hanya satu browser Chromium, berisi N context + page.
+# 2. EVENT LOOP KHUSUS: async_playwright berjalan di thread "browser_pool";
+#    thread worker memanggil fasad sinkron yang aman lintas thread.
+# 3. LAZY LAUNCH: Chromium baru dinyalakan saat jalur cepat HTTP gagal,
+#    jadi node yang 100% fast path tidak pernah membuka browser.
+# 4. TAB BEBAS: Setiap panggilan meminjam page yang sedang nganggur.
+# 5. TANPA SLEEP TETAP: Navigasi dipacu rate limiter, lazy-load ditunggu
+#    sampai src gambar terisi (bukan asyncio.sleep 2 / 0.7 detik).
+# 6. START GAGAL = BERSIH: Jika launch/context gagal di tengah jalan, driver
+#    Playwright & Chromium yang sudah hidup langsung ditutup.
+# ==============================================================================
+
+REFERER = SOURCE_BASE + "/"
+
+# Jumlah tab paralel default = jumlah core CPU
+PAGE_POOL_SIZE = max(1, os.cpu_count() or 1)
+
+class BrowserPool:
+    def __init__(self, size=PAGE_POOL_SIZE, headless=True):
+        self.size = size
+        self.headless = headless
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="browser_pool", daemon=True)
+        self._thread.start()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    # --- INFRASTRUKTUR LOOP ---
+
+    def _run(self, coro):
+        """Menjalankan coroutine di loop browser dan menunggu hasilnya (blocking)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if not self._started:
+                print(f"      [BROWSER] Menyalakan Chromium dengan {self.size} tab paralel...")
+                self._run(self._start())
+                self._started = True
+
+    async def _start(self):
+        self._pw = await async_playwright().start()
+        self._browser = None
+        try:
+            self._browser = await self._pw.chromium.launch(headless=self.headless)
+            self._free_pages = asyncio.Queue()
+            for _ in range(self.size):
+                context = await self._browser.new_context(
+                    user_agent=USER_AGENT,
+                    viewport={'width': 1920, 'height': 1080}
+                )
+                await context.set_extra_http_headers({"Referer": REFERER})
+                await self._free_pages.put(await context.new_page())
+        except BaseException:
+            # close() hanya memanggil _stop jika _started, jadi bereskan di sini
+            print("      [BROWSER] Gagal menyalakan Chromium, driver dibersihkan.")
+            await self._stop()
+            raise
+
+    async def _with_page(self, job):
+        page = await self._free_pages.get()
+        try:
+            return await job(page)
+        finally:
+            self._free_pages.put_nowait(page)
+
+    def close(self):
+        if self._started:
+            self._run(self._stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _stop(self):
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+        finally:
+            await self._pw.stop()
+
+    # --- FASAD SINKRON (DIPANGGIL DARI THREAD WORKER) ---
+
+    def render_detail(self, url):
+        """Laman detail lengkap: networkidle + klik HTMX Chapters + scroll End."""
+        self._ensure_started()
+        rate_limiter.acquire(url)
+        return self._run(self._with_page(lambda page: self._render_detail(page, url)))
+
+    def render_reader(self, url):
+        """Laman reader: domcontentloaded + scroll lazy-load + tunggu section panel."""
+        self._ensure_started()
+        rate_limiter.acquire(url)
+        return self._run(self._with_page(lambda page: self._render_reader(page, url)))
+
+    async def _settle(self, page, img_selector):
+        """Menunggu lazy-load mengisi src gambar (selesai secepat laman siap)."""
+        try:
+            await page.wait_for_function(SETTLE_JS, arg=img_selector, timeout=SETTLE_TIMEOUT_MS)
+        except Exception:
+            pass
+
+    async def _render_detail(self, page, url):
+        await page.goto(url, timeout=60000, wait_until="networkidle")
+
+        # HTMX Trigger (Anti-Zonk Chapter)
+        try:
+            htmx_btn = page.locator("button[data-key='chapters']").first
+            if await htmx_btn.is_visible():
+                print("      [ACTION] Klik Tombol HTMX Chapters...")
+                await htmx_btn.click()
+                print("      [WAIT] Menunggu AJAX Render Daftar...")
+                await page.wait_for_selector("div[data-chapter-number]", timeout=15000)
+                print("      [SUCCESS] Daftar Chapter muncul di DOM.")
+        except Exception as e_htmx:
+            print(f"      [INFO] HTMX Trigger Skip: {e_htmx}")
+
+        # Backup Scroll
+        await page.keyboard.press("End")
+        await self._settle(page, "div[itemprop='image'] img")
+        return await page.content()
+
+    async def _render_reader(self, page, url):
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        # Scroll Lazy Load
+        for _ in range(3):
+            await page.mouse.wheel(0, 1500)
+        await self._settle(page, "section[data-image-data='1'] img")
+
+        # Tunggu Reader Section
+        try:
+            await page.wait_for_selector("section[data-image-data='1'] img", timeout=15000)
+        except Exception:
+            pass
+        return await page.content()
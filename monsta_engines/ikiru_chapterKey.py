@@ -0,0 +1,184 @@
+import re
+import bisect
+from functools import total_ordering
+
+# ==============================================================================
+# MONSTA CHAPTER KEY: NORMALISASI NOMOR CHAPTER + INDEX TERURUT (V1.0)
+# ------------------------------------------------------------------------------
+# 1. SATU ATURAN PARSE: "10.5", "10-5", "Chapter 10 Part 2", "Ch. 10 Extra"
+#    dibaca konsisten lewat extract_number() (sebelumnya setiap bot punya
+#    regex sendiri).
+# 2. FLOAT TETAP: Kunci dikembalikan ke float ch_num (schema database lama).
+#    Pecahan dibagi slot lebar tetap: .MMM (minor) PP (part) E (extra), jadi
+#    10.2 -> 10.2 | 10 Part 2 -> 10.00002 | Part 11 -> 10.00011 | Extra -> +0.000001
+#    (part & extra tidak pernah bentrok dengan chapter desimal sungguhan).
+# 3. CHAPTER INDEX: Daftar chapter tetap urut menurun via bisect.insort +
+#    set ch_num, jadi cek "sudah ada?" O(1) dan tambah chapter tanpa re-sort.
+# ==============================================================================
+
+MINOR_DIGITS = 3                # 10.5 / 10.25 / 10.125 (digit ke-4 dst. dibuang)
+PART_DIGITS = 2                 # Part 1..99
+VALUE_PRECISION = MINOR_DIGITS + PART_DIGITS + 1
+PART_STEP = 10 ** -(MINOR_DIGITS + PART_DIGITS)
+EXTRA_STEP = 10 ** -VALUE_PRECISION   # Extra/special tepat sesudah chapter/part induk
+MAX_PART = 10 ** PART_DIGITS - 1
+
+PREFIX_RE = re.compile(r'(?:chapter|chap|ch|episode|ep)\.?\s*(\d+)(?:[.\-_](\d+))?', re.I)
+NUMBER_RE = re.compile(r'(\d+)(?:[.\-_](\d+))?')
+PART_RE = re.compile(r'\b(?:part|pt)\.?\s*(\d+)', re.I)
+EXTRA_RE = re.compile(r'\b(?:extra|special|side\s*story|bonus|omake)\b', re.I)
+
+@total_ordering
+class ChapterKey:
+    """Nomor chapter ternormalisasi. Perbandingan & hash memakai nilai float-nya."""
+
+    __slots__ = ("major", "minor", "part", "extra")
+
+    def __init__(self, major=0, minor="", part=0, extra=False):
+        self.major = major          # 10
+        self.minor = minor          # "5" dari 10.5 / 10-5 (string: "05" != "5")
+        self.part = part            # 2 dari "Part 2"
+        self.extra = extra          # Extra / Special / Side Story
+
+    @classmethod
+    def parse(cls, text):
+        if text is None:
+            return cls()
+        if isinstance(text, (int, float)):
+            return cls.from_float(text)
+        text = str(text)
+        part_match = PART_RE.search(text)
+        # Angka milik "Part N" bukan nomor chapter
+        body = text[:part_match.start()] + text[part_match.end():] if part_match else text
+        match = PREFIX_RE.search(body) or NUMBER_RE.search(body)
+        if not match:
+            return cls()
+        return cls(
+            major=int(match.group(1)),
+            minor=match.group(2) or "",
+            part=int(part_match.group(1)) if part_match else 0,
+            extra=bool(EXTRA_RE.search(text)),
+        )
+
+    @classmethod
+    def from_float(cls, value):
+        """ch_num dari database -> kunci (kebalikan dari .value, slot per slot)."""
+        major = int(value)
+        digits = f"{round(value - major, VALUE_PRECISION):.{VALUE_PRECISION}f}"[2:]
+        return cls(
+            major=major,
+            minor=digits[:MINOR_DIGITS].rstrip("0"),
+            part=int(digits[MINOR_DIGITS:MINOR_DIGITS + PART_DIGITS]),
+            extra=digits[-1] != "0",
+        )
+
+    @property
+    def value(self):
+        value = float(self.major)
+        if self.minor:
+            value += float("0." + self.minor[:MINOR_DIGITS])
+        if self.part:
+            # Slot part di bawah presisi minor: Part 2 -> .00002, Part 10 -> .0001
+            value += min(self.part, MAX_PART) * PART_STEP
+        if self.extra:
+            value += EXTRA_STEP
+        return round(value, VALUE_PRECISION)
+
+    def __float__(self):
+        return self.value
+
+    def __eq__(self, other):
+        return self.value == chapter_value(other)
+
+    def __lt__(self, other):
+        return self.value < chapter_value(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"ChapterKey({self.value})"
+
+def chapter_value(num):
+    """ChapterKey / float / teks -> float ch_num."""
+    if isinstance(num, ChapterKey):
+        return num.value
+    if isinstance(num, (int, float)):
+        return round(float(num), VALUE_PRECISION)
+    return ChapterKey.parse(num).value
+
+def extract_number(text):
+    """'10.5' / '10-5' / 'Chapter 10 Part 2' / 'Ch 10 Extra' -> float ch_num (dipakai semua bot)."""
+    return ChapterKey.parse(text).value
+
+def ch_num_of(chapter):
+    """ch_num dari chapter dict (schema lama) maupun Chapter (ikiru_seriesModel)."""
+    return chapter['ch_num'] if isinstance(chapter, dict) else chapter.ch_num
+
+def _descending(chapter):
+    return -ch_num_of(chapter)
+
+class ChapterIndex:
+    """
+    Membungkus list chapter (dict schema lama atau Chapter model, urut ch_num menurun) tanpa
+    menyalinnya: insert via bisect, cek keberadaan via set.
+    """
+
+    __slots__ = ("items", "_nums")
+
+    def __init__(self, chapters):
+        self.items = chapters
+        # Data lama yang belum urut dirapikan sekali saat index dibuat
+        if any(ch_num_of(a) < ch_num_of(b) for a, b in zip(chapters, chapters[1:])):
+            chapters.sort(key=_descending)
+        self._nums = {chapter_value(ch_num_of(c)) for c in chapters}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, num):
+        return chapter_value(num) in self._nums
+
+    def add(self, chapter):
+        """Sisipkan chapter di posisinya. Return False jika ch_num sudah ada."""
+        num = chapter_value(ch_num_of(chapter))
+        if num in self._nums:
+            return False
+        bisect.insort(self.items, chapter, key=_descending)
+        self._nums.add(num)
+        return True
+
+    def missing(self, found):
+        """Chapter hasil scan ({num, url}) yang belum ada di database."""
+        return [c for c in found if c['num'] not in self]
+
+    def latest(self):
+        return ch_num_of(self.items[0]) if self.items else None
+
+if __name__ == "__main__":
+    print("=== MONSTA CHAPTER KEY: CEK ATURAN PARSE ===")
+    CASES = [
+        ("10.2", 10.2), ("10-5", 10.5), ("Chapter 10", 10.0), ("Ch. 10.25", 10.25),
+        ("Chapter 10 Part 1", 10.00001), ("Chapter 10 Part 2", 10.00002),
+        ("Chapter 10 Part 10", 10.0001), ("Chapter 10 Part 11", 10.00011),
+        ("Ch 10 Extra", 10.000001), ("Chapter 10.5 Part 2", 10.50002),
+    ]
+    failed = 0
+    for text, expected in CASES:
+        key = ChapterKey.parse(text)
+        ok = key.value == expected and ChapterKey.from_float(key.value).value == expected
+        failed += not ok
+        print(f"    [{'OK' if ok else 'FAIL'}] {text!r} -> {key.value} (harap {expected})")
+
+    # Part tidak boleh bentrok dengan chapter desimal dan harus urut numerik
+    order = [ChapterKey.parse(t) for t in ("10", "10 Part 1", "10 Part 2", "10 Part 10", "10 Part 11", "10.1", "10.2")]
+    distinct = len({k.value for k in order}) == len(order)
+    ascending = all(a < b for a, b in zip(order, order[1:]))
+    failed += not (distinct and ascending)
+    print(f"    [{'OK' if distinct and ascending else 'FAIL'}] Part 1/2/10/11 unik & urut di antara 10 dan 10.1/10.2")
+
+    index = ChapterIndex([{"ch_num": 12.300000001}, {"ch_num": 10.2}])
+    ok = 12.3 in index and not index.add({"ch_num": 12.3}) and index.add({"ch_num": ChapterKey.parse("10 Part 2").value})
+    failed += not ok
+    print(f"    [{'OK' if ok else 'FAIL'}] ChapterIndex: ch_num tak terbulatkan cocok, Part 2 bukan duplikat 10.2")
+    print(f"[DONE] {len(CASES) + 2 - failed}/{len(CASES) + 2} cek lolos.")
@@ -0,0 +1,114 @@
+import os
+import re
+import json
+import gzip
+
+# Brotli opsional: jika tidak terpasang, hanya sibling .gz yang dibuat
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ==============================================================================
+# MONSTA COMPACT FORMAT: DATABASE HEMAT BYTE (V1.0)
+# ------------------------------------------------------------------------------
+# 1. MINIFIED: Tanpa indent & spasi (separators=(',', ':')).
+# 2. HOST DICTIONARY: Prefix berulang (https://files.catbox.moe/,
+#    https://telegra.ph/file/) disimpan sekali di "hosts"; tiap link panel
+#    menjadi "<indeks>:<nama file>".
+# 3. PRECOMPRESSED (opsional): Sibling .json.gz / .json.br untuk CDN.
+# 4. READABLE FLAG: Format lama (indent=4, link penuh) tetap bisa dipilih.
+# ==============================================================================
+
+COMPACT_FORMAT = "monsta-compact/1"
+
+FORMAT_READABLE = "readable"
+FORMAT_COMPACT = "compact"
+PUBLISH_FORMAT = FORMAT_COMPACT
+
+PRECOMPRESS = False         # True = tulis juga .json.gz (dan .json.br jika brotli ada)
+
+_ENCODED_LINK = re.compile(r'^(\d+):(.*)$', re.S)
+
+def _split_link(url):
+    cut = url.rfind("/") + 1
+    return url[:cut], url[cut:]
+
+def _encode_images(images, hosts, host_index):
+    encoded = []
+    for url in images:
+        prefix, name = _split_link(url)
+        if not prefix:
+            encoded.append(url)
+            continue
+        if prefix not in host_index:
+            host_index[prefix] = len(hosts)
+            hosts.append(prefix)
+        encoded.append(f"{host_index[prefix]}:{name}")
+    return encoded
+
+def _decode_images(images, hosts):
+    decoded = []
+    for item in images:
+        match = _ENCODED_LINK.match(item)
+        decoded.append(hosts[int(match.group(1))] + match.group(2) if match else item)
+    return decoded
+
+def encode_series(data):
+    """Skema kanonik -> skema compact. Berlaku untuk seri utuh maupun satu shard chapter."""
+    if data.get("format") == COMPACT_FORMAT:
+        return data
+    hosts, host_index = [], {}
+    out = {"format": COMPACT_FORMAT, "hosts": hosts}
+    for key, value in data.items():
+        if key == "chapters":
+            out[key] = [
+                dict(ch, images=_encode_images(ch["images"], hosts, host_index)) if "images" in ch else ch
+                for ch in value
+            ]
+        elif key == "images":
+            out[key] = _encode_images(value, hosts, host_index)
+        else:
+            out[key] = value
+    return out
+
+def decode_series(data):
+    """Skema compact -> skema kanonik. Data yang sudah kanonik dikembalikan apa adanya."""
+    if not isinstance(data, dict) or data.get("format") != COMPACT_FORMAT:
+        return data
+    hosts = data["hosts"]
+    out = {}
+    for key, value in data.items():
+        if key in ("format", "hosts"):
+            continue
+        if key == "chapters":
+            out[key] = [
+                dict(ch, images=_decode_images(ch["images"], hosts)) if "images" in ch else ch
+                for ch in value
+            ]
+        elif key == "images":
+            out[key] = _decode_images(value, hosts)
+        else:
+            out[key] = value
+    return out
+
+def serialize(data, fmt=None, indent=4):
+    """Mengubah data menjadi teks JSON sesuai format publish."""
+    fmt = fmt or PUBLISH_FORMAT
+    if fmt == FORMAT_READABLE:
+        return json.dumps(data, indent=indent, ensure_ascii=False)
+    if isinstance(data, dict):
+        data = encode_series(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def write_precompressed(filepath, text):
+    """Menulis sibling .gz (dan .br) dari teks JSON final, juga secara atomik."""
+    raw = text.encode('utf-8')
+    siblings = [(filepath + ".gz", lambda: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        siblings.append((filepath + ".br", lambda: brotli.compress(raw, quality=11)))
+    for path, compress in siblings:
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(compress())
+        os.replace(temp_path, path)
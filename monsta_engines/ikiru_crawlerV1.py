@@ -1,10 +1,10 @@
 import os
 import json
-import time
-import re
-import random
 from datetime import datetime
 from playwright.sync_api import sync_playwright
+from ikiru_htmlParser import parse_html
+from ikiru_httpClient import SOURCE_BASE
+from ikiru_rateLimiter import request_with_retry
 
 # =======================================================
 # MONSTA BOT 1: IKIRU PERFECT CRAWLER (V25.0)
@@ -13,6 +13,14 @@ from playwright.sync_api import sync_playwright
 # 1. Filter Ketat: Wajib buang link yang mengandung "chapter-"
 # 2. Pagination Fix: Menggunakan parameter ?the_page=
 # 3. Dedup Logic: Memastikan 121 Judul unik, tidak kurang tidak lebih.
+# 4. Last Chapter: Diambil dari link chapter terbaru di kartu listing
+#    (bahan untuk mode Update Scan di worker).
+# 5. Bulk Extraction: HTML listing diparsing sekali (tanpa IPC per link),
+#    dedup global memakai index slug (set), bukan any() linear.
+# 6. Fast Parser: selectolax/lxml via ikiru_htmlParser (bs4 hanya cadangan).
+# 7. Stub Mode: MONSTA_SOURCE_BASE mengarahkan crawl ke ikiru_stubServer.
+# 8. Adaptive Rate: Jeda antar halaman diatur token bucket AIMD per host
+#    (bukan sleep 2-3 detik tetap); 429/5xx diulang dengan backoff berjitter.
 # =======================================================
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,6 +33,59 @@ def save_data(data):
     with open(TARGET_FILE, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
+def extract_listing_items(html):
+    """
+    Membedah satu halaman listing sekaligus.
+    Return list kartu unik (urutan halaman): slug, href, title, last_chapter_str.
+    """
+    soup = parse_html(html)
+    items = []
+    item_by_slug = {}
+    latest_chapter_by_slug = {}
+
+    for link in soup.select("a[href*='/manga/']"):
+        href = link.get('href')
+        if not href: continue
+
+        # --- FILTER SAMPAH (THE FLAW FIX) ---
+        # 1. Link 'chapter-' bukan komik, tapi chapter pertama di kartu = chapter terbaru
+        if "chapter-" in href:
+            series_slug = href.split("/manga/")[-1].split("/")[0]
+            if series_slug not in latest_chapter_by_slug:
+                chap_label = link.select_one("p")
+                latest_chapter_by_slug[series_slug] = chap_label.get_text().strip() if chap_label else "N/A"
+            continue
+        # 2. Buang jika mengandung 'comment' atau '#'
+        if "comment" in href or "#" in href: continue
+
+        # Bersihkan URL
+        if href.endswith("/"): href = href[:-1]
+        slug = href.split("/")[-1]
+        if slug in item_by_slug: continue
+
+        # Ambil Judul (prioritas elemen judul)
+        title_el = link.select_one("span.font-bold") or \
+                   link.select_one("div.font-bold") or \
+                   link.select_one(".line-clamp-1") or \
+                   link.select_one(".line-clamp-2")
+        if title_el:
+            title = title_el.get_text().strip()
+        else:
+            # Fallback Text (satu baris saja, seperti inner_text)
+            raw = link.get_text("\n", strip=True)
+            if len(raw) > 3 and "\n" not in raw: title = raw
+            else: continue
+
+        item = {"slug": slug, "href": href, "title": title, "last_chapter_str": "N/A"}
+        item_by_slug[slug] = item
+        items.append(item)
+
+    # Tempelkan Chapter Terbaru dari Listing
+    for slug, chap in latest_chapter_by_slug.items():
+        if slug in item_by_slug:
+            item_by_slug[slug]['last_chapter_str'] = chap
+    return items
+
 def run_crawler_perfect():
     print("=== MONSTA FACTORY: BOT 1 (PERFECT EDITION V25.0) ===")
     
@@ -41,7 +102,8 @@ def run_crawler_perfect():
         page = context.new_page()
 
         target_data = []
-        base_url = "https://02.ikiru.wtf/project/"
+        known_slugs = set()
+        base_url = f"{SOURCE_BASE}/project/"
         
         # Loop Halaman 1 sampai 10 (Estimasi aman, akan break jika kosong)
         for current_page in range(1, 11):
@@ -50,84 +112,44 @@ def run_crawler_perfect():
             print(f"[*] Scanning Page {current_page}: {url}")
 
             try:
-                page.goto(url, timeout=60000, wait_until="networkidle")
+                request_with_retry(page.goto, url, timeout=60000, wait_until="networkidle")
                 
-                # Scroll Trigger (Penting untuk Ikiru)
+                # Scroll Trigger (Penting untuk Ikiru): tunggu sampai kartu listing muncul
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(2)
+                try:
+                    page.wait_for_selector("a[href*='/manga/']", timeout=5000)
+                except Exception:
+                    pass
 
-                # AMBIL SEMUA LINK MANGA
-                # Strategi: Ambil semua, lalu filter di Python (Lebih aman)
-                candidate_links = page.query_selector_all("a[href*='/manga/']")
-                
+                # AMBIL SEMUA KARTU MANGA (Satu kali page.content(), parsing di Python)
+                page_items = extract_listing_items(page.content())
                 valid_count_on_page = 0
-                seen_slugs_on_page = set()
 
-                if not candidate_links:
+                if not page_items:
                     print(f"    [!] Halaman {current_page} Kosong/Habis. Stop Crawling.")
                     break
 
-                for link in candidate_links:
-                    try:
-                        href = link.get_attribute("href")
-                        if not href: continue
-                        
-                        # --- FILTER SAMPAH (THE FLAW FIX) ---
-                        # 1. Buang jika mengandung 'chapter-' (Ini link chapter, bukan komik)
-                        if "chapter-" in href: continue
-                        # 2. Buang jika mengandung 'comment' atau '#'
-                        if "comment" in href or "#" in href: continue
-                        
-                        # Bersihkan URL
-                        if href.endswith("/"): href = href[:-1]
-                        slug = href.split("/")[-1]
-                        
-                        # Cek Duplikasi Global (agar id tidak loncat)
-                        if any(item['slug'] == slug for item in target_data):
-                            continue
-                        
-                        if slug in seen_slugs_on_page: continue
-
-                        # Ambil Judul
-                        title = ""
-                        # Prioritas elemen judul
-                        title_el = link.query_selector("span.font-bold") or \
-                                   link.query_selector("div.font-bold") or \
-                                   link.query_selector(".line-clamp-1") or \
-                                   link.query_selector(".line-clamp-2")
-                        
-                        if title_el:
-                            title = title_el.inner_text().strip()
-                        else:
-                            # Fallback Text
-                            raw = link.inner_text().strip()
-                            if len(raw) > 3 and "\n" not in raw: title = raw
-                            else: continue
-
-                        # Ambil Last Chapter (Optional)
-                        last_chap = "N/A"
-                        chap_el = link.query_selector("span.text-xs")
-                        if chap_el: last_chap = chap_el.inner_text().strip()
-
-                        # DATA BERSIH
-                        item = {
-                            "id": len(target_data) + 1,
-                            "title": title,
-                            "slug": slug,
-                            "source_url": f"{href}/",
-                            "last_chapter_str": last_chap,
-                            "status": "pending",
-                            "last_scanned": datetime.now().isoformat()
-                        }
-                        
-                        target_data.append(item)
-                        seen_slugs_on_page.add(slug)
-                        valid_count_on_page += 1
-                        print(f"    + {title}")
-
-                    except Exception:
+                for card in page_items:
+                    # Cek Duplikasi Global via index slug (agar id tidak loncat)
+                    if card['slug'] in known_slugs:
                         continue
 
+                    # DATA BERSIH
+                    item = {
+                        "id": len(target_data) + 1,
+                        "title": card['title'],
+                        "slug": card['slug'],
+                        "source_url": f"{card['href']}/",
+                        "last_chapter_str": card['last_chapter_str'],
+                        "status": "pending",
+                        "last_scanned": datetime.now().isoformat()
+                    }
+                    
+                    target_data.append(item)
+                    known_slugs.add(card['slug'])
+                    valid_count_on_page += 1
+                    print(f"    + {card['title']}")
+
                 # Cek Hasil Halaman Ini
                 if valid_count_on_page == 0:
                     print(f"    [STOP] Halaman {current_page} terbuka tapi tidak ada judul baru. Selesai.")
@@ -137,9 +159,6 @@ def run_crawler_perfect():
                 save_data(target_data)
                 print(f"    [SAVED] {valid_count_on_page} judul baru. Total: {len(target_data)}")
                 
-                # Jeda Manusiawi
-                time.sleep(random.uniform(2, 3))
-
             except Exception as e:
                 print(f"    [FATAL] Error Page {current_page}: {e}")
                 break
@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import bisect
+import requests
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from ikiru_rateLimiter import request_with_retry
+
+# ==============================================================================
+# MONSTA DISCORD LINKS: PELACAK KEDALUWARSA & REFRESH MASSAL (V1.0)
+# ------------------------------------------------------------------------------
+# 1. INDEX KEDALUWARSA: Parameter hex ex= pada setiap link CDN Discord
+#    diurai jadi epoch lalu diurutkan (bisect untuk query jendela waktu).
+# 2. LAPORAN: Link yang mati dalam N jam ke depan (atau sudah mati).
+# 3. REFRESH MASSAL: Link dikirim per batch (maks 50 per panggilan API)
+#    dengan konkurensi terbatas, bukan satu per satu.
+# 4. PLUGGABLE: refresh_fn(urls) -> {url_lama: url_baru}; default memanggil
+#    API Discord, stub_refresh() untuk uji tanpa jaringan.
+# 5. ATOMIC REWRITE: monsta_index.json & discord_db_links.json ditulis ke
+#    .tmp dulu, lalu diganti berurutan (pembaca tidak pernah melihat file
+#    setengah jadi).
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_FILE = os.path.join(BASE_DIR, "monsta_index.json")
+LINKS_FILE = os.path.join(BASE_DIR, "discord_db_links.json")
+
+DISCORD_API = os.environ.get("MONSTA_DISCORD_API", "https://discord.com/api/v9").rstrip("/")
+DISCORD_TOKEN = os.environ.get("MONSTA_DISCORD_TOKEN", "")
+DISCORD_CDN_HOSTS = ("cdn.discordapp.com", "media.discordapp.net")
+
+REFRESH_WINDOW_HOURS = 24       # Link yang mati dalam jendela ini ikut di-refresh
+BATCH_SIZE = 50                 # Batas attachment_urls per panggilan refresh-urls
+REFRESH_WORKERS = 4             # Batch paralel
+STUB_TTL = 24 * 3600            # Umur link hasil stub_refresh
+
+def parse_expiry(url):
+    """'...?ex=6984c91b&...' -> epoch detik (int). None jika bukan link bertanda tangan."""
+    if not url:
+        return None
+    values = parse_qs(urlsplit(url).query).get("ex")
+    try:
+        return int(values[0], 16) if values else None
+    except ValueError:
+        return None
+
+def is_discord_link(url):
+    return isinstance(url, str) and urlsplit(url).netloc.lower() in DISCORD_CDN_HOSTS
+
+def format_epoch(epoch):
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S")
+
+class ExpiryIndex:
+    """Daftar (expiry, url) terurut; query 'mati sebelum T' = satu bisect."""
+
+    def __init__(self, urls):
+        parsed = ((parse_expiry(url), url) for url in set(urls))
+        pairs = sorted(pair for pair in parsed if pair[0] is not None)
+        self.expiries = [ex for ex, _ in pairs]
+        self.urls = [url for _, url in pairs]
+
+    def __len__(self):
+        return len(self.urls)
+
+    def expiring_before(self, epoch):
+        return self.urls[:bisect.bisect_right(self.expiries, epoch)]
+
+    def expiring_within(self, seconds, now=None):
+        return self.expiring_before((now or time.time()) + seconds)
+
+    def earliest(self):
+        return (self.expiries[0], self.urls[0]) if self.urls else None
+
+# --- BACA & TULIS DATABASE LINK ---
+
+def load_link_files(index_path=INDEX_FILE, links_path=LINKS_FILE):
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index_data = json.load(f)
+    with open(links_path, 'r', encoding='utf-8') as f:
+        links_data = json.load(f)
+    return index_data, links_data
+
+def collect_links(index_data, links_data):
+    urls = {entry.get("cdn") for entry in index_data if is_discord_link(entry.get("cdn"))}
+    urls.update(url for url in links_data.values() if is_discord_link(url))
+    return urls
+
+def apply_mapping(index_data, links_data, mapping):
+    """Ganti link lama -> baru di kedua struktur. Return jumlah field yang berubah."""
+    changed = 0
+    for entry in index_data:
+        new_url = mapping.get(entry.get("cdn"))
+        if new_url:
+            entry["cdn"] = new_url
+            changed += 1
+    for key, url in links_data.items():
+        new_url = mapping.get(url)
+        if new_url:
+            links_data[key] = new_url
+            changed += 1
+    return changed
+
+def _write_temp(path, text):
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    return temp_path
+
+def save_link_files(index_data, links_data, index_path=INDEX_FILE, links_path=LINKS_FILE):
+    """
+    Kedua file di-serialize & di-fsync ke .tmp lebih dulu; baru setelah keduanya
+    siap, os.replace dijalankan berurutan. Gagal di tengah = file lama utuh.
+    """
+    # Format mengikuti file asli: index satu baris padat, daftar link indent 4
+    index_text = json.dumps(index_data, separators=(',', ':'))
+    links_text = json.dumps(links_data, indent=4)
+    temps = []
+    try:
+        temps.append((_write_temp(index_path, index_text), index_path))
+        temps.append((_write_temp(links_path, links_text), links_path))
+    except Exception:
+        for temp_path, _ in temps:
+            os.remove(temp_path)
+        raise
+    for temp_path, final_path in temps:
+        os.replace(temp_path, final_path)
+    print(f"[DISK] {os.path.basename(index_path)} & {os.path.basename(links_path)} diganti atomik.")
+
+# --- FUNGSI REFRESH (PLUGGABLE) ---
+
+def discord_refresh(urls):
+    """POST /attachments/refresh-urls (butuh MONSTA_DISCORD_TOKEN). Return {lama: baru}."""
+    if not DISCORD_TOKEN:
+        raise RuntimeError("MONSTA_DISCORD_TOKEN kosong, refresh Discord tidak bisa dijalankan")
+    url = f"{DISCORD_API}/attachments/refresh-urls"
+    response = request_with_retry(requests.post, url, json={"attachment_urls": list(urls)},
+                                  headers={"Authorization": f"Bot {DISCORD_TOKEN}"}, timeout=30)
+    if response.status_code != 200:
+        raise RuntimeError(f"Discord menolak refresh (Status {response.status_code}): {response.text[:150]}")
+    return {item["original"]: item["refreshed"] for item in response.json().get("refreshed_urls", [])}
+
+def stub_refresh(urls, ttl=STUB_TTL):
+    """Refresh palsu untuk uji: ex/is digeser ke sekarang, hm diganti penanda stub."""
+    now = int(time.time())
+    mapping = {}
+    for url in urls:
+        base = url.split("?", 1)[0]
+        mapping[url] = f"{base}?ex={now + ttl:x}&is={now:x}&hm=stub&"
+    return mapping
+
+def refresh_links(urls, refresh_fn=None, batch_size=BATCH_SIZE, workers=REFRESH_WORKERS):
+    """Refresh per batch secara paralel. Batch yang gagal dilaporkan lalu dilewati."""
+    refresh_fn = refresh_fn or discord_refresh
+    urls = list(urls)
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    mapping = {}
+
+    def _run(batch_no, batch):
+        try:
+            result = refresh_fn(batch)
+            print(f"   [REFRESH] Batch {batch_no+1}/{len(batches)}: {len(result)}/{len(batch)} link diperbarui.")
+            return result
+        except Exception as e:
+            print(f"   [REFRESH ERROR] Batch {batch_no+1}/{len(batches)} gagal: {e}")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for result in executor.map(lambda args: _run(*args), enumerate(batches)):
+            mapping.update(result)
+    return mapping
+
+# --- ALUR UTAMA ---
+
+def report_expiring(window_hours=REFRESH_WINDOW_HOURS, index_path=INDEX_FILE, links_path=LINKS_FILE):
+    index_data, links_data = load_link_files(index_path, links_path)
+    expiry_index = ExpiryIndex(collect_links(index_data, links_data))
+    now = time.time()
+    expired = expiry_index.expiring_before(now)
+    expiring = expiry_index.expiring_within(window_hours * 3600, now)
+
+    print(f"[SCAN] {len(expiry_index)} link Discord bertanda tangan.")
+    if expiry_index.earliest():
+        ex, url = expiry_index.earliest()
+        print(f"[SCAN] Paling awal mati: {format_epoch(ex)} -> {url.split('?')[0].split('/')[-1]}")
+    print(f"[SCAN] Sudah mati: {len(expired)} | Mati dalam {window_hours} jam: {len(expiring) - len(expired)}")
+    return expiring
+
+def refresh_expiring(window_hours=REFRESH_WINDOW_HOURS, refresh_fn=None,
+                     index_path=INDEX_FILE, links_path=LINKS_FILE, dry_run=False):
+    """Refresh semua link yang mati dalam jendela, lalu tulis ulang kedua file sekali jalan."""
+    index_data, links_data = load_link_files(index_path, links_path)
+    expiry_index = ExpiryIndex(collect_links(index_data, links_data))
+    targets = expiry_index.expiring_within(window_hours * 3600)
+    print(f"[REFRESH] {len(targets)} dari {len(expiry_index)} link perlu diperbarui "
+          f"(jendela {window_hours} jam, batch {BATCH_SIZE}, paralel {REFRESH_WORKERS}).")
+    if not targets:
+        return 0
+
+    mapping = refresh_links(targets, refresh_fn)
+    changed = apply_mapping(index_data, links_data, mapping)
+    if dry_run:
+        print(f"[DRY RUN] {changed} field akan berubah, file tidak disentuh.")
+        return changed
+    if changed:
+        save_link_files(index_data, links_data, index_path, links_path)
+    print(f"[DONE] {len(mapping)} link diperbarui, {changed} field ditulis ulang.")
+    return changed
+
+if __name__ == "__main__":
+    print("=== MONSTA DISCORD LINKS: EXPIRY TRACKER ===")
+    window = float(input(f"[?] Jendela jam [{REFRESH_WINDOW_HOURS}] : ").strip() or REFRESH_WINDOW_HOURS)
+    print("1 = Laporan saja")
+    print("2 = Refresh via API Discord (MONSTA_DISCORD_TOKEN)")
+    print("3 = Dry run dengan stub refresh (tanpa jaringan, file tidak diubah)")
+    mode = input("[?] Pilih Mode [1] : ").strip() or "1"
+
+    if mode == "2":
+        refresh_expiring(window)
+    elif mode == "3":
+        refresh_expiring(window, refresh_fn=stub_refresh, dry_run=True)
+    else:
+        report_expiring(window)
@@ -0,0 +1,283 @@
+import os
+import sys
+import glob
+import json
+import time
+
+# ==============================================================================
+# MONSTA HTML PARSER: BACKEND PARSING YANG BISA DITUKAR (V1.0)
+# ------------------------------------------------------------------------------
+# 1. SATU API KECIL: parse_html(html) -> node dengan select / select_one /
+#    get / get_text (subset BeautifulSoup yang benar-benar dipakai worker,
+#    crawler, dan HTTP client).
+# 2. BACKEND CEPAT: selectolax (lexbor, C) -> lxml + cssselect (libxml2, C)
+#    -> BeautifulSoup html.parser (fallback murni Python).
+# 3. AUTO / PAKSA: PARSER_BACKEND = "auto" memilih yang terpasang paling cepat;
+#    env MONSTA_PARSER=selectolax|lxml|bs4 memaksa backend tertentu.
+# 4. PARITY CHECK: python ikiru_htmlParser.py membandingkan hasil semua backend
+#    terhadap bs4 di fixture ikiru-*.html & ikirupage*.html (exit 1 jika beda).
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PARSER_BACKEND = os.environ.get("MONSTA_PARSER", "auto")
+BACKEND_PRIORITY = ["selectolax", "lxml", "bs4"]
+
+# --- BACKEND: SELECTOLAX (LEXBOR) ---
+
+class _SelectolaxBackend:
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser(html)
+
+    def select(self, node, css):
+        # Lexbor ikut mencocokkan node itu sendiri; bs4 hanya keturunan
+        own_id = getattr(node, "mem_id", None)
+        return [n for n in node.css(css) if n.mem_id != own_id]
+
+    def select_one(self, node, css):
+        first = node.css_first(css)
+        if first is None or first.mem_id != getattr(node, "mem_id", None):
+            return first
+        found = self.select(node, css)
+        return found[0] if found else None
+
+    def get(self, node, name, default=None):
+        attrs = node.attributes
+        if name not in attrs:
+            return default
+        # Atribut tanpa nilai (misal <div hx-get>) -> "" seperti bs4
+        return attrs[name] if attrs[name] is not None else ""
+
+    def strings(self, node):
+        for child in node.traverse(include_text=True):
+            if child.tag == "-text" and child.parent is not None and child.parent.tag not in ("script", "style", "template"):
+                yield child.text_content
+
+# --- BACKEND: LXML + CSSSELECT (LIBXML2) ---
+
+class _LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        from lxml.cssselect import CSSSelector
+        self._html = lxml.html
+        self._element = etree.Element
+        self._selector = CSSSelector
+        self._compiled = {}
+
+    def _compile(self, css):
+        sel = self._compiled.get(css)
+        if sel is None:
+            sel = self._compiled[css] = self._selector(css, translator="html")
+        return sel
+
+    def parse(self, html):
+        # document_fromstring: fragmen HTMX pun dibungkus <html><body> (aman untuk selektor)
+        return self._html.document_fromstring(html or "<html></html>")
+
+    def select(self, node, css):
+        # XPath cssselect ikut mencocokkan node itu sendiri; bs4 hanya keturunan
+        return [n for n in self._compile(css)(node) if n is not node]
+
+    def select_one(self, node, css):
+        found = self.select(node, css)
+        return found[0] if found else None
+
+    def get(self, node, name, default=None):
+        return node.get(name, default)
+
+    def strings(self, node):
+        # Teks elemen saja (komentar dan isi script/style dilewati, sama seperti bs4)
+        for el in node.iter(self._element):
+            if el.tag in ("script", "style", "template"):
+                if el is not node and el.tail:
+                    yield el.tail
+                continue
+            if el.text:
+                yield el.text
+            if el is not node and el.tail:
+                yield el.tail
+
+# --- BACKEND: BEAUTIFULSOUP (FALLBACK) ---
+
+class _Bs4Backend:
+    name = "bs4"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, html):
+        return self._soup(html, "html.parser")
+
+    def select(self, node, css):
+        return node.select(css)
+
+    def select_one(self, node, css):
+        return node.select_one(css)
+
+    def get(self, node, name, default=None):
+        value = node.get(name, default)
+        # Atribut multi-nilai (class) dikembalikan sebagai string seperti backend lain
+        return " ".join(value) if isinstance(value, list) else value
+
+    def strings(self, node):
+        return node._all_strings()
+
+_BACKEND_CLASSES = {
+    "selectolax": _SelectolaxBackend,
+    "lxml": _LxmlBackend,
+    "bs4": _Bs4Backend,
+}
+
+def load_backend(name):
+    """Return instance backend, atau None jika library-nya tidak terpasang."""
+    try:
+        return _BACKEND_CLASSES[name]()
+    except ImportError:
+        return None
+
+def available_backends():
+    return [b for b in (load_backend(n) for n in BACKEND_PRIORITY) if b is not None]
+
+def _pick_backend():
+    if PARSER_BACKEND != "auto":
+        backend = load_backend(PARSER_BACKEND)
+        if backend is None:
+            raise RuntimeError(f"Backend parser '{PARSER_BACKEND}' tidak terpasang.")
+        return backend
+    backends = available_backends()
+    if not backends:
+        raise RuntimeError("Tidak ada backend HTML parser (selectolax / lxml / bs4) yang terpasang.")
+    return backends[0]
+
+# --- NODE: API SERAGAM UNTUK SEMUA BACKEND ---
+
+class Node:
+    __slots__ = ("_node", "_backend")
+
+    def __init__(self, node, backend):
+        self._node = node
+        self._backend = backend
+
+    def select(self, css):
+        return [Node(n, self._backend) for n in self._backend.select(self._node, css)]
+
+    def select_one(self, css):
+        found = self._backend.select_one(self._node, css)
+        return Node(found, self._backend) if found is not None else None
+
+    def get(self, name, default=None):
+        return self._backend.get(self._node, name, default)
+
+    def get_text(self, separator="", strip=False):
+        strings = self._backend.strings(self._node)
+        if strip:
+            strings = (s.strip() for s in strings)
+            strings = (s for s in strings if s)
+        return separator.join(strings)
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _pick_backend()
+    return _backend
+
+def parse_html(html, backend=None):
+    """Pengganti BeautifulSoup(html, "html.parser") untuk laman panas."""
+    backend = backend or get_backend()
+    return Node(backend.parse(html), backend)
+
+# --- PARITY CHECK & MICRO BENCHMARK ---
+
+# Fixture tidak memuat fragmen HTMX chapter_list, jadi contoh kecil disertakan di sini
+SAMPLE_CHAPTER_FRAGMENT = """
+<div class="flex flex-col" data-chapter-number="12.5">
+  <a href="https://02.ikiru.wtf/manga/contoh/chapter-12-5/"><span>Chapter 12.5</span><time>2 jam lalu</time></a>
+</div>
+<div data-chapter-number="12"><a href="https://02.ikiru.wtf/manga/contoh/chapter-12/"><span>Chapter 12</span></a></div>
+<div data-chapter-number="11"><span>Terkunci</span></div>
+"""
+
+def fingerprint(html, backend):
+    """Semua selektor yang dipakai worker/crawler/client, dalam satu dict pembanding."""
+    root = parse_html(html, backend)
+    cover_box = root.select_one("div[itemprop='image']")
+    img_node = cover_box.select_one("img") if cover_box else root.select_one("img.wp-post-image")
+    syn_box = root.select_one("div[itemprop='description'][data-show='false']") or \
+              root.select_one("div[itemprop='description']")
+    holder = root.select_one("#chapter-list[hx-get]")
+    reader_area = root.select_one("section[data-image-data='1']")
+    img_nodes = reader_area.select("img") if reader_area else root.select("img")
+
+    listing = []
+    for link in root.select("a[href*='/manga/']"):
+        chap_label = link.select_one("p")
+        title_el = link.select_one("span.font-bold") or link.select_one("div.font-bold") or \
+                   link.select_one(".line-clamp-1") or link.select_one(".line-clamp-2")
+        listing.append([
+            link.get('href'),
+            chap_label.get_text().strip() if chap_label else None,
+            title_el.get_text().strip() if title_el else None,
+            link.get_text("\n", strip=True),
+        ])
+
+    return {
+        "cover": [img_node.get('src'), img_node.get('data-src')] if img_node else None,
+        "synopsis": " ".join(syn_box.get_text().split()) if syn_box else None,
+        "chapter_endpoint": holder.get('hx-get') if holder else None,
+        "chapters": [[div.get('data-chapter-number'), a.get('href') if a else None]
+                     for div in root.select("div[data-chapter-number]")
+                     for a in [div.select_one("a")]],
+        "reader_section": reader_area is not None,
+        "reader_images": [n.get('src') or n.get('data-src') for n in img_nodes],
+        "listing": listing,
+    }
+
+def run_parity_check(rounds=3):
+    fixtures = sorted(glob.glob(os.path.join(BASE_DIR, "ikiru-*.html")) +
+                      glob.glob(os.path.join(BASE_DIR, "ikirupage*.html")))
+    samples = {os.path.basename(p): open(p, 'r', encoding='utf-8').read() for p in fixtures}
+    samples["<chapter_list fragment>"] = SAMPLE_CHAPTER_FRAGMENT
+
+    reference = load_backend("bs4")
+    if reference is None:
+        print("[PARITY] bs4 tidak terpasang: tidak ada referensi pembanding.")
+        return False
+    backends = available_backends()
+    print(f"[PARITY] Backend terpasang: {', '.join(b.name for b in backends)}")
+
+    ok = True
+    timings = {b.name: 0.0 for b in backends}
+    for name, html in samples.items():
+        expected = fingerprint(html, reference)
+        for backend in backends:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                got = fingerprint(html, backend)
+            timings[backend.name] += (time.perf_counter() - start) / rounds
+            if got != expected:
+                ok = False
+                diff = [k for k in expected if expected[k] != got[k]]
+                print(f"   [BEDA] {name} | {backend.name} | field: {', '.join(diff)}")
+                for k in diff:
+                    print(f"          bs4 : {json.dumps(expected[k], ensure_ascii=False)[:300]}")
+                    print(f"          {backend.name:<4}: {json.dumps(got[k], ensure_ascii=False)[:300]}")
+
+    print(f"[PARITY] {len(samples)} sampel diperiksa -> {'IDENTIK' if ok else 'ADA PERBEDAAN'}")
+    for backend_name, total in timings.items():
+        print(f"   [WAKTU] {backend_name:<10} {total*1000:8.1f} ms per putaran semua sampel")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if run_parity_check() else 1)
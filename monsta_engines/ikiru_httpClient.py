@@ -0,0 +1,162 @@
+import os
+import re
+import requests
+from ikiru_htmlParser import parse_html
+from ikiru_rateLimiter import request_with_retry
+
+# ==============================================================================
+# MONSTA HTTP CLIENT: JALUR CEPAT TANPA BROWSER (V1.0)
+# ------------------------------------------------------------------------------
+# 1. POOLED SESSION: Satu session keep-alive untuk laman Ikiru & CDN panel.
+# 2. READER FAST PATH: Panel sudah ada di HTML server-render, jadi laman
+#    reader cukup diambil via HTTP biasa lalu diparsing langsung.
+# 3. HTMX DIRECT: Daftar chapter diambil dari endpoint partial admin-ajax
+#    yang biasanya dipicu tombol "Chapters", tanpa render laman penuh.
+# 4. FALLBACK JUJUR: Jika data tidak ada di HTML, kembalikan None agar
+#    worker kembali ke Playwright.
+# 5. BASE OVERRIDE: env MONSTA_SOURCE_BASE mengarahkan semua laman ke stub
+#    lokal (ikiru_stubServer) untuk uji throughput tanpa jaringan.
+# 6. RATE LIMIT: Semua GET sumber lewat token bucket AIMD + retry berjitter.
+# 7. KONSTANTA BERSAMA: USER_AGENT & penantian lazy-load (SETTLE_*) dipakai
+#    juga oleh browser pool, worker V1, dan upload client.
+# ==============================================================================
+
+SOURCE_BASE = os.environ.get("MONSTA_SOURCE_BASE", "https://02.ikiru.wtf").rstrip("/")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+
+# Penantian lazy-load di browser: semua img selector sudah punya src (atau timeout)
+SETTLE_TIMEOUT_MS = 5000
+SETTLE_JS = "sel => Array.from(document.querySelectorAll(sel)).every(img => img.getAttribute('src'))"
+
+# Whitelist CDN panel & kata kunci sampah (sama persis dengan worker)
+PANEL_CDN_WHITELIST = ['itachi.my.id', 'uqni.net', '02.ikiru.wtf']
+PANEL_JUNK_WORDS = ['logo', 'banner', 'iklan']
+
+# Ukuran kolam koneksi per host (reader HTML + panel paralel)
+POOL_SIZE = 8
+
+# --- GLOBAL SESSION SUMBER (Thread-Safe, Keep-Alive) ---
+source_session = requests.Session()
+source_session.headers.update({
+    "User-Agent": USER_AGENT,
+    "Referer": SOURCE_BASE + "/"
+})
+source_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+source_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+
+def source_get(url, **kwargs):
+    """GET via session sumber, dipacu rate limiter per host dan diulang saat 429/5xx."""
+    return request_with_retry(source_session.get, url, **kwargs)
+
+def extract_panel_urls(html, strict=False):
+    """
+    Membedah HTML reader dan mengembalikan daftar URL panel (urutan asli, tanpa duplikat).
+    strict=True: wajib ada section[data-image-data='1'], jika tidak -> None.
+    """
+    soup = parse_html(html)
+    reader_area = soup.select_one("section[data-image-data='1']")
+    if reader_area is None and strict:
+        return None
+    img_nodes = reader_area.select('img') if reader_area else soup.select('img')
+
+    panel_urls = []
+    for node in img_nodes:
+        src = (node.get('src') or node.get('data-src') or "").strip()
+        # Whitelist CDN (itachi, uqni, ikiru)
+        if src and any(c in src for c in PANEL_CDN_WHITELIST):
+            if not any(j in src for j in PANEL_JUNK_WORDS):
+                panel_urls.append(src)
+    return list(dict.fromkeys(panel_urls))
+
+def fetch_reader_panels(reader_url, timeout=30):
+    """
+    Jalur cepat: ambil laman reader via HTTP dan parsing panelnya.
+    Return list URL panel, atau None jika harus fallback ke browser.
+    """
+    try:
+        resp = source_get(reader_url, timeout=timeout)
+        if resp.status_code != 200:
+            print(f"      [FAST PATH] Status {resp.status_code}, fallback ke browser.")
+            return None
+        panel_urls = extract_panel_urls(resp.text, strict=True)
+        if not panel_urls:
+            print("      [FAST PATH] Section panel tidak ada di HTML, fallback ke browser.")
+            return None
+        return panel_urls
+    except Exception as e:
+        print(f"      [FAST PATH] Kendala HTTP ({e}), fallback ke browser.")
+        return None
+
+# --- DETAIL PAGE & HTMX CHAPTER LIST (TANPA KLIK TOMBOL) ---
+
+def fetch_page_html(page_url, timeout=30):
+    """Ambil HTML mentah sebuah laman Ikiru. Return None jika gagal."""
+    try:
+        resp = source_get(page_url, timeout=timeout)
+        if resp.status_code == 200:
+            return resp.text
+        print(f"      [FAST PATH] Status {resp.status_code} untuk {page_url}")
+    except Exception as e:
+        print(f"      [FAST PATH] Kendala HTTP ({e}) untuk {page_url}")
+    return None
+
+def find_chapter_endpoint(detail_html):
+    """
+    Mencari URL partial HTMX yang dipicu tombol button[data-key='chapters'].
+    Contoh: /wp-admin/admin-ajax.php?manga_id=808874&page=1&action=chapter_list
+    """
+    soup = parse_html(detail_html)
+    holder = soup.select_one("#chapter-list[hx-get]")
+    if not holder:
+        return None
+    endpoint = holder.get('hx-get', '').strip()
+    if endpoint.startswith("/"):
+        endpoint = SOURCE_BASE + endpoint
+    return endpoint or None
+
+def fetch_chapter_fragment(detail_html, timeout=30, max_pages=50):
+    """
+    Memanggil endpoint HTMX chapter_list langsung dan menggabungkan fragmennya.
+    Halaman partial diikuti (page=1,2,...) sampai tidak ada chapter baru.
+    Return HTML fragmen gabungan, atau None jika harus fallback ke browser
+    (termasuk bila halaman mana pun gagal setelah retry).
+    """
+    endpoint = find_chapter_endpoint(detail_html)
+    if not endpoint:
+        print("      [FAST PATH] Endpoint HTMX chapter_list tidak ditemukan.")
+        return None
+
+    fragments = []
+    seen_hrefs = set()
+    for page_no in range(1, max_pages + 1):
+        page_url = re.sub(r'([?&])page=\d+', rf'\g<1>page={page_no}', endpoint)
+        # source_get sudah mengulang 429/5xx/error koneksi; gagal di sini = daftar tidak lengkap.
+        # Fragmen parsial tidak boleh dianggap daftar utuh (chapter lama ikut hilang).
+        try:
+            resp = source_get(page_url, headers={"HX-Request": "true"}, timeout=timeout)
+        except Exception as e:
+            print(f"      [FAST PATH] Kendala HTMX halaman {page_no} ({e}), fallback ke browser.")
+            return None
+        if resp.status_code != 200:
+            print(f"      [FAST PATH] HTMX halaman {page_no} Status {resp.status_code}, fallback ke browser.")
+            return None
+
+        frag = parse_html(resp.text)
+        new_hrefs = set()
+        for div in frag.select("div[data-chapter-number]"):
+            a_tag = div.select_one("a")
+            if a_tag and a_tag.get('href'):
+                new_hrefs.add(a_tag.get('href'))
+        new_hrefs -= seen_hrefs
+        if not new_hrefs:
+            break
+        seen_hrefs |= new_hrefs
+        fragments.append(resp.text)
+
+        # Endpoint tanpa parameter page berarti semua chapter sudah dalam satu fragmen
+        if "page=" not in endpoint:
+            break
+
+    if not fragments:
+        return None
+    return "\n".join(fragments)
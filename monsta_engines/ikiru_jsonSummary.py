@@ -0,0 +1,258 @@
+import os
+import re
+import json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ==============================================================================
+# MONSTA JSON SUMMARY: RINGKASAN SERI TANPA PARSE PENUH (V1.0)
+# ------------------------------------------------------------------------------
+# 1. STREAMING: File database dibaca per potongan (CHUNK_SIZE); hanya field
+#    top-level yang diminta (title, slug, cover, last_updated) yang di-decode.
+# 2. TANPA IMAGE LIST: Entri chapters hanya dihitung + ch_num dibaca; array
+#    images dilompati via regex (tidak ada string URL yang dibuat).
+# 3. RAM HAMPIR KONSTAN: Seri 10 MB dan 10 KB butuh memori setara satu chunk.
+# 4. DUA MESIN: ijson (jika terpasang) atau scanner inkremental bawaan;
+#    pilih via MONSTA_JSON_STREAM=auto|ijson|scanner.
+# 5. DIPAKAI BERSAMA: Indexer & resume worker lewat SeriesStore.summary()
+#    (+ delta WAL; with_nums mencegah chapter dihitung ganda).
+# ==============================================================================
+
+CHUNK_SIZE = 64 * 1024
+STREAM_BACKEND = os.environ.get("MONSTA_JSON_STREAM", "auto").lower()
+SUMMARY_FIELDS = ("slug", "title", "cover", "last_updated")
+
+# Satu kali match melompati teks + string utuh sampai kurung berikutnya (di C, bukan per token)
+_FLAT = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.S)
+_STRING_END = re.compile(r'["\\]')           # Akhir string / escape
+_SCALAR_END = re.compile(r'[,\]}\s]')        # Akhir angka / true / false / null
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+
+class _Scanner:
+    """Pembaca JSON inkremental: hanya maju, buffer dibuang begitu terlewati."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self):
+        """Tambah satu chunk ke buffer (sisa yang belum dibaca dipertahankan)."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            raise ValueError("JSON terpotong: akhir file sebelum dokumen selesai")
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Karakter non-spasi berikutnya (tanpa dikonsumsi)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON tidak valid: diharapkan '{char}', ditemukan '{self.buf[self.pos]}'")
+        self.pos += 1
+
+    def _scan_string(self, keep):
+        """Konsumsi string (kutip pembuka sudah dilewati). Return teks mentah jika keep."""
+        parts = []
+        while True:
+            match = _STRING_END.search(self.buf, self.pos)
+            if not match:
+                if keep:
+                    parts.append(self.buf[self.pos:])
+                self.pos = len(self.buf)
+                self._fill()
+                continue
+            end = match.start()
+            if self.buf[end] == '"':
+                if keep:
+                    parts.append(self.buf[self.pos:end])
+                self.pos = end + 1
+                return "".join(parts)
+            # Escape: karakter sesudah '\' harus ada di buffer
+            if end + 1 >= len(self.buf):
+                if keep:
+                    parts.append(self.buf[self.pos:end])
+                self.pos = end
+                self._fill()
+                continue
+            if keep:
+                parts.append(self.buf[self.pos:end + 2])
+            self.pos = end + 2
+
+    def read_string(self):
+        self.expect('"')
+        return json.loads('"' + self._scan_string(keep=True) + '"')
+
+    def _read_scalar_text(self):
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match:
+                text = self.buf[self.pos:match.start()]
+                self.pos = match.start()
+                return text
+            # Token terakhir dokumen bisa berakhir tepat di EOF
+            chunk = self.f.read(self.chunk_size)
+            if not chunk:
+                text = self.buf[self.pos:]
+                self.pos = len(self.buf)
+                return text
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+
+    def read_value(self):
+        """Decode nilai berikutnya secara penuh (untuk field kecil)."""
+        char = self.peek()
+        if char == '"':
+            return self.read_string()
+        if char in "[{":
+            captured = []
+            self._skip_container(captured)
+            return json.loads("".join(captured))
+        return json.loads(self._read_scalar_text())
+
+    def _skip_container(self, captured=None):
+        """Lompati objek/array beserta isinya. captured (list) menampung teks mentah."""
+        depth = 0
+        while True:
+            end = _FLAT.match(self.buf, self.pos).end()
+            if captured is not None:
+                captured.append(self.buf[self.pos:end])
+            self.pos = end
+            if end >= len(self.buf) or self.buf[end] == '"':
+                # Buffer habis atau string terpotong di batas chunk: sambung lalu ulangi
+                self._fill()
+                continue
+            char = self.buf[end]
+            if captured is not None:
+                captured.append(char)
+            self.pos = end + 1
+            if char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def skip_value(self):
+        char = self.peek()
+        if char == '"':
+            self.pos += 1
+            self._scan_string(keep=False)
+        elif char in "[{":
+            self._skip_container()
+        else:
+            self._read_scalar_text()
+
+    def members(self):
+        """Iterasi key objek; pemanggil wajib membaca/melompati nilainya."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"JSON tidak valid: diharapkan ',' atau '}}', ditemukan '{char}'")
+
+    def items(self):
+        """Iterasi elemen array; pemanggil wajib membaca/melompati tiap elemen."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"JSON tidak valid: diharapkan ',' atau ']', ditemukan '{char}'")
+
+def _update_latest(summary, num):
+    if not isinstance(num, (int, float)):
+        return
+    if summary["latest_ch_num"] is None or num > summary["latest_ch_num"]:
+        summary["latest_ch_num"] = float(num)
+    if "ch_nums" in summary:
+        summary["ch_nums"].add(float(num))
+
+def _new_summary(with_nums):
+    summary = {"chapter_count": 0, "latest_ch_num": None}
+    if with_nums:
+        summary["ch_nums"] = set()
+    return summary
+
+def _summary_scanner(f, fields, with_nums=False):
+    scanner = _Scanner(f)
+    summary = _new_summary(with_nums)
+    for key in scanner.members():
+        if key in fields:
+            summary[key] = scanner.read_value()
+        elif key == "chapters" and scanner.peek() == '[':
+            for _ in scanner.items():
+                summary["chapter_count"] += 1
+                if scanner.peek() != '{':
+                    scanner.skip_value()
+                    continue
+                for ch_key in scanner.members():
+                    if ch_key == "ch_num":
+                        _update_latest(summary, scanner.read_value())
+                    else:
+                        scanner.skip_value()
+        else:
+            scanner.skip_value()
+    return summary
+
+def _summary_ijson(f, fields, with_nums=False):
+    summary = _new_summary(with_nums)
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if prefix == "chapters.item" and event in ("start_map", "start_array", "string", "number", "boolean", "null"):
+            summary["chapter_count"] += 1
+        elif prefix == "chapters.item.ch_num":
+            _update_latest(summary, value)
+        elif prefix in fields and event in ("string", "number", "boolean", "null"):
+            summary[prefix] = value
+    return summary
+
+def stream_summary(filepath, fields=SUMMARY_FIELDS, with_nums=False):
+    """
+    Ringkasan satu file seri tanpa membangun list chapter/images.
+    Return {<field>: nilai (hanya yang ada di file), 'chapter_count': int, 'latest_ch_num': float|None}.
+    with_nums=True menambah 'ch_nums' (set float) untuk menggabungkan delta WAL tanpa hitung ganda.
+    Field yang diminta harus bernilai skalar untuk mesin ijson (title, cover, ...).
+    """
+    use_ijson = ijson is not None and STREAM_BACKEND in ("auto", "ijson")
+    if STREAM_BACKEND == "ijson" and ijson is None:
+        print("[WARN] MONSTA_JSON_STREAM=ijson tetapi ijson tidak terpasang, memakai scanner bawaan.")
+    if use_ijson:
+        with open(filepath, 'rb') as f:
+            return _summary_ijson(f, fields, with_nums)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return _summary_scanner(f, fields, with_nums)
+
+if __name__ == "__main__":
+    import time
+    print("=== MONSTA JSON SUMMARY: UJI RINGKASAN ===")
+    print(f"[ENGINE] {'ijson' if ijson is not None and STREAM_BACKEND != 'scanner' else 'scanner bawaan'}")
+    path = input("[?] Path file seri : ").strip().strip('"')
+    start = time.perf_counter()
+    result = stream_summary(path)
+    print(f"[RESULT] {result}")
+    print(f"[TIME] {time.perf_counter() - start:.4f}s untuk {os.path.getsize(path) / 1024:.1f} KB")
@@ -0,0 +1,66 @@
+import os
+import json
+import threading
+
+# ==============================================================================
+# MONSTA PANEL JOURNAL: CHECKPOINT PER PANEL (V1.0)
+# ------------------------------------------------------------------------------
+# 1. APPEND-ONLY: Setiap panel yang sukses diupload langsung dicatat sebagai
+#    satu baris JSON {"src": ..., "url": ...} (tanpa menulis ulang file).
+# 2. RESUME TENGAH CHAPTER: Crash / Ctrl-C di panel 58 dari 60 tidak lagi
+#    membuang 57 upload; run berikutnya hanya mengerjakan sisanya.
+# 3. SEKALI PAKAI: Journal dihapus setelah chapter dikunci ke database.
+# 4. EKOR TERPOTONG: Baris terakhir yang terpotong crash dipangkas sebelum
+#    append berikutnya, agar catatan baru tidak tersambung ke baris rusak.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime", "journal")
+
+class ChapterJournal:
+    def __init__(self, slug, ch_num, journal_dir=JOURNAL_DIR):
+        self.path = os.path.join(journal_dir, slug, f"{ch_num}.jsonl")
+        self._lock = threading.Lock()
+        self._repaired = False
+
+    def _repair_tail(self):
+        """Pangkas file ke newline terakhir (sisa write yang terpotong crash)."""
+        self._repaired = True
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                print(f"      [JOURNAL] Baris terpotong di {os.path.basename(self.path)} dipangkas.")
+
+    def load(self):
+        """Return dict src -> link hosting dari panel yang sudah mendarat sebelumnya."""
+        landed = {}
+        with self._lock:
+            self._repair_tail()
+        if not os.path.exists(self.path):
+            return landed
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    landed[entry['src']] = entry['url']
+                except (ValueError, KeyError):
+                    # Baris terakhir bisa terpotong saat crash: abaikan saja
+                    continue
+        return landed
+
+    def record(self, src, url):
+        """Mencatat satu panel yang sukses (aman dipanggil dari thread pipeline)."""
+        line = json.dumps({"src": src, "url": url}, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if not self._repaired:
+                self._repair_tail()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
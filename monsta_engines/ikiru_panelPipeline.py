@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ikiru_rateLimiter import retry_queue
+
+# ==============================================================================
+# MONSTA PIPELINE: PANEL DOWNLOAD -> UPLOAD (V1.0 - OVERLAP ENGINE)
+# ------------------------------------------------------------------------------
+# Arsitektur Produsen/Konsumen:
+# 1. DUA KOLAM THREAD: Download (CDN sumber) dan Upload (host gambar) dibatasi
+#    secara terpisah, sehingga CDN dan host tidak saling menunggu.
+# 2. OVERLAP: Panel ke-N diupload sementara panel berikutnya masih didownload.
+# 3. BOUNDED: Jumlah biner panel yang "menggantung" di RAM dibatasi semaphore.
+# 4. URUTAN TERJAGA: Hasil dikembalikan sesuai indeks panel asli.
+# 5. RESUME: Panel yang sudah tercatat di journal tidak didownload ulang.
+# 6. RETRY QUEUE: Panel gagal dijadwalkan ulang dengan backoff berjitter,
+#    bukan dibuang; thread pool tetap bebas selama masa tunggu.
+# 7. TRANSCODE (opsional): Download -> konversi (process pool) -> upload;
+#    thread download tidak ikut menunggu CPU.
+# ==============================================================================
+
+# Batas Konkurensi Default
+DOWNLOAD_WORKERS = 4   # Koneksi paralel ke CDN sumber (itachi/uqni/ikiru)
+UPLOAD_WORKERS = 3     # Koneksi paralel ke host gambar (Catbox)
+PANEL_RETRIES = 3      # Jadwal ulang per tahap sebelum panel dinyatakan gagal
+
+def run_panel_pipeline(panel_urls, fetch_fn, upload_fn,
+                       download_workers=DOWNLOAD_WORKERS, upload_workers=UPLOAD_WORKERS,
+                       resume_map=None, transcode_fn=None):
+    """
+    Menjalankan download dan upload panel secara tumpang-tindih.
+    fetch_fn(p_idx, p_url) -> bytes (None jika gagal).
+    upload_fn(p_idx, p_url, img_bytes) -> link hosting (None jika gagal).
+    resume_map: dict p_url -> link hosting dari run sebelumnya (dilewati total).
+    transcode_fn(img_bytes) -> Future berisi biner siap upload (None = ditolak permanen).
+    Mengembalikan list sepanjang panel_urls: link hosting atau None per panel.
+    """
+    results = [None] * len(panel_urls)
+    resume_map = resume_map or {}
+    if not panel_urls:
+        return results
+
+    # Slot = panel yang sedang/siap didownload tetapi belum selesai diupload
+    slots = threading.BoundedSemaphore(download_workers + upload_workers * 2)
+    # Panel yang belum final (sukses / gagal permanen), termasuk yang menunggu retry
+    pending = [0]
+    done = threading.Condition()
+
+    def _finish():
+        slots.release()
+        with done:
+            pending[0] -= 1
+            done.notify_all()
+
+    with ThreadPoolExecutor(max_workers=upload_workers) as up_pool, \
+         ThreadPoolExecutor(max_workers=download_workers) as dl_pool:
+
+        # Setiap tahap: panel yang tidak diteruskan (ke pool lain / retry) WAJIB _finish(),
+        # termasuk saat submit/schedule/callback sendiri melempar error tak terduga.
+        def _resubmit(pool, stage, p_idx, *args):
+            # Dijalankan thread retry_queue: submit yang gagal tetap menutup panel
+            try:
+                pool.submit(stage, p_idx, *args)
+            except Exception as e_int:
+                print(f"      [ERROR] Kendala internal pipeline (retry) panel {p_idx+1}: {e_int}")
+                _finish()
+
+        def _upload(p_idx, p_url, img_bytes, attempt=0):
+            handed = False
+            try:
+                try:
+                    results[p_idx] = upload_fn(p_idx, p_url, img_bytes)
+                except Exception as e_up:
+                    print(f"      [ERROR] Kendala upload panel {p_idx+1}: {e_up}")
+                if results[p_idx] is None and attempt < PANEL_RETRIES:
+                    # Slot tetap dipegang: biner panel masih di RAM selama menunggu
+                    delay = retry_queue.schedule(attempt, lambda: _resubmit(up_pool, _upload, p_idx, p_url, img_bytes, attempt + 1))
+                    handed = True
+                    print(f"      [RETRY] Upload panel {p_idx+1} dijadwalkan ulang dalam {delay:.1f}s")
+            except Exception as e_int:
+                print(f"      [ERROR] Kendala internal pipeline (upload) panel {p_idx+1}: {e_int}")
+                results[p_idx] = None
+            finally:
+                if not handed:
+                    _finish()
+
+        def _transcoded(p_idx, p_url, future):
+            # Dipanggil saat Future konversi selesai (thread manajer process pool)
+            handed = False
+            try:
+                try:
+                    img_bytes = future.result()
+                except Exception as e_tc:
+                    print(f"      [ERROR] Kendala transcode panel {p_idx+1}: {e_tc}")
+                    return
+                if img_bytes is None:
+                    print(f"      [SKIP] Panel {p_idx+1} tetap melebihi batas ukuran host setelah konversi.")
+                    return
+                up_pool.submit(_upload, p_idx, p_url, img_bytes)
+                handed = True
+            except Exception as e_int:
+                print(f"      [ERROR] Kendala internal pipeline (transcode) panel {p_idx+1}: {e_int}")
+                results[p_idx] = None
+            finally:
+                if not handed:
+                    _finish()
+
+        def _download(p_idx, p_url, attempt=0):
+            handed = False
+            try:
+                try:
+                    img_bytes = fetch_fn(p_idx, p_url)
+                except Exception as e_dl:
+                    print(f"      [ERROR] Kendala panel {p_idx+1}: {e_dl}")
+                    img_bytes = None
+
+                if img_bytes is not None and transcode_fn is not None:
+                    future = transcode_fn(img_bytes)
+                    future.add_done_callback(lambda f: _transcoded(p_idx, p_url, f))
+                    handed = True
+                elif img_bytes is not None:
+                    up_pool.submit(_upload, p_idx, p_url, img_bytes)
+                    handed = True
+                elif attempt < PANEL_RETRIES:
+                    delay = retry_queue.schedule(attempt, lambda: _resubmit(dl_pool, _download, p_idx, p_url, attempt + 1))
+                    handed = True
+                    print(f"      [RETRY] Download panel {p_idx+1} dijadwalkan ulang dalam {delay:.1f}s")
+            except Exception as e_int:
+                print(f"      [ERROR] Kendala internal pipeline (download/transcode) panel {p_idx+1}: {e_int}")
+                results[p_idx] = None
+            finally:
+                if not handed:
+                    _finish()
+
+        for p_idx, p_url in enumerate(panel_urls):
+            if p_url in resume_map:
+                results[p_idx] = resume_map[p_url]
+                continue
+            slots.acquire()
+            with done:
+                pending[0] += 1
+            dl_pool.submit(_download, p_idx, p_url)
+
+        # Tunggu semua panel final (retry tertunda masih butuh kedua pool hidup)
+        with done:
+            while pending[0]:
+                done.wait()
+
+    return results
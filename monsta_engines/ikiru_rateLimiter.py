@@ -0,0 +1,195 @@
+import time
+import heapq
+import random
+import threading
+from urllib.parse import urlsplit
+
+# ==============================================================================
+# MONSTA RATE LIMITER: TOKEN BUCKET AIMD + RETRY BERJITTER (V1.0)
+# ------------------------------------------------------------------------------
+# 1. TOKEN BUCKET PER HOST: Ikiru, CDN panel, Catbox, Telegraph masing-masing
+#    punya laju sendiri (req/detik + burst), bukan sleep tetap.
+# 2. AIMD: Sukses -> laju naik perlahan (+step); 429/5xx/timeout -> laju
+#    dipotong setengah, Retry-After dihormati (host dibekukan sementara).
+# 3. RETRY BERJITTER: request_with_retry mengulang 429/5xx/koneksi putus
+#    dengan backoff eksponensial + jitter (tidak serempak antar thread).
+# 4. RETRY QUEUE: Panel yang gagal dijadwalkan ulang tanpa memblokir thread
+#    download/upload (dipakai oleh panel pipeline).
+# ==============================================================================
+
+# Laju awal per host (req/detik). Host lain memakai DEFAULT_RATE.
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+HOST_RATES = {
+    "catbox.moe": 3.0,
+    "telegra.ph": 2.0,
+}
+MIN_RATE = 0.2
+MAX_RATE = 20.0
+ADDITIVE_STEP = 0.25            # Kenaikan laju per respon sukses
+DECREASE_FACTOR = 0.5           # Pemotongan laju saat host kewalahan
+DECREASE_COOLDOWN = 2.0         # Detik: banyak gagal serentak = satu kali potong
+
+# Retry request tunggal
+RETRY_ATTEMPTS = 4
+BACKOFF_BASE = 1.0              # Detik, percobaan ke-1
+BACKOFF_CAP = 30.0              # Batas atas backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+def backoff_delay(attempt):
+    """Backoff eksponensial dengan 'equal jitter': setengah tetap, setengah acak."""
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+def _retry_after_seconds(response):
+    value = (response.headers or {}).get("Retry-After") or (response.headers or {}).get("retry-after")
+    try:
+        return min(float(value), BACKOFF_CAP) if value else None
+    except ValueError:
+        return None
+
+def _status_of(response):
+    # requests.Response -> status_code | Playwright APIResponse -> status
+    return getattr(response, "status_code", None) or getattr(response, "status", None)
+
+class HostBucket:
+    def __init__(self, host, rate, burst=DEFAULT_BURST):
+        self.host = host
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(MAX_RATE, self.rate + ADDITIVE_STEP)
+
+    def on_throttle(self, reason, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            # Request yang sedang terbang saat host kewalahan gagal bersamaan:
+            # cukup dihitung sebagai satu sinyal kemacetan
+            if now - self.last_decrease < DECREASE_COOLDOWN:
+                return
+            self.last_decrease = now
+            old_rate = self.rate
+            self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)
+        print(f"      [RATE] {self.host}: {old_rate:.1f} -> {self.rate:.1f} req/s ({reason})")
+
+class RateLimiter:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = next((r for key, r in HOST_RATES.items() if key in host), DEFAULT_RATE)
+                bucket = self._buckets[host] = HostBucket(host, rate)
+            return bucket
+
+    def acquire(self, url):
+        """Blok sampai host dari url boleh menerima satu request lagi."""
+        self.bucket(url).acquire()
+
+    def snapshot(self):
+        with self._lock:
+            return {host: round(b.rate, 2) for host, b in self._buckets.items()}
+
+# Instance bersama untuk semua modul dalam satu proses
+rate_limiter = RateLimiter()
+
+def request_with_retry(send_fn, url, *args, attempts=RETRY_ATTEMPTS, **kwargs):
+    """
+    Memanggil send_fn(url, ...) lewat rate limiter, mengulang 429/5xx/error koneksi.
+    Return response terakhir (status apa pun); exception dilempar ulang jika semua
+    percobaan berakhir dengan exception.
+    """
+    bucket = rate_limiter.bucket(url)
+    response = None
+    for attempt in range(attempts):
+        bucket.acquire()
+        try:
+            response = send_fn(url, *args, **kwargs)
+        except Exception as e:
+            bucket.on_throttle(type(e).__name__)
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"      [RETRY] {bucket.host} error ({e.__class__.__name__}), ulang {attempt+2}/{attempts} dalam {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        status = _status_of(response)
+        if status not in RETRY_STATUSES:
+            bucket.on_success()
+            return response
+
+        retry_after = _retry_after_seconds(response)
+        bucket.on_throttle(f"HTTP {status}", retry_after)
+        if attempt == attempts - 1:
+            break
+        delay = retry_after or backoff_delay(attempt)
+        print(f"      [RETRY] {bucket.host} HTTP {status}, ulang {attempt+2}/{attempts} dalam {delay:.1f}s")
+        time.sleep(delay)
+    return response
+
+class RetryQueue:
+    """Penjadwal tunda: fn dipanggil setelah backoff, oleh satu thread latar."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, attempt, fn):
+        delay = backoff_delay(attempt)
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, fn))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="retry_queue", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return delay
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, _, fn = heapq.heappop(self._heap)
+            try:
+                fn()
+            except Exception as e:
+                print(f"      [RETRY ERROR] Tugas ulang gagal dijalankan: {e}")
+
+retry_queue = RetryQueue()
@@ -3,12 +3,18 @@ import json
 import time
 import re
 import requests
-import io
 import mimetypes
-from PIL import Image
 from datetime import datetime
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from ikiru_htmlParser import parse_html
+from ikiru_httpClient import SOURCE_BASE, SETTLE_TIMEOUT_MS, SETTLE_JS
+from ikiru_rateLimiter import request_with_retry
+from ikiru_uploadClient import upload_client
+from ikiru_uploadCache import upload_cache, content_digest
+from ikiru_transcode import TELEGRAPH_PROFILE, transcode_panel, shutdown_pool
+from ikiru_chapterKey import ChapterIndex, extract_number
+from ikiru_compactFormat import decode_series
+from ikiru_seriesStore import safe_save_json
 
 # ==============================================================================
 # MONSTA BOT 2: DISTRIBUTED WORKER (V37.0 - ULTIMATE FORENSIC TITAN)
@@ -21,6 +27,15 @@ from bs4 import BeautifulSoup
 # 5. HTMX & DATA-ATTRIBUTE SNIPER: Akurasi bedah pada struktur dinamis Ikiru.
 # 6. ATOMIC DISK WRITE: Proteksi integritas JSON via swap .tmp (Anti-Corrupt).
 # 7. FORENSIC NOISY LOG: Laporan per-detik (Found, Fetch, Size, Convert, Upload, Disk).
+# 8. UPLOAD CACHE: Biner sumber yang sama (SHA-256) langsung memakai link lama.
+# 9. FAST PARSER: selectolax/lxml menggantikan html.parser (lihat ikiru_htmlParser).
+# 10. STUB MODE: MONSTA_SOURCE_BASE / MONSTA_TELEGRAPH_* mengarah ke ikiru_stubServer.
+# 11. ADAPTIVE RATE: Token bucket AIMD per host + retry berjitter, tanpa sleep tetap.
+# 12. POOLED UPLOAD: Koneksi keep-alive bersama (opsional HTTP/2 & streaming multipart).
+# 13. TRANSCODE POOL: Konversi JPEG di process pool, size cap bertahap menggantikan tolak 5MB.
+# 14. CHAPTER KEY: Nomor chapter ternormalisasi (10-5, Part 2, Extra) + index terurut.
+# 15. FORMAT SERAGAM: Resume via decode_series & simpan via safe_save_json milik
+#     ikiru_seriesStore (PUBLISH_FORMAT yang sama dengan Bot V2, atomik os.replace).
 # ==============================================================================
 
 # --- KONFIGURASI JALUR SISTEM ---
@@ -30,6 +45,11 @@ DATABASE_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "database")
 AUTH_FILE = os.path.join(BASE_DIR, "..", "monstacomics", "telegraph_auth.json")
 ANOMALI_LOG = os.path.join(BASE_DIR, "..", "monstacomics", "anomali_log.json")
 
+# --- ENDPOINT TELEGRAPH (bisa dialihkan ke stub lokal) ---
+TELEGRAPH_BASE = os.environ.get("MONSTA_TELEGRAPH_BASE", "https://telegra.ph").rstrip("/")
+TELEGRAPH_API = os.environ.get("MONSTA_TELEGRAPH_API", "https://api.telegra.ph").rstrip("/")
+TELEGRAPH_CACHE_HOST = "telegraph" if TELEGRAPH_BASE == "https://telegra.ph" else "telegraph-stub"
+
 # Inisialisasi Infrastruktur Folder
 if not os.path.exists(DATABASE_DIR):
     os.makedirs(DATABASE_DIR)
@@ -60,7 +80,7 @@ def get_or_create_telegraph_token():
 
     print("[AUTH] Menciptakan akun Sovereign baru di Telegraph...")
     try:
-        url = "https://api.telegra.ph/createAccount"
+        url = f"{TELEGRAPH_API}/createAccount"
         params = {
             "short_name": "MonstaBot",
             "author_name": "Monsta Sovereign Titan",
@@ -87,34 +107,35 @@ def verbose_titan_upload(img_bytes, source_url):
     Menghancurkan Error 400 dengan memastikan format selalu JPEG Whitelisted.
     """
     try:
+        # 0. CEK CACHE: Kunci = biner sumber, jadi konversi JPEG ikut dilewati
+        digest = content_digest(img_bytes)
+        cached_url = upload_cache.get(TELEGRAPH_CACHE_HOST, digest)
+        if cached_url:
+            print(f"      [CACHE HIT] Biner sudah pernah diupload: {cached_url}")
+            return cached_url
+
         # 1. FORENSIC: ANALISA AWAL
         orig_ext = source_url.split('.')[-1].split('?')[0].lower()
         print(f"      [PROCESS] Membedah biner dari sumber ({orig_ext})...")
 
-        # 2. SURGERY: KONVERSI KE JPEG (Fix Error 400)
+        # 2. SURGERY: KONVERSI KE JPEG DI PROCESS POOL (Fix Error 400)
+        # JPEG < 5MB lewat apa adanya; selain itu dikonversi & diturunkan sampai muat
         try:
-            img = Image.open(io.BytesIO(img_bytes))
-            # Handle transparansi (RGBA) ke RGB agar JPEG tidak error
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            
-            # Simpan ke buffer RAM sebagai JPEG
-            buffer = io.BytesIO()
-            img.save(buffer, format="JPEG", quality=85)
-            final_bytes = buffer.getvalue()
-            
-            # Hitung ukuran hasil konversi
-            final_size_mb = len(final_bytes) / (1024 * 1024)
-            print(f"      [CONVERT] WebP/PNG -> JPEG Sukses. Ukuran Baru: {final_size_mb:.2f} MB")
-            
+            final_bytes = transcode_panel(img_bytes, TELEGRAPH_PROFILE)
+
             # 3. SCALE GUARD (5MB Limit)
-            if final_size_mb >= 5.0:
-                print(f"      [SKIP] File hasil konversi melebihi 5MB. Telegraph menolak.")
+            if final_bytes is None:
+                print(f"      [SKIP] Panel tetap melebihi 5MB setelah kompresi. Telegraph menolak.")
                 return None
-                
+
+            final_size_mb = len(final_bytes) / (1024 * 1024)
+            if final_bytes is img_bytes:
+                print(f"      [PASS-THROUGH] JPEG sudah memenuhi batas. Ukuran: {final_size_mb:.2f} MB")
+            else:
+                print(f"      [CONVERT] WebP/PNG -> JPEG Sukses. Ukuran Baru: {final_size_mb:.2f} MB")
             mime_type = "image/jpeg"
             filename = f"monsta_{int(time.time())}.jpg"
-            
+
         except Exception as e_conv:
             print(f"      [WARN] Operasi konversi gagal ({e_conv}). Mencoba kirim data asli...")
             final_bytes = img_bytes
@@ -122,12 +143,13 @@ def verbose_titan_upload(img_bytes, source_url):
             filename = f"panel.{orig_ext}"
 
         # 4. TRANSMISI: MULTIPART POST (Struktur Stack Overflow)
-        url = 'https://telegra.ph/upload'
-        files = {'file': (filename, final_bytes, mime_type)}
+        url = f'{TELEGRAPH_BASE}/upload'
         
         print(f"      [UPLOADING] Mengirim paket data ke Telegraph...")
-        # Gunakan requests.post langsung (tanpa session headers) untuk stabilitas multipart
-        response = requests.post(url, files=files, timeout=60)
+        # Client upload khusus (tanpa header Accept JSON milik session) -> multipart stabil,
+        # koneksi keep-alive dipakai ulang antar panel
+        response = request_with_retry(upload_client.post_file, url, 'file', filename, final_bytes,
+                                      mime_type, timeout=60)
         
         # 5. DIAGNOSA RESPON
         if response.status_code != 200:
@@ -138,9 +160,10 @@ def verbose_titan_upload(img_bytes, source_url):
         try:
             res_json = response.json()
             if isinstance(res_json, list) and len(res_json) > 0:
-                t_link = "https://telegra.ph" + res_json[0]['src']
+                t_link = TELEGRAPH_BASE + res_json[0]['src']
                 # BUKTI BERHASIL
                 print(f"      [SUCCESS] Link Telegraph Tercipta: {t_link}")
+                upload_cache.put(TELEGRAPH_CACHE_HOST, digest, t_link, len(img_bytes))
                 return t_link
             else:
                 print(f"      [FAILURE] Format JSON ilegal dari server: {res_json}")
@@ -155,32 +178,19 @@ def verbose_titan_upload(img_bytes, source_url):
 
 # --- FUNGSI UTILITAS (TOOLS) ---
 
+def settle(page, img_selector):
+    """Menunggu lazy-load mengisi src gambar (selesai secepat laman siap, bukan sleep tetap)."""
+    try:
+        page.wait_for_function(SETTLE_JS, arg=img_selector, timeout=SETTLE_TIMEOUT_MS)
+    except Exception:
+        pass
+
 def clean_text(text):
     if not text: return ""
     text = re.sub(r'<[^>]+>', '', text)
     text = text.replace('\n', ' ').replace('\t', ' ')
     return re.sub(r'\s+', ' ', text).strip()
 
-def extract_number(text):
-    if not text: return 0.0
-    match = re.search(r'(\d+(\.\d+)?)', str(text))
-    return float(match.group(1)) if match else 0.0
-
-def safe_save_json(data, filepath):
-    """Menyimpan data dengan teknik Atomic dan konfirmasi bukti di CMD."""
-    temp_path = filepath + ".tmp"
-    try:
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        os.rename(temp_path, filepath)
-        print(f"      [DISK] Status: Data dikunci ke {os.path.basename(filepath)} (SYNC OK).")
-        return True
-    except Exception as e:
-        print(f"      [DISK ERROR] Gagal mengunci data ke harddisk: {e}")
-        return False
-
 # --- MESIN UTAMA (THE WORKER) ---
 
 def run_worker_node():
@@ -220,7 +230,7 @@ def run_worker_node():
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
             viewport={'width': 1920, 'height': 1080}
         )
-        context.set_extra_http_headers({"Referer": "https://02.ikiru.wtf/"})
+        context.set_extra_http_headers({"Referer": SOURCE_BASE + "/"})
         page = context.new_page()
 
         for idx, target in enumerate(my_tasks):
@@ -232,7 +242,8 @@ def run_worker_node():
             if os.path.exists(db_path):
                 try:
                     with open(db_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                        # File compact (PUBLISH_FORMAT) di-decode ke skema kanonik dulu
+                        data = decode_series(json.load(f))
                     print(f"[{idx+1}/{len(my_tasks)}] RESUMING: {target['title']}")
                 except: data = None
             
@@ -253,7 +264,7 @@ def run_worker_node():
                 # STEP 1: DETAIL PAGE & HTMX SNIPER
                 # ---------------------------------------------------------
                 print("   -> 1. Navigasi ke Laman Detail...")
-                page.goto(target['source_url'], timeout=60000, wait_until="networkidle")
+                request_with_retry(page.goto, target['source_url'], timeout=60000, wait_until="networkidle")
                 
                 # HTMX Trigger (Anti-Zonk Chapter)
                 try:
@@ -268,8 +279,8 @@ def run_worker_node():
                     print(f"      [INFO] HTMX Trigger Skip: {e_htmx}")
 
                 # Backup Scroll
-                page.keyboard.press("End"); time.sleep(2)
-                soup = BeautifulSoup(page.content(), "html.parser")
+                page.keyboard.press("End"); settle(page, "div[itemprop='image'] img")
+                soup = parse_html(page.content())
 
                 # --- STEP 2: COVER PROCESSING (THE FORENSIC LOG) ---
                 if not data.get('cover') or "telegra.ph" not in data['cover']:
@@ -279,12 +290,12 @@ def run_worker_node():
                     if img_node:
                         orig_url = (img_node.get('src') or img_node.get('data-src') or "").split('?')[0]
                         if orig_url:
-                            if orig_url.startswith("/"): orig_url = "https://02.ikiru.wtf" + orig_url
+                            if orig_url.startswith("/"): orig_url = SOURCE_BASE + orig_url
                             
                             print(f"      [FOUND] Link Cover Asli: {orig_url}")
                             try:
                                 print(f"      [FETCH] Mendownload bytes gambar...")
-                                c_resp = page.request.get(orig_url, timeout=30000)
+                                c_resp = request_with_retry(page.request.get, orig_url, timeout=30000)
                                 if c_resp.status == 200:
                                     t_url = verbose_titan_upload(c_resp.body(), orig_url)
                                     if t_url:
@@ -312,8 +323,8 @@ def run_worker_node():
                 print(f"      [INFO] {len(ch_found)} Chapter Terkunci via Data-Attribute.")
 
                 # --- STEP 4: READER ENGINE (THE PANEL PROOF) ---
-                existing_nums = [c['ch_num'] for c in data['chapters']]
-                work_queue = [c for c in ch_found if c['num'] not in existing_nums]
+                chapter_index = ChapterIndex(data['chapters'])
+                work_queue = chapter_index.missing(ch_found)
                 
                 print(f"      [QUEUE] {len(work_queue)} Chapter baru siap dipanen.")
 
@@ -322,19 +333,20 @@ def run_worker_node():
                     print(f"      [NAVIGATE] Reader URL: {ch_task['url']}")
                     
                     try:
-                        page.goto(ch_task['url'], timeout=60000, wait_until="domcontentloaded")
+                        request_with_retry(page.goto, ch_task['url'], timeout=60000, wait_until="domcontentloaded")
                         # Scroll Lazy Load
                         for _ in range(3):
-                            page.mouse.wheel(0, 1500); time.sleep(0.7)
+                            page.mouse.wheel(0, 1500)
+                        settle(page, "section[data-image-data='1'] img")
                         
                         # Tunggu Reader Section
                         try:
                             page.wait_for_selector("section[data-image-data='1'] img", timeout=15000)
                         except: pass
 
-                        c_soup = BeautifulSoup(page.content(), "html.parser")
+                        c_soup = parse_html(page.content())
                         reader_area = c_soup.select_one("section[data-image-data='1']")
-                        img_nodes = reader_area.find_all('img') if reader_area else c_soup.find_all('img')
+                        img_nodes = reader_area.select('img') if reader_area else c_soup.select('img')
                         
                         panel_urls = []
                         for node in img_nodes:
@@ -353,7 +365,7 @@ def run_worker_node():
                             for p_idx, p_url in enumerate(panel_urls):
                                 try:
                                     print(f"      [FETCH] Panel {p_idx+1}/{len(panel_urls)} -> {p_url[:45]}...")
-                                    p_resp = page.request.get(p_url, timeout=40000)
+                                    p_resp = request_with_retry(page.request.get, p_url, timeout=40000)
                                     if p_resp.status == 200:
                                         t_url = verbose_titan_upload(p_resp.body(), p_url)
                                         if t_url:
@@ -366,12 +378,11 @@ def run_worker_node():
                         
                         # FINAL CHAPTER STORAGE
                         if telegraph_proofs:
-                            data['chapters'].append({
+                            chapter_index.add({
                                 "ch_num": ch_task['num'],
                                 "release_date": datetime.now().strftime("%Y-%m-%d"),
                                 "images": list(dict.fromkeys(telegraph_proofs))
                             })
-                            data['chapters'].sort(key=lambda x: x['ch_num'], reverse=True)
                             
                             # PROOF OF STORAGE
                             print(f"      [PROOF] Chapter {ch_task['num']} Selesai dengan {len(telegraph_proofs)} Link Terverifikasi.")
@@ -391,6 +402,7 @@ def run_worker_node():
                 print(f"   [FATAL] Error pada {slug}: {e_fatal}")
 
         browser.close()
+        shutdown_pool()
         print("\n====================================================")
         print("   OPERASI SELESAI. SILAKAN CEK HASIL DI DATABASE.")
         print("====================================================")
@@ -1,11 +1,22 @@
 import os
 import json
-import time
 import re
-import requests
+import itertools
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ikiru_htmlParser import parse_html
+from ikiru_browserPool import BrowserPool, PAGE_POOL_SIZE
+from ikiru_workQueue import WorkQueue, LeaseHeartbeat, default_node_id
+from ikiru_panelJournal import ChapterJournal
+from ikiru_updateScan import find_changed_targets
+from ikiru_seriesStore import SeriesStore
+from ikiru_seriesModel import Series
+from ikiru_chapterKey import extract_number
+from ikiru_panelPipeline import run_panel_pipeline, DOWNLOAD_WORKERS, UPLOAD_WORKERS
+from ikiru_uploaders import upload_router
+from ikiru_transcode import CATBOX_PROFILE, submit_transcode, transcode_panel, extension_for, shutdown_pool
+from ikiru_httpClient import SOURCE_BASE, source_get, extract_panel_urls, fetch_reader_panels, \
+    fetch_page_html, fetch_chapter_fragment
 
 # ==============================================================================
 # MONSTA BOT 2: DISTRIBUTED WORKER (V40.0 - CATBOX MIGRATION ULTIMATE)
@@ -16,6 +27,24 @@ from bs4 import BeautifulSoup
 # 3. HTMX & DATA-ATTRIBUTE SNIPER: Akurasi bedah pada struktur dinamis Ikiru.
 # 4. ATOMIC DISK WRITE: Proteksi integritas JSON via swap .tmp (Anti-Corrupt).
 # 5. FORENSIC NOISY LOG: Laporan "berisik" (Found -> Fetch -> Upload -> Success).
+# 6. PANEL PIPELINE: Download CDN & Upload Catbox berjalan tumpang-tindih.
+# 7. READER FAST PATH: Laman reader via HTTP, Playwright hanya sebagai cadangan.
+# 8. HTMX DIRECT: Daftar chapter langsung dari endpoint partial (tanpa klik).
+# 9. BROWSER POOL: N judul paralel di N tab dalam satu proses Chromium.
+# 10. COORDINATOR QUEUE: Judul disewa dari antrian bersama (lease + heartbeat).
+# 11. UPLOAD CACHE: Biner yang sama (SHA-256) langsung memakai link Catbox lama.
+# 12. PANEL JOURNAL: Chapter yang terputus dilanjutkan dari panel terakhir.
+# 13. UPDATE SCAN: Hanya judul yang chapter terbarunya berubah di listing.
+# 14. SERIES STORE: Layout single atau sharded (manifest + shard per chapter).
+# 15. WRITE-AHEAD LOG: Delta kecil per chapter, kompaksi saat judul selesai.
+# 16. FAST PARSER: selectolax/lxml menggantikan html.parser (lihat ikiru_htmlParser).
+# 17. STUB MODE: MONSTA_SOURCE_BASE & MONSTA_CATBOX_API mengarah ke ikiru_stubServer.
+# 18. ADAPTIVE RATE: Token bucket AIMD per host + retry berjitter, tanpa sleep tetap.
+# 19. POOLED UPLOAD: Koneksi keep-alive bersama (opsional HTTP/2 & streaming multipart).
+# 20. MULTI-BACKEND: Catbox/Telegraph/lokal/S3 dengan failover sadar latensi (ikiru_uploaders).
+# 21. TRANSCODE STAGE: Konversi di process pool hanya jika format/ukuran melebihi batas host.
+# 22. CHAPTER KEY: Nomor chapter ternormalisasi (10-5, Part 2, Extra) + index terurut.
+# 23. SERIES MODEL: Seri dipegang sebagai objek __slots__ (host diintern, link dipadatkan).
 # ==============================================================================
 
 # --- KONFIGURASI JALUR SISTEM ---
@@ -28,51 +57,27 @@ ANOMALI_LOG = os.path.join(BASE_DIR, "..", "monstacomics", "anomali_log.json")
 if not os.path.exists(DATABASE_DIR):
     os.makedirs(DATABASE_DIR)
 
-# --- MESIN UPLOAD: CATBOX.MOE (THE NEW HEART) ---
+# --- TAHAP PIPELINE PANEL (DIPANGGIL DARI THREAD) ---
 
-def upload_to_catbox(img_bytes, filename="image.webp"):
-    """
-    Fungsi Pengunggah Utama ke Catbox.moe.
-    Menggantikan Telegraph dengan logika yang jauh lebih sederhana dan kuat.
-    """
-    try:
-        url = "https://catbox.moe/user/api.php"
-        
-        # Payload Standar Catbox (Anonim)
-        payload = {
-            'reqtype': 'fileupload',
-            'userhash': '' # Biarkan kosong untuk upload anonim
-        }
-        
-        # Kirim File Mentah (Tanpa Konversi Pillow)
-        files = {
-            'fileToUpload': (filename, img_bytes)
-        }
-        
-        # LOG FORENSIK: Lapor sebelum kirim
-        print(f"      [UPLOAD] Mengirim {len(img_bytes)} bytes ke Catbox...")
-        
-        # Eksekusi POST (Timeout 60 detik untuk file besar)
-        response = requests.post(url, data=payload, files=files, timeout=60)
-        
-        if response.status_code == 200:
-            # Catbox mengembalikan URL mentah (text/plain) di body
-            result_url = response.text.strip()
-            
-            # Validasi URL
-            if result_url.startswith("http"):
-                print(f"      [SUCCESS] Link Catbox Tercipta: {result_url}")
-                return result_url
-            else:
-                print(f"      [FAILURE] Respon Catbox Aneh: {result_url}")
-                return None
-        else:
-            print(f"      [FAILURE] Server Error (Status {response.status_code})")
-            return None
+def fetch_panel_bytes(p_idx, p_url):
+    """Tahap Download: ambil biner panel dari CDN sumber."""
+    # page.request milik Playwright tidak boleh dipakai lintas thread,
+    # jadi panel didownload lewat session pooled dengan identitas yang sama.
+    print(f"      [FETCH] Panel {p_idx+1} -> {p_url[:45]}...")
+    p_resp = source_get(p_url, timeout=40)
+    if p_resp.status_code == 200:
+        return p_resp.content
+    print(f"      [ERROR] Download panel {p_idx+1} gagal. Status: {p_resp.status_code}")
+    return None
+
+def transcode_panel_bytes(img_bytes):
+    """Tahap Transcode: pass-through jika sudah memenuhi batas, selain itu ke process pool."""
+    return submit_transcode(img_bytes, CATBOX_PROFILE)
 
-    except Exception as e:
-        print(f"      [ERROR] Kendala Koneksi Catbox: {e}")
-        return None
+def upload_panel_bytes(p_idx, p_url, img_bytes):
+    """Tahap Upload: kirim biner panel ke backend tersehat (ekstensi mengikuti isi biner)."""
+    ext = extension_for(img_bytes, p_url.split('.')[-1].split('?')[0])
+    return upload_router.upload(img_bytes, f"panel_{p_idx}.{ext}")
 
 # --- FUNGSI UTILITAS (TOOLS) ---
 
@@ -82,28 +87,189 @@ def clean_text(text):
     text = text.replace('\n', ' ').replace('\t', ' ')
     return re.sub(r'\s+', ' ', text).strip()
 
-def extract_number(text):
-    if not text: return 0.0
-    match = re.search(r'(\d+(\.\d+)?)', str(text))
-    return float(match.group(1)) if match else 0.0
+# --- PEMBEDAH LAMAN DETAIL ---
+
+def find_cover_url(soup):
+    """Link cover asli dari laman detail (tanpa query string), atau ""."""
+    cover_box = soup.select_one("div[itemprop='image']")
+    img_node = cover_box.select_one("img") if cover_box else soup.select_one("img.wp-post-image")
+    if not img_node:
+        return ""
+    orig_url = (img_node.get('src') or img_node.get('data-src') or "").split('?')[0]
+    if orig_url.startswith("/"): orig_url = SOURCE_BASE + orig_url
+    return orig_url
+
+def extract_synopsis(soup):
+    syn_box = soup.select_one("div[itemprop='description'][data-show='false']") or \
+              soup.select_one("div[itemprop='description']")
+    return clean_text(syn_box.get_text()) if syn_box else "N/A"
+
+def collect_chapter_links(ch_soup):
+    """Daftar {num, url} unik dari div[data-chapter-number], urut naik."""
+    ch_found = []
+    seen_urls = set()
+    for div in ch_soup.select("div[data-chapter-number]"):
+        a_tag = div.select_one("a")
+        if a_tag and a_tag.get('href') not in seen_urls:
+            num = extract_number(div.get('data-chapter-number'))
+            ch_found.append({"num": num, "url": a_tag.get('href')})
+            seen_urls.add(a_tag.get('href'))
+    ch_found.sort(key=lambda x: x['num'])
+    return ch_found
+
+# --- MESIN UTAMA (THE WORKER) ---
+
+def process_title(browser_pool, target, idx, total):
+    """
+    Memproses satu judul dari awal sampai akhir (dipanggil paralel per tab).
+    Setiap judul punya file database sendiri, jadi penulisan disk tidak pernah bertabrakan.
+    Return True jika judul tuntas, False jika berhenti karena error fatal.
+    """
+    slug = target['slug']
+    store = SeriesStore(slug, DATABASE_DIR)
+
+    # --- MANAJEMEN RESUME ---
+    data = None
+    if store.exists():
+        try:
+            data = store.load_model()
+            print(f"[{idx+1}/{total}] RESUMING: {target['title']}")
+        except: data = None
+
+    if not data:
+        print(f"[{idx+1}/{total}] STARTING FRESH: {target['title']}")
+        data = Series(slug=slug, title=target['title'])
+        store.save_meta(data)
 
-def safe_save_json(data, filepath):
-    """Menyimpan data dengan teknik Atomic dan konfirmasi bukti di CMD."""
-    temp_path = filepath + ".tmp"
     try:
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        os.rename(temp_path, filepath)
-        # LOG FORENSIK: Lapor penulisan disk
-        print(f"      [DISK] Status: Data dikunci ke {os.path.basename(filepath)} (SYNC OK).")
+        # ---------------------------------------------------------
+        # STEP 1: DETAIL PAGE & HTMX SNIPER
+        # ---------------------------------------------------------
+        print("   -> 1. Navigasi ke Laman Detail...")
+        # Jalur Cepat: HTML detail + endpoint HTMX chapter_list via HTTP
+        detail_html = fetch_page_html(target['source_url'])
+        chapter_html = fetch_chapter_fragment(detail_html) if detail_html else None
+
+        if detail_html and chapter_html:
+            print("      [FAST PATH] Detail & Daftar Chapter diambil via HTTP (tanpa render).")
+            soup = parse_html(detail_html)
+            ch_soup = parse_html(chapter_html)
+        else:
+            soup = parse_html(browser_pool.render_detail(target['source_url']))
+            ch_soup = soup
+
+        # --- STEP 2: COVER PROCESSING (CATBOX MODE) ---
+        if not upload_router.owns(data.cover):
+            orig_url = find_cover_url(soup)
+            if orig_url:
+                print(f"      [FOUND] Link Cover Asli: {orig_url}")
+                try:
+                    print(f"      [FETCH] Mendownload bytes gambar...")
+                    c_resp = source_get(orig_url, timeout=30)
+                    if c_resp.status_code == 200:
+                        # Ambil ekstensi asli (WebP/JPG/PNG), konversi hanya jika melebihi batas
+                        c_bytes = transcode_panel(c_resp.content, CATBOX_PROFILE)
+                        if c_bytes:
+                            ext = extension_for(c_bytes, orig_url.split('.')[-1])
+                            t_url = upload_router.upload(c_bytes, f"cover.{ext}")
+                            if t_url:
+                                store.set_fields(data, cover=t_url)
+                except Exception as e_up:
+                    print(f"      [ERROR] Gagal proses cover: {e_up}")
+
+        # --- STEP 3: METADATA & CHAPTER COLLECTION ---
+        data.metadata['synopsis'] = extract_synopsis(soup)
+        store.set_fields(data, metadata=data.metadata)
+
+        ch_found = collect_chapter_links(ch_soup)
+        print(f"      [INFO] {len(ch_found)} Chapter Terkunci via Data-Attribute.")
+
+        # --- STEP 4: READER ENGINE (THE PANEL PROOF) ---
+        # Cek keberadaan via set ch_num (bukan scan list per chapter)
+        work_queue = store.chapter_index(data).missing(ch_found)
+
+        print(f"      [QUEUE] {len(work_queue)} Chapter baru siap dipanen.")
+
+        for ch_task in work_queue:
+            print(f"\n      >>> FORENSIC START: CHAPTER {ch_task['num']} <<<")
+            print(f"      [NAVIGATE] Reader URL: {ch_task['url']}")
+
+            try:
+                # Jalur Cepat: panel sudah ada di HTML server-render
+                panel_urls = fetch_reader_panels(ch_task['url'])
+                if panel_urls is not None:
+                    print(f"      [FAST PATH] Reader diparsing via HTTP (tanpa render).")
+                else:
+                    panel_urls = extract_panel_urls(browser_pool.render_reader(ch_task['url']))
+
+                # UPLOAD MASIF KE CATBOX (PIPELINE TUMPANG-TINDIH)
+                catbox_proofs = []
+                if panel_urls:
+                    print(f"      [FOUND] {len(panel_urls)} panel gambar asli terdeteksi.")
+                    print(f"      [PIPELINE] Download x{DOWNLOAD_WORKERS} | Upload x{UPLOAD_WORKERS}")
+
+                    # Journal: panel yang sudah mendarat di run sebelumnya tidak dikerjakan ulang
+                    journal = ChapterJournal(slug, ch_task['num'])
+                    landed = journal.load()
+                    if landed:
+                        print(f"      [RESUME] {len(landed)} panel sudah tercatat di journal, dilewati.")
+
+                    def upload_and_record(p_idx, p_url, img_bytes):
+                        t_url = upload_panel_bytes(p_idx, p_url, img_bytes)
+                        if t_url:
+                            journal.record(p_url, t_url)
+                        return t_url
+
+                    # Hasil sudah berurutan sesuai indeks panel; panel gagal bernilai None
+                    results = run_panel_pipeline(panel_urls, fetch_panel_bytes, upload_and_record,
+                                                 resume_map=landed, transcode_fn=transcode_panel_bytes)
+                    catbox_proofs = [t_url for t_url in results if t_url]
+
+                # FINAL CHAPTER STORAGE
+                if catbox_proofs:
+                    chapter = {
+                        "ch_num": ch_task['num'],
+                        "release_date": datetime.now().strftime("%Y-%m-%d"),
+                        "images": list(dict.fromkeys(catbox_proofs))
+                    }
+
+                    # PROOF OF STORAGE
+                    print(f"      [PROOF] Chapter {ch_task['num']} Selesai dengan {len(catbox_proofs)} Link Catbox.")
+                    if store.add_chapter(data, chapter):
+                        journal.discard()
+                else:
+                    print(f"      [WARN] Ch. {ch_task['num']} dilewati (Nol upload).")
+
+            except Exception as e_ch:
+                print(f"      [ERROR] Gagal total pada chapter {ch_task['num']}: {e_ch}")
+
+        # Update Timestamp Final
+        data.last_updated = datetime.now().isoformat()
+        store.compact(data)
+        print(f"\n   [FINISHED] Judul '{target['title']}' SUKSES TOTAL.")
         return True
-    except Exception as e:
-        print(f"      [DISK ERROR] Gagal mengunci data ke harddisk: {e}")
+
+    except Exception as e_fatal:
+        print(f"   [FATAL] Error pada {slug}: {e_fatal}")
         return False
 
-# --- MESIN UTAMA (THE WORKER) ---
+def run_queue_lane(browser_pool, work_queue, node_id, heartbeat, counter, total):
+    """Satu jalur kerja mode koordinator: sewa -> proses -> lapor, sampai antrian habis."""
+    while True:
+        target = work_queue.lease(node_id)
+        if target is None:
+            return
+        heartbeat.track(target['slug'])
+        try:
+            if process_title(browser_pool, target, next(counter), total):
+                work_queue.complete(target['slug'], node_id)
+            else:
+                work_queue.release(target['slug'], node_id)
+        except BaseException:
+            work_queue.release(target['slug'], node_id)
+            raise
+        finally:
+            heartbeat.untrack(target['slug'])
 
 def run_worker_node():
     print("====================================================")
@@ -116,207 +282,89 @@ def run_worker_node():
     with open(TARGET_LIST_FILE, 'r', encoding='utf-8') as f:
         all_targets = json.load(f)
 
-    # Input Range Distribusi
-    while True:
+    # Pilih Mode Distribusi
+    print("-" * 60)
+    print("1 = Range ID manual (Start ID / End ID)")
+    print("2 = Antrian Koordinator (lease otomatis, lihat ikiru_workQueue.py)")
+    print("3 = Update Scan (jalankan crawler dulu, hanya judul yang berubah)")
+    mode = input("[?] Pilih mode distribusi : ").strip()
+
+    if mode == "2":
+        node_id = default_node_id()
+        work_queue = WorkQueue()
+        work_queue.seed(all_targets)
+        counts, _ = work_queue.summary()
+        total = sum(counts.values())
+        print(f"\n[NODE] {node_id} bergabung ke antrian ({counts.get('pending', 0)} judul pending).")
+        print(f"[NODE] Kolam Tab Paralel: {PAGE_POOL_SIZE} (satu proses Chromium)\n")
+
+        browser_pool = BrowserPool(size=PAGE_POOL_SIZE)
+        counter = itertools.count()
         try:
-            print("-" * 60)
-            s_in = input("[?] Masukkan Start ID : ")
-            e_in = input("[?] Masukkan End ID   : ")
-            start_id, end_id = int(s_in), int(e_in); break
-        except ValueError:
-            print("[!] Harap masukkan angka bulat saja.")
-
-    my_tasks = [t for t in all_targets if start_id <= t['id'] <= end_id]
-    if not my_tasks:
-        print("[!] Tidak ada tugas di range tersebut."); return
-
-    print(f"\n[NODE] Memulai pengerjaan {len(my_tasks)} judul komik dengan CATBOX ENGINE...\n")
-
-    # INISIALISASI PLAYWRIGHT
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-            viewport={'width': 1920, 'height': 1080}
-        )
-        context.set_extra_http_headers({"Referer": "https://02.ikiru.wtf/"})
-        page = context.new_page()
-
-        for idx, target in enumerate(my_tasks):
-            slug = target['slug']
-            db_path = os.path.join(DATABASE_DIR, f"{slug}.json")
-            
-            # --- MANAJEMEN RESUME ---
-            data = None
-            if os.path.exists(db_path):
-                try:
-                    with open(db_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    print(f"[{idx+1}/{len(my_tasks)}] RESUMING: {target['title']}")
-                except: data = None
-            
-            if not data:
-                print(f"[{idx+1}/{len(my_tasks)}] STARTING FRESH: {target['title']}")
-                data = {
-                    "slug": slug,
-                    "title": target['title'],
-                    "cover": "",
-                    "metadata": {},
-                    "chapters": [],
-                    "last_updated": ""
-                }
-                safe_save_json(data, db_path)
-
-            try:
-                # ---------------------------------------------------------
-                # STEP 1: DETAIL PAGE & HTMX SNIPER
-                # ---------------------------------------------------------
-                print("   -> 1. Navigasi ke Laman Detail...")
-                page.goto(target['source_url'], timeout=60000, wait_until="networkidle")
-                
-                # HTMX Trigger (Anti-Zonk Chapter)
+            with LeaseHeartbeat(work_queue, node_id) as heartbeat, \
+                 ThreadPoolExecutor(max_workers=PAGE_POOL_SIZE, thread_name_prefix="lane") as executor:
+                lanes = {executor.submit(run_queue_lane, browser_pool, work_queue, node_id, heartbeat, counter, total): lane_no
+                         for lane_no in range(1, PAGE_POOL_SIZE + 1)}
+                for future in as_completed(lanes):
+                    try:
+                        future.result()
+                    except Exception as e_lane:
+                        print(f"   [FATAL] Jalur antrian #{lanes[future]} berhenti karena error: {e_lane}")
+        finally:
+            browser_pool.close()
+            shutdown_pool()
+    else:
+        if mode == "3":
+            # Bandingkan 'last_chapter_str' listing dengan database lokal
+            my_tasks = find_changed_targets(all_targets, DATABASE_DIR)
+            if not my_tasks:
+                print("[!] Semua judul sudah up-to-date."); return
+        else:
+            # Input Range Distribusi
+            while True:
                 try:
-                    htmx_btn = page.locator("button[data-key='chapters']").first
-                    if htmx_btn.is_visible():
-                        print("      [ACTION] Klik Tombol HTMX Chapters...")
-                        htmx_btn.click()
-                        print("      [WAIT] Menunggu AJAX Render Daftar...")
-                        page.wait_for_selector("div[data-chapter-number]", timeout=15000)
-                        print("      [SUCCESS] Daftar Chapter muncul di DOM.")
-                except Exception as e_htmx:
-                    print(f"      [INFO] HTMX Trigger Skip: {e_htmx}")
-
-                # Backup Scroll
-                page.keyboard.press("End"); time.sleep(2)
-                soup = BeautifulSoup(page.content(), "html.parser")
-
-                # --- STEP 2: COVER PROCESSING (CATBOX MODE) ---
-                if not data.get('cover') or "catbox.moe" not in data['cover']:
-                    cover_box = soup.select_one("div[itemprop='image']")
-                    img_node = cover_box.select_one("img") if cover_box else soup.select_one("img.wp-post-image")
-                    
-                    if img_node:
-                        orig_url = (img_node.get('src') or img_node.get('data-src') or "").split('?')[0]
-                        if orig_url:
-                            if orig_url.startswith("/"): orig_url = "https://02.ikiru.wtf" + orig_url
-                            
-                            print(f"      [FOUND] Link Cover Asli: {orig_url}")
-                            try:
-                                print(f"      [FETCH] Mendownload bytes gambar...")
-                                c_resp = page.request.get(orig_url, timeout=30000)
-                                if c_resp.status == 200:
-                                    # Ambil ekstensi asli (WebP/JPG/PNG)
-                                    ext = orig_url.split('.')[-1]
-                                    t_url = upload_to_catbox(c_resp.body(), f"cover.{ext}")
-                                    if t_url:
-                                        data['cover'] = t_url
-                                        safe_save_json(data, db_path)
-                            except Exception as e_up:
-                                print(f"      [ERROR] Gagal proses cover: {e_up}")
-
-                # --- STEP 3: METADATA & CHAPTER COLLECTION ---
-                syn_box = soup.select_one("div[itemprop='description'][data-show='false']") or \
-                          soup.select_one("div[itemprop='description']")
-                data['metadata']['synopsis'] = clean_text(syn_box.get_text()) if syn_box else "N/A"
-
-                ch_found = []
-                seen_urls = set()
-                chapter_list = soup.select("div[data-chapter-number]")
-                for div in chapter_list:
-                    a_tag = div.select_one("a")
-                    if a_tag and a_tag.get('href') not in seen_urls:
-                        num = extract_number(div.get('data-chapter-number'))
-                        ch_found.append({"num": num, "url": a_tag.get('href')})
-                        seen_urls.add(a_tag.get('href'))
-                
-                ch_found.sort(key=lambda x: x['num'])
-                print(f"      [INFO] {len(ch_found)} Chapter Terkunci via Data-Attribute.")
-
-                # --- STEP 4: READER ENGINE (THE PANEL PROOF) ---
-                existing_nums = [c['ch_num'] for c in data['chapters']]
-                work_queue = [c for c in ch_found if c['num'] not in existing_nums]
-                
-                print(f"      [QUEUE] {len(work_queue)} Chapter baru siap dipanen.")
-
-                for ch_task in work_queue:
-                    print(f"\n      >>> FORENSIC START: CHAPTER {ch_task['num']} <<<")
-                    print(f"      [NAVIGATE] Reader URL: {ch_task['url']}")
-                    
+                    print("-" * 60)
+                    s_in = input("[?] Masukkan Start ID : ")
+                    e_in = input("[?] Masukkan End ID   : ")
+                    start_id, end_id = int(s_in), int(e_in); break
+                except ValueError:
+                    print("[!] Harap masukkan angka bulat saja.")
+
+            my_tasks = [t for t in all_targets if start_id <= t['id'] <= end_id]
+            if not my_tasks:
+                print("[!] Tidak ada tugas di range tersebut."); return
+
+        print(f"\n[NODE] Memulai pengerjaan {len(my_tasks)} judul komik dengan CATBOX ENGINE...")
+        print(f"[NODE] Kolam Tab Paralel: {PAGE_POOL_SIZE} (satu proses Chromium)\n")
+
+        # INISIALISASI BROWSER POOL (Chromium baru menyala jika fast path gagal)
+        browser_pool = BrowserPool(size=PAGE_POOL_SIZE)
+        try:
+            # Judul dibagikan ke tab yang sedang nganggur
+            with ThreadPoolExecutor(max_workers=PAGE_POOL_SIZE, thread_name_prefix="title") as executor:
+                futures = {executor.submit(process_title, browser_pool, target, idx, len(my_tasks)): target
+                           for idx, target in enumerate(my_tasks)}
+                failed = 0
+                for future in as_completed(futures):
                     try:
-                        page.goto(ch_task['url'], timeout=60000, wait_until="domcontentloaded")
-                        # Scroll Lazy Load
-                        for _ in range(3):
-                            page.mouse.wheel(0, 1500); time.sleep(0.7)
-                        
-                        # Tunggu Reader Section
-                        try:
-                            page.wait_for_selector("section[data-image-data='1'] img", timeout=15000)
-                        except: pass
-
-                        c_soup = BeautifulSoup(page.content(), "html.parser")
-                        reader_area = c_soup.select_one("section[data-image-data='1']")
-                        img_nodes = reader_area.find_all('img') if reader_area else c_soup.find_all('img')
-                        
-                        panel_urls = []
-                        for node in img_nodes:
-                            src = (node.get('src') or node.get('data-src') or "").strip()
-                            # Whitelist CDN (itachi, uqni, ikiru, google)
-                            if src and any(c in src for c in ['itachi.my.id', 'uqni.net', '02.ikiru.wtf']):
-                                if not any(j in src for j in ['logo', 'banner', 'iklan']):
-                                    panel_urls.append(src)
-
-                        # UPLOAD MASIF KE CATBOX
-                        catbox_proofs = []
-                        if panel_urls:
-                            panel_urls = list(dict.fromkeys(panel_urls))
-                            print(f"      [FOUND] {len(panel_urls)} panel gambar asli terdeteksi.")
-                            
-                            for p_idx, p_url in enumerate(panel_urls):
-                                try:
-                                    print(f"      [FETCH] Panel {p_idx+1}/{len(panel_urls)} -> {p_url[:45]}...")
-                                    p_resp = page.request.get(p_url, timeout=40000)
-                                    if p_resp.status == 200:
-                                        # Ambil ekstensi asli tanpa konversi
-                                        ext = p_url.split('.')[-1].split('?')[0]
-                                        t_url = upload_to_catbox(p_resp.body(), f"panel_{p_idx}.{ext}")
-                                        if t_url:
-                                            catbox_proofs.append(t_url)
-                                            # Link Catbox akan muncul di CMD setiap kali berhasil
-                                    else:
-                                        print(f"      [ERROR] Download gagal. Status: {p_resp.status}")
-                                except Exception as e_p:
-                                    print(f"      [ERROR] Kendala panel {p_idx+1}: {e_p}")
-                        
-                        # FINAL CHAPTER STORAGE
-                        if catbox_proofs:
-                            data['chapters'].append({
-                                "ch_num": ch_task['num'],
-                                "release_date": datetime.now().strftime("%Y-%m-%d"),
-                                "images": list(dict.fromkeys(catbox_proofs))
-                            })
-                            data['chapters'].sort(key=lambda x: x['ch_num'], reverse=True)
-                            
-                            # PROOF OF STORAGE
-                            print(f"      [PROOF] Chapter {ch_task['num']} Selesai dengan {len(catbox_proofs)} Link Catbox.")
-                            safe_save_json(data, db_path)
-                        else:
-                            print(f"      [WARN] Ch. {ch_task['num']} dilewati (Nol upload).")
-
-                    except Exception as e_ch:
-                        print(f"      [ERROR] Gagal total pada chapter {ch_task['num']}: {e_ch}")
-
-                # Update Timestamp Final
-                data['last_updated'] = datetime.now().isoformat()
-                safe_save_json(data, db_path)
-                print(f"\n   [FINISHED] Judul '{target['title']}' SUKSES TOTAL.")
-
-            except Exception as e_fatal:
-                print(f"   [FATAL] Error pada {slug}: {e_fatal}")
-
-        browser.close()
-        print("\n====================================================")
-        print("   OPERASI SELESAI. SILAKAN CEK HASIL DI DATABASE.")
-        print("====================================================")
+                        if not future.result():
+                            failed += 1
+                    except Exception as e_title:
+                        failed += 1
+                        print(f"   [FATAL] Judul '{futures[future]['title']}' gagal tak tertangani: {e_title}")
+            if failed:
+                print(f"[NODE] {failed} dari {len(my_tasks)} judul tidak tuntas (lihat log [FATAL]).")
+        finally:
+            browser_pool.close()
+            shutdown_pool()
+
+    # Rekap kesehatan backend upload (latensi EWMA & error rate)
+    for name, stats in upload_router.snapshot().items():
+        print(f"[UPLOADERS] {name}: {stats}")
+
+    print("\n====================================================")
+    print("   OPERASI SELESAI. SILAKAN CEK HASIL DI DATABASE.")
+    print("====================================================")
 
 if __name__ == "__main__":
     run_worker_node()
\ No newline at end of file
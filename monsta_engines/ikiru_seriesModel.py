@@ -0,0 +1,185 @@
+import re
+import json
+import threading
+from array import array
+from dataclasses import dataclass, field
+
+from ikiru_compactFormat import COMPACT_FORMAT
+
+# ==============================================================================
+# MONSTA SERIES MODEL: SERI / CHAPTER / PANEL HEMAT RAM (V1.0)
+# ------------------------------------------------------------------------------
+# 1. __slots__ DATACLASS: Series, Chapter, Panel tanpa __dict__ per objek.
+# 2. HOST DIINTERN: Prefix link (https://files.catbox.moe/, ...) disimpan
+#    sekali per proses; tiap panel hanya menyimpan id host (2 byte).
+# 3. IMAGE LIST MALAS: Nama file panel satu chapter dipadatkan jadi satu
+#    string; list URL penuh baru dibuat saat .images dibaca.
+# 4. SCHEMA LAMA: from_dict / to_dict membaca & menulis database/<slug>.json
+#    (readable maupun compact, chapter penuh maupun stub manifest sharded).
+# ==============================================================================
+
+SERIES_FIELDS = ("slug", "title", "cover", "metadata", "chapters", "last_updated")
+_ENCODED_LINK = re.compile(r'^(\d+):(.*)$', re.S)
+_NAME_SEP = "\n"                # Tidak pernah muncul di URL
+
+# --- TABEL HOST BERSAMA ---
+
+_hosts = []
+_host_ids = {}
+_host_lock = threading.Lock()
+
+def intern_host(prefix):
+    """Prefix link -> id kecil yang sama untuk seluruh proses."""
+    host_id = _host_ids.get(prefix)
+    if host_id is None:
+        with _host_lock:
+            host_id = _host_ids.get(prefix)
+            if host_id is None:
+                host_id = _host_ids[prefix] = len(_hosts)
+                _hosts.append(prefix)
+    return host_id
+
+def host_prefix(host_id):
+    return _hosts[host_id]
+
+def _split_link(url):
+    cut = url.rfind("/") + 1
+    return url[:cut], url[cut:]
+
+# --- RECORD ---
+
+@dataclass(slots=True, frozen=True)
+class Panel:
+    host: int
+    name: str
+
+    @property
+    def url(self):
+        return _hosts[self.host] + self.name
+
+@dataclass(slots=True)
+class Chapter:
+    ch_num: float
+    release_date: str = ""
+    shard: str = None               # Stub manifest sharded: nama file shard
+    total_images: int = None        # Stub manifest sharded: jumlah panel
+    extra: dict = None              # Field tak dikenal (dipertahankan saat dump)
+    _host_ids: array = field(default_factory=lambda: array('H'), repr=False)
+    _names: str = field(default="", repr=False)
+
+    @classmethod
+    def from_dict(cls, data, file_hosts=None):
+        """Chapter dari schema database. file_hosts = tabel 'hosts' milik file compact."""
+        known = ("ch_num", "release_date", "images", "shard", "total_images")
+        chapter = cls(
+            ch_num=data["ch_num"],
+            release_date=data.get("release_date", ""),
+            shard=data.get("shard"),
+            total_images=data.get("total_images"),
+            extra={k: v for k, v in data.items() if k not in known} or None,
+        )
+        if "images" in data:
+            chapter.set_images(data["images"], file_hosts)
+        return chapter
+
+    def set_images(self, images, file_hosts=None):
+        host_ids, names = array('H'), []
+        for item in images:
+            match = _ENCODED_LINK.match(item) if file_hosts is not None else None
+            if match:
+                prefix, name = file_hosts[int(match.group(1))], match.group(2)
+            else:
+                prefix, name = _split_link(item)
+            host_ids.append(intern_host(prefix))
+            names.append(name)
+        self._host_ids = host_ids
+        self._names = _NAME_SEP.join(names)
+
+    @property
+    def image_count(self):
+        return len(self._host_ids) if self.shard is None else (self.total_images or 0)
+
+    @property
+    def images(self):
+        """List URL penuh, dibuat baru setiap dibaca (tidak disimpan di objek)."""
+        if not self._host_ids:
+            return []
+        return [_hosts[h] + name for h, name in zip(self._host_ids, self._names.split(_NAME_SEP))]
+
+    def panels(self):
+        if not self._host_ids:
+            return []
+        return [Panel(h, name) for h, name in zip(self._host_ids, self._names.split(_NAME_SEP))]
+
+    def to_dict(self):
+        if self.shard is not None:
+            out = {"ch_num": self.ch_num, "release_date": self.release_date,
+                   "total_images": self.total_images, "shard": self.shard}
+        else:
+            out = {"ch_num": self.ch_num, "release_date": self.release_date, "images": self.images}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+@dataclass(slots=True)
+class Series:
+    slug: str
+    title: str = "Unknown"
+    cover: str = ""
+    metadata: dict = field(default_factory=dict)
+    chapters: list = field(default_factory=list)
+    last_updated: str = ""
+    extra: dict = None              # Field top-level tak dikenal
+
+    @classmethod
+    def from_dict(cls, data, slug=None):
+        """Series dari schema database (readable atau compact) tanpa decode link penuh."""
+        file_hosts = data.get("hosts") if data.get("format") == COMPACT_FORMAT else None
+        extra = {k: v for k, v in data.items() if k not in SERIES_FIELDS and k not in ("format", "hosts")}
+        return cls(
+            slug=data.get("slug", slug),
+            title=data.get("title", "Unknown"),
+            cover=data.get("cover", ""),
+            metadata=data.get("metadata") or {},
+            chapters=[Chapter.from_dict(ch, file_hosts) for ch in data.get("chapters", [])],
+            last_updated=data.get("last_updated", ""),
+            extra=extra or None,
+        )
+
+    @classmethod
+    def load(cls, filepath, slug=None):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), slug)
+
+    def to_dict(self):
+        out = {
+            "slug": self.slug,
+            "title": self.title,
+            "cover": self.cover,
+            "metadata": self.metadata,
+            "chapters": [ch.to_dict() for ch in self.chapters],
+            "last_updated": self.last_updated,
+        }
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def update(self, fields):
+        """Padanan dict.update untuk delta 'set' (cover, metadata, last_updated, ...)."""
+        for key, value in fields.items():
+            if key == "chapters":
+                self.chapters = [ch if isinstance(ch, Chapter) else Chapter.from_dict(ch) for ch in value]
+            elif key in SERIES_FIELDS or key == "slug":
+                setattr(self, key, value)
+            else:
+                self.extra = dict(self.extra or {}, **{key: value})
+
+    def summary(self):
+        """Entri katalog index.json."""
+        return {
+            "title": self.title,
+            "slug": self.slug,
+            "cover": self.cover,
+            "last_updated": self.last_updated or "N/A",
+            "total_chapters": len(self.chapters),
+        }
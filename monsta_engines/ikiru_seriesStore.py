@@ -0,0 +1,341 @@
+import os
+import json
+import time
+import shutil
+
+from ikiru_compactFormat import serialize, decode_series, write_precompressed, PRECOMPRESS
+from ikiru_chapterKey import ChapterIndex, chapter_value
+from ikiru_seriesModel import Series, Chapter
+from ikiru_jsonSummary import stream_summary, SUMMARY_FIELDS
+
+# ==============================================================================
+# MONSTA SERIES STORE: LAYOUT DATABASE SINGLE & SHARDED (V1.0)
+# ------------------------------------------------------------------------------
+# 1. SINGLE (default): database/<slug>.json berisi seluruh seri (format lama).
+# 2. SHARDED (opsional): database/<slug>/manifest.json (metadata + daftar
+#    chapter tanpa link gambar) + database/<slug>/ch_<num>.json per chapter.
+# 3. APPEND MURAH: Chapter baru di layout sharded hanya menulis satu shard
+#    baru + manifest kecil, bukan menulis ulang megabyte seluruh seri.
+# 4. INDEXER/READER: Cukup membaca manifest untuk judul, cover, jumlah chapter.
+# 5. WRITE-AHEAD LOG: Perubahan kecil (chapter baru, cover, metadata) ditulis
+#    sebagai delta JSON-lines; file kanonik baru ditulis saat kompaksi
+#    (terjadwal tiap N chapter dan saat judul selesai).
+# 6. ATOMIC REPLACE: os.replace menggantikan remove+rename (tanpa celah file hilang).
+# 7. COMPACT FORMAT: File kanonik ditulis minified + host dictionary
+#    (lihat ikiru_compactFormat); pembaca men-decode keduanya secara transparan.
+# 8. CHAPTER INDEX: Daftar chapter dijaga urut via bisect + set ch_num
+#    (lihat ikiru_chapterKey), tanpa sort ulang per chapter baru.
+# 9. SERIES MODEL: load_model() memberi objek Series hemat RAM (lihat
+#    ikiru_seriesModel); semua metode tulis menerima dict maupun Series.
+# 10. RESUME RINGAN: latest_chapter() membaca ch_num tertinggi via streaming
+#    (ikiru_jsonSummary) + delta WAL, tanpa memuat link gambar.
+# 11. LAG TERBATAS: Kompaksi juga dipicu waktu (COMPACT_MAX_AGE), dan
+#    summary() menggabungkan delta WAL untuk indexer, jadi katalog tidak
+#    tertinggal sampai 24 chapter menunggu kompaksi berikutnya.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "database")
+
+LAYOUT_SINGLE = "single"
+LAYOUT_SHARDED = "sharded"
+DEFAULT_LAYOUT = LAYOUT_SINGLE   # Frontend (homev24) masih membaca format single
+
+MANIFEST_NAME = "manifest.json"
+
+# --- KONFIGURASI WRITE-AHEAD LOG ---
+WAL_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime", "wal")
+USE_WAL = True
+COMPACT_EVERY = 25          # Kompaksi otomatis setiap 25 delta chapter
+# Batas umur file kanonik: chapter yang mendarat >= N detik sejak kompaksi terakhir
+# langsung memicu kompaksi (di bawah CHECK_INTERVAL 60 detik milik Bot 3 / manager)
+COMPACT_MAX_AGE = float(os.environ.get("MONSTA_COMPACT_MAX_AGE", 30))
+# Kebijakan fsync: "always" (tiap delta), "chapter" (hanya delta chapter), "never"
+FSYNC_POLICY = "chapter"
+
+def safe_save_json(data, filepath, fmt=None):
+    """Menyimpan data dengan teknik Atomic dan konfirmasi bukti di CMD."""
+    temp_path = filepath + ".tmp"
+    try:
+        text = serialize(data, fmt)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # os.replace atomik di Windows & Linux: file lama tidak pernah hilang sesaat
+        os.replace(temp_path, filepath)
+        if PRECOMPRESS:
+            write_precompressed(filepath, text)
+        # LOG FORENSIK: Lapor penulisan disk
+        print(f"      [DISK] Status: Data dikunci ke {os.path.basename(filepath)} (SYNC OK).")
+        return True
+    except Exception as e:
+        print(f"      [DISK ERROR] Gagal mengunci data ke harddisk: {e}")
+        return False
+
+def _chapters(data):
+    return data.chapters if isinstance(data, Series) else data['chapters']
+
+def _as_record(data, chapter):
+    """Chapter dict -> bentuk yang dipakai data (dict lama atau Chapter model)."""
+    return Chapter.from_dict(chapter) if isinstance(data, Series) else chapter
+
+def shard_name(ch_num):
+    """10.0 -> ch_10.json | 10.5 -> ch_10.5.json"""
+    text = str(ch_num)
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return f"ch_{text}.json"
+
+class SeriesStore:
+    def __init__(self, slug, database_dir=DATABASE_DIR, layout=None, use_wal=USE_WAL, wal_dir=WAL_DIR):
+        self.slug = slug
+        self.database_dir = database_dir
+        self.use_wal = use_wal
+        self.wal_path = os.path.join(wal_dir, f"{slug}.wal.jsonl")
+        self._pending_chapters = 0
+        self._last_compact = time.monotonic()
+        self._index = None
+        self.single_path = os.path.join(database_dir, f"{slug}.json")
+        self.shard_dir = os.path.join(database_dir, slug)
+        self.manifest_path = os.path.join(self.shard_dir, MANIFEST_NAME)
+        # Layout yang sudah ada di disk selalu menang atas default
+        self.layout = layout or self.detect_layout() or DEFAULT_LAYOUT
+
+    def detect_layout(self):
+        if os.path.exists(self.manifest_path):
+            return LAYOUT_SHARDED
+        if os.path.exists(self.single_path):
+            return LAYOUT_SINGLE
+        return None
+
+    def exists(self):
+        return self.detect_layout() is not None
+
+    # --- BACA ---
+
+    def load(self, with_images=False):
+        """
+        Membaca seri dalam skema kanonik (slug, title, cover, metadata, chapters, last_updated).
+        Layout sharded: chapter hanya berisi stub manifest kecuali with_images=True.
+        Delta WAL yang belum dikompaksi (misal setelah crash) ikut diputar ulang.
+        """
+        if self.layout == LAYOUT_SINGLE:
+            with open(self.single_path, 'r', encoding='utf-8') as f:
+                data = decode_series(json.load(f))
+        else:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = decode_series(json.load(f))
+
+        replayed = self.replay_wal(data)
+        if replayed:
+            print(f"      [WAL] {replayed} delta belum terkompaksi diputar ulang untuk {self.slug}.")
+        if with_images and self.layout == LAYOUT_SHARDED:
+            data['chapters'] = [self.load_chapter(stub) for stub in data['chapters']]
+        return data
+
+    def load_model(self):
+        """Seperti load(), tetapi sebagai Series (host diintern, link gambar dipadatkan)."""
+        if self.layout == LAYOUT_SINGLE:
+            data = Series.load(self.single_path, self.slug)
+        else:
+            data = Series.load(self.manifest_path, self.slug)
+        replayed = self.replay_wal(data)
+        if replayed:
+            print(f"      [WAL] {replayed} delta belum terkompaksi diputar ulang untuk {self.slug}.")
+        return data
+
+    def iter_wal(self):
+        """Delta WAL yang utuh, berurutan (berhenti di baris terpotong)."""
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Baris terakhir terpotong saat crash: berhenti di sini
+                    return
+
+    def summary(self, fields=SUMMARY_FIELDS):
+        """
+        Ringkasan streaming file kanonik + delta WAL yang belum dikompaksi
+        (field 'set' ditimpa, chapter baru dihitung tanpa duplikat).
+        """
+        path = self.single_path if self.layout == LAYOUT_SINGLE else self.manifest_path
+        summary = stream_summary(path, fields, with_nums=True)
+        nums = {chapter_value(num) for num in summary.pop("ch_nums")}
+        for delta in self.iter_wal():
+            if delta['op'] == "set":
+                summary.update((k, v) for k, v in delta['fields'].items() if k in fields)
+            elif delta['op'] == "chapter":
+                num = chapter_value(delta['chapter']['ch_num'])
+                if num not in nums:
+                    nums.add(num)
+                    summary["chapter_count"] += 1
+                if summary["latest_ch_num"] is None or num > summary["latest_ch_num"]:
+                    summary["latest_ch_num"] = num
+        return summary
+
+    def latest_chapter(self):
+        """ch_num tertinggi (file kanonik + delta WAL) tanpa memuat seri penuh. None jika kosong."""
+        return self.summary(fields=())["latest_ch_num"]
+
+    def load_chapter(self, stub):
+        with open(os.path.join(self.shard_dir, stub['shard']), 'r', encoding='utf-8') as f:
+            return decode_series(json.load(f))
+
+    def chapter_index(self, data):
+        """Index chapter untuk data ini (dibangun ulang hanya jika list chapter berganti)."""
+        chapters = _chapters(data)
+        if self._index is None or self._index.items is not chapters:
+            self._index = ChapterIndex(chapters)
+        return self._index
+
+    # --- TULIS ---
+
+    def save_meta(self, data):
+        """Menyimpan metadata seri (cover, sinopsis, last_updated, daftar chapter)."""
+        if isinstance(data, Series):
+            data = data.to_dict()
+        if self.layout == LAYOUT_SINGLE:
+            return safe_save_json(data, self.single_path)
+        os.makedirs(self.shard_dir, exist_ok=True)
+        return safe_save_json(data, self.manifest_path)
+
+    def set_fields(self, data, **fields):
+        """Mengubah field top-level (cover, metadata, last_updated, ...) sebagai delta kecil."""
+        data.update(fields)
+        if not self.use_wal:
+            return self.save_meta(data)
+        return self.append_delta({"op": "set", "fields": fields})
+
+    def add_chapter(self, data, chapter):
+        """Menambah satu chapter ke data (urut menurun) lalu menguncinya ke disk."""
+        index = self.chapter_index(data)
+        if chapter['ch_num'] in index:
+            print(f"      [SKIP] Chapter {chapter['ch_num']} sudah ada di {self.slug}.")
+            return True
+        if self.layout == LAYOUT_SHARDED:
+            os.makedirs(self.shard_dir, exist_ok=True)
+            name = shard_name(chapter['ch_num'])
+            if not safe_save_json(chapter, os.path.join(self.shard_dir, name)):
+                return False
+            chapter = {
+                "ch_num": chapter['ch_num'],
+                "release_date": chapter.get('release_date', ""),
+                "total_images": len(chapter.get('images', [])),
+                "shard": name
+            }
+
+        index.add(_as_record(data, chapter))
+        if not self.use_wal:
+            return self.save_meta(data)
+
+        if not self.append_delta({"op": "chapter", "chapter": chapter}):
+            return False
+        self._pending_chapters += 1
+        if self._pending_chapters >= COMPACT_EVERY or time.monotonic() - self._last_compact >= COMPACT_MAX_AGE:
+            return self.compact(data)
+        return True
+
+    # --- WRITE-AHEAD LOG ---
+
+    def append_delta(self, delta):
+        """Menambahkan satu baris delta ke WAL sesuai FSYNC_POLICY."""
+        try:
+            os.makedirs(os.path.dirname(self.wal_path), exist_ok=True)
+            with open(self.wal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(delta, ensure_ascii=False) + "\n")
+                if FSYNC_POLICY == "always" or (FSYNC_POLICY == "chapter" and delta['op'] == "chapter"):
+                    f.flush()
+                    os.fsync(f.fileno())
+            print(f"      [WAL] Delta '{delta['op']}' dicatat untuk {self.slug}.")
+            return True
+        except Exception as e:
+            print(f"      [WAL ERROR] Gagal mencatat delta: {e}")
+            return False
+
+    def replay_wal(self, data):
+        """Menerapkan delta WAL ke data. Return jumlah delta yang diterapkan."""
+        if not os.path.exists(self.wal_path):
+            return 0
+        index = self.chapter_index(data)
+        applied = 0
+        for delta in self.iter_wal():
+            if delta['op'] == "set":
+                data.update(delta['fields'])
+            elif delta['op'] == "chapter":
+                index.add(_as_record(data, delta['chapter']))
+            applied += 1
+        return applied
+
+    def compact(self, data):
+        """Menulis file kanonik dari data di memori lalu mengosongkan WAL."""
+        if not self.save_meta(data):
+            return False
+        if os.path.exists(self.wal_path):
+            os.remove(self.wal_path)
+        self._pending_chapters = 0
+        self._last_compact = time.monotonic()
+        print(f"      [WAL] Kompaksi selesai untuk {self.slug}.")
+        return True
+
+    # --- KONVERSI LAYOUT ---
+
+    def convert(self, target_layout):
+        """Memindahkan seri ke layout lain (single <-> sharded) tanpa kehilangan data."""
+        if self.layout == target_layout:
+            return False
+        data = self.load(with_images=True)
+        if os.path.exists(self.wal_path):
+            os.remove(self.wal_path)
+        chapters = data['chapters']
+        data['chapters'] = []
+
+        target = SeriesStore(self.slug, self.database_dir, layout=target_layout)
+        if target_layout == LAYOUT_SHARDED:
+            os.makedirs(target.shard_dir, exist_ok=True)
+            for chapter in chapters:
+                name = shard_name(chapter['ch_num'])
+                safe_save_json(chapter, os.path.join(target.shard_dir, name))
+                data['chapters'].append({
+                    "ch_num": chapter['ch_num'],
+                    "release_date": chapter.get('release_date', ""),
+                    "total_images": len(chapter.get('images', [])),
+                    "shard": name
+                })
+            if target.save_meta(data):
+                os.remove(self.single_path)
+        else:
+            data['chapters'] = chapters
+            if target.save_meta(data):
+                shutil.rmtree(self.shard_dir)
+
+        self.layout = target_layout
+        return True
+
+if __name__ == "__main__":
+    print("=== MONSTA SERIES STORE: KONVERSI LAYOUT ===")
+    print("1 = single -> sharded")
+    print("2 = sharded -> single")
+    choice = input("[?] Pilih mode : ").strip()
+    target_layout = LAYOUT_SHARDED if choice == "1" else LAYOUT_SINGLE
+    slugs = input("[?] Slug (pisahkan koma, kosong = semua) : ").strip()
+
+    if slugs:
+        slug_list = [s.strip() for s in slugs.split(",") if s.strip()]
+    else:
+        slug_list = sorted(
+            {f[:-5] for f in os.listdir(DATABASE_DIR) if f.endswith(".json") and f != "index.json"} |
+            {d for d in os.listdir(DATABASE_DIR) if os.path.exists(os.path.join(DATABASE_DIR, d, MANIFEST_NAME))}
+        )
+
+    for slug in slug_list:
+        store = SeriesStore(slug)
+        if not store.exists():
+            print(f"    [SKIP] {slug}: tidak ditemukan.")
+        elif store.convert(target_layout):
+            print(f"    [OK] {slug} -> {target_layout}")
+        else:
+            print(f"    [SKIP] {slug}: sudah {target_layout}.")
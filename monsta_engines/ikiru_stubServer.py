@@ -0,0 +1,290 @@
+import os
+import io
+import re
+import time
+import json
+import zlib
+import random
+import hashlib
+import threading
+from collections import Counter
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Pillow opsional: tanpa Pillow panel berupa biner acak ber-header JPEG
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# ==============================================================================
+# MONSTA STUB SERVER: IKIRU + CDN + CATBOX + TELEGRAPH DI 127.0.0.1 (V1.0)
+# ------------------------------------------------------------------------------
+# 1. SUMBER PALSU: /project/?the_page=N -> ikirupageN.html, /manga/<slug>/ ->
+#    fixture detail, /manga/<slug>/chapter-.../ -> fixture reader, endpoint
+#    HTMX admin-ajax chapter_list -> fragmen chapter sintetis.
+# 2. CDN PALSU: https://cdn.uqni.net/... ditulis ulang ke <base>/cdn.uqni.net/
+#    <chapter>/... (whitelist CDN tetap cocok, biner unik per chapter).
+# 3. HOST PALSU: POST /user/api.php (Catbox) & POST /upload (Telegraph) +
+#    GET /createAccount, link hasil juga bisa di-GET kembali.
+# 4. FAULT INJECTION: Latency + jitter, rasio 429 (Retry-After) & 5xx.
+# 5. THROUGHPUT: Statistik per rute (panel/detik, upload/detik) dilaporkan
+#    berkala untuk tuning konkurensi tanpa jaringan.
+#
+# Worker & crawler diarahkan ke stub via env:
+#   MONSTA_SOURCE_BASE=http://127.0.0.1:8765
+#   MONSTA_CATBOX_API=http://127.0.0.1:8765/user/api.php
+#   MONSTA_TELEGRAPH_BASE=http://127.0.0.1:8765
+#   MONSTA_TELEGRAPH_API=http://127.0.0.1:8765
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_PORT = 8765
+SOURCE_ORIGIN = "https://02.ikiru.wtf"
+CDN_HOSTS = ["cdn.uqni.net", "itachi.my.id"]
+
+# Konten sintetis
+STUB_CHAPTERS = 30              # Chapter per judul di fragmen HTMX
+CHAPTERS_PER_PAGE = 20          # Paginasi endpoint chapter_list (page=N)
+PANEL_SIZE = (800, 1200)        # Dimensi panel (jika Pillow ada)
+PANEL_BYTES = 150 * 1024        # Ukuran panel tanpa Pillow
+
+# Fault injection default
+LATENCY_MS = 0
+JITTER_MS = 0
+ERROR_RATE = 0.0                # Porsi respon 500/502/503
+THROTTLE_RATE = 0.0             # Porsi respon 429
+REPORT_EVERY = 10               # Detik antar laporan throughput (0 = mati)
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+def _load_fixture(name):
+    path = os.path.join(BASE_DIR, name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _base_panel():
+    if Image is None:
+        return b"\xff\xd8\xff\xe0" + os.urandom(PANEL_BYTES)
+    # Noise agar ukuran JPEG mirip panel asli (bukan warna rata)
+    img = Image.effect_noise(PANEL_SIZE, 64).convert("RGB")
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=DEFAULT_PORT, latency_ms=LATENCY_MS, jitter_ms=JITTER_MS,
+                 error_rate=ERROR_RATE, throttle_rate=THROTTLE_RATE):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+
+        self.listing_pages = {}
+        for n in range(1, 100):
+            html = _load_fixture(f"ikirupage{n}.html")
+            if html is None:
+                break
+            self.listing_pages[n] = html
+        self.details = [h for h in (_load_fixture(f"ikiru-sample{i}-detail.html") for i in range(1, 4)) if h]
+        self.readers = [h for h in (_load_fixture(f"ikiru-sample{i}-reader.html") for i in range(1, 4)) if h]
+        self.panel = _base_panel()
+
+        self.stats = Counter()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._upload_seq = 0
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def next_upload_id(self):
+        with self._lock:
+            self._upload_seq += 1
+            return self._upload_seq
+
+    def rewrite(self, html, chapter_token="page"):
+        """URL asli -> URL stub. Host CDN dipertahankan sebagai segmen path."""
+        html = html.replace(SOURCE_ORIGIN, self.base_url)
+        for host in CDN_HOSTS:
+            html = html.replace(f"https://{host}/", f"{self.base_url}/{host}/{chapter_token}/")
+        return html
+
+    def throughput_report(self):
+        elapsed = max(time.time() - self.started, 1e-6)
+        with self._lock:
+            stats = dict(self.stats)
+        panels = stats.get("panel", 0)
+        uploads = stats.get("upload.catbox", 0) + stats.get("upload.telegraph", 0)
+        faults = stats.get("fault.429", 0) + stats.get("fault.5xx", 0)
+        return (f"[STUB] {elapsed:7.1f}s | panel {panels} ({panels/elapsed:.1f}/s) | "
+                f"upload {uploads} ({uploads/elapsed:.1f}/s) | "
+                f"{stats.get('mb_out', 0)/1e6:.1f} MB keluar | fault {faults}")
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # --- UTILITAS RESPON ---
+
+    def _send(self, status, body=b"", content_type="text/html; charset=UTF-8", headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count("mb_out", len(body))
+
+    def _inject_faults(self):
+        """Latency + 429/5xx acak. Return True jika respon sudah dikirim (fault)."""
+        srv = self.server
+        delay = srv.latency_ms + random.uniform(0, srv.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        roll = random.random()
+        if roll < srv.throttle_rate:
+            srv.count("fault.429")
+            self._send(429, "Too Many Requests", "text/plain", {"Retry-After": "1"})
+            return True
+        if roll < srv.throttle_rate + srv.error_rate:
+            srv.count("fault.5xx")
+            self._send(random.choice([500, 502, 503]), "Server Error", "text/plain")
+            return True
+        return False
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    # --- GET ---
+
+    def do_GET(self):
+        if self._inject_faults():
+            return
+        srv = self.server
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+
+        if path.lower().endswith(IMAGE_EXTS):
+            srv.count("panel")
+            # Ekor unik per path: digest upload cache tidak pernah bentrok
+            tail = hashlib.sha256(path.encode()).digest()
+            return self._send(200, srv.panel + tail, "image/jpeg")
+
+        if path in ("/", "/project", "/project/"):
+            page_no = int(query.get("the_page", ["1"])[0] or 1)
+            srv.count("page.listing")
+            html = srv.listing_pages.get(page_no, "<html><body><p>Kosong</p></body></html>")
+            return self._send(200, srv.rewrite(html))
+
+        if path.startswith("/wp-admin/admin-ajax.php"):
+            return self._ajax(query)
+
+        match = re.match(r'^/manga/([^/]+)/(chapter-[^/]+)/?$', path)
+        if match and srv.readers:
+            srv.count("page.reader")
+            html = srv.readers[zlib.crc32(match.group(1).encode()) % len(srv.readers)]
+            token = f"{match.group(1)}-{match.group(2)}"
+            return self._send(200, srv.rewrite(html, token))
+
+        match = re.match(r'^/manga/([^/]+)/?$', path)
+        if match and srv.details:
+            srv.count("page.detail")
+            html = srv.details[zlib.crc32(match.group(1).encode()) % len(srv.details)]
+            return self._send(200, srv.rewrite(html))
+
+        if path == "/createAccount":
+            srv.count("telegraph.account")
+            result = {"short_name": "MonstaBot", "author_name": "Monsta Stub", "access_token": "stub-token"}
+            return self._send(200, json.dumps({"ok": True, "result": result}), "application/json")
+
+        srv.count("not_found")
+        self._send(404, "Not Found", "text/plain")
+
+    def _ajax(self, query):
+        srv = self.server
+        action = query.get("action", [""])[0]
+        if action != "chapter_list":
+            srv.count("page.ajax_other")
+            return self._send(200, "")
+
+        srv.count("page.chapter_list")
+        manga_id = query.get("manga_id", ["0"])[0]
+        page_no = int(query.get("page", ["1"])[0] or 1)
+        newest = STUB_CHAPTERS - (page_no - 1) * CHAPTERS_PER_PAGE
+        rows = []
+        for num in range(newest, max(newest - CHAPTERS_PER_PAGE, 0), -1):
+            href = f"{srv.base_url}/manga/stub-{manga_id}/chapter-{num}.{manga_id}{num:04d}/"
+            rows.append(f'<div class="flex" data-chapter-number="{num}"><a href="{href}">'
+                        f'<span>Chapter {num}</span></a></div>')
+        self._send(200, "\n".join(rows))
+
+    # --- POST (HOST GAMBAR) ---
+
+    def do_POST(self):
+        body = self._read_body()
+        if self._inject_faults():
+            return
+        srv = self.server
+        path = urlsplit(self.path).path
+        ext = ".jpg"
+        match = re.search(rb'filename="[^"]*?(\.[A-Za-z0-9]+)"', body[:2048])
+        if match:
+            ext = match.group(1).decode().lower()
+
+        if path == "/user/api.php":
+            srv.count("upload.catbox")
+            name = f"{srv.next_upload_id():06x}{ext}"
+            return self._send(200, f"{srv.base_url}/files.catbox.moe/{name}", "text/plain")
+
+        if path == "/upload":
+            srv.count("upload.telegraph")
+            name = f"{srv.next_upload_id():06x}{ext}"
+            return self._send(200, json.dumps([{"src": f"/telegra.ph/file/{name}"}]), "application/json")
+
+        srv.count("not_found")
+        self._send(404, "Not Found", "text/plain")
+
+def start_stub_server(port=0, **faults):
+    """Menyalakan stub di thread latar. Return server (server.base_url, server.shutdown())."""
+    server = StubServer(port, **faults)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    print("=== MONSTA STUB SERVER: IKIRU / CDN / CATBOX / TELEGRAPH LOKAL ===")
+    port = int(input(f"[?] Port [{DEFAULT_PORT}] : ").strip() or DEFAULT_PORT)
+    latency = float(input(f"[?] Latency ms [{LATENCY_MS}] : ").strip() or LATENCY_MS)
+    jitter = float(input(f"[?] Jitter ms [{JITTER_MS}] : ").strip() or JITTER_MS)
+    error_rate = float(input(f"[?] Rasio 5xx 0-1 [{ERROR_RATE}] : ").strip() or ERROR_RATE)
+    throttle_rate = float(input(f"[?] Rasio 429 0-1 [{THROTTLE_RATE}] : ").strip() or THROTTLE_RATE)
+
+    server = start_stub_server(port, latency_ms=latency, jitter_ms=jitter,
+                               error_rate=error_rate, throttle_rate=throttle_rate)
+    base = server.base_url
+    print(f"[READY] Stub aktif di {base}")
+    print(f"        MONSTA_SOURCE_BASE={base}")
+    print(f"        MONSTA_CATBOX_API={base}/user/api.php")
+    print(f"        MONSTA_TELEGRAPH_BASE={base}")
+    print(f"        MONSTA_TELEGRAPH_API={base}")
+    try:
+        while True:
+            time.sleep(REPORT_EVERY or 3600)
+            if REPORT_EVERY:
+                print(server.throughput_report())
+    except KeyboardInterrupt:
+        print("\n" + server.throughput_report())
+        server.shutdown()
@@ -0,0 +1,155 @@
+import io
+import os
+import threading
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from PIL import Image
+
+# ==============================================================================
+# MONSTA TRANSCODE: TAHAP KONVERSI GAMBAR DI PROCESS POOL (V1.0)
+# ------------------------------------------------------------------------------
+# 1. PROCESS POOL: Decode -> RGB -> encode Pillow berjalan di semua core,
+#    bukan inline di thread utama yang juga menunggu jaringan.
+# 2. FORMAT TUJUAN: JPEG / WebP / AVIF (MONSTA_TRANSCODE_FORMAT).
+# 3. SIZE CAP: Hasil yang melebihi batas host diturunkan kualitasnya lalu
+#    diperkecil bertahap, menggantikan penolakan keras 5 MB.
+# 4. PASS-THROUGH: Sumber yang formatnya sudah diterima dan ukurannya di
+#    bawah batas dikirim apa adanya (tanpa decode, tanpa lompat proses).
+# 5. NON-BLOCKING: submit_transcode() mengembalikan Future; panel pipeline
+#    meneruskan hasilnya ke kolam upload begitu selesai.
+# ==============================================================================
+
+# Format tujuan saat konversi wajib dilakukan ("" = pertahankan format sumber jika diterima)
+TRANSCODE_FORMAT = os.environ.get("MONSTA_TRANSCODE_FORMAT", "").strip().lower()
+TRANSCODE_QUALITY = int(os.environ.get("MONSTA_TRANSCODE_QUALITY", 85))
+TRANSCODE_WORKERS = int(os.environ.get("MONSTA_TRANSCODE_WORKERS", max(1, os.cpu_count() or 1)))
+
+MIN_QUALITY = 50                # Batas bawah tangga kualitas
+QUALITY_STEP = 10
+DOWNSCALE_FACTOR = 0.85         # Per langkah perkecilan dimensi
+MAX_DOWNSCALES = 6
+
+MB = 1024 * 1024
+CATBOX_MAX_BYTES = 200 * MB
+TELEGRAPH_MAX_BYTES = 5 * MB
+
+WEB_FORMATS = frozenset({"jpeg", "png", "gif", "webp", "avif"})
+
+# fmt: format keluaran | quality: kualitas awal | max_bytes: batas host |
+# passthrough: format sumber yang boleh dikirim tanpa konversi
+TranscodeProfile = namedtuple("TranscodeProfile", ["fmt", "quality", "max_bytes", "passthrough"])
+
+# Catbox: tanpa konversi selama di bawah batas, kecuali format tujuan dipaksa via env
+CATBOX_PROFILE = TranscodeProfile(
+    fmt=TRANSCODE_FORMAT or "jpeg",
+    quality=TRANSCODE_QUALITY,
+    max_bytes=int(float(os.environ.get("MONSTA_TRANSCODE_MAX_MB", CATBOX_MAX_BYTES / MB)) * MB),
+    passthrough=frozenset({TRANSCODE_FORMAT}) if TRANSCODE_FORMAT else WEB_FORMATS,
+)
+# Telegraph: hanya JPEG yang lolos whitelist (fix Error 400)
+TELEGRAPH_PROFILE = TranscodeProfile(fmt="jpeg", quality=85, max_bytes=TELEGRAPH_MAX_BYTES,
+                                     passthrough=frozenset({"jpeg"}))
+
+EXTENSIONS = {"jpeg": "jpg", "png": "png", "gif": "gif", "webp": "webp", "avif": "avif"}
+PIL_FORMATS = {"jpeg": "JPEG", "webp": "WEBP", "avif": "AVIF"}
+
+def sniff_format(img_bytes):
+    """Format gambar dari magic bytes (tanpa decode). None jika tidak dikenal."""
+    head = img_bytes[:16]
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "avif"
+    return None
+
+def extension_for(img_bytes, default="jpg"):
+    return EXTENSIONS.get(sniff_format(img_bytes), default)
+
+def needs_transcode(img_bytes, profile):
+    return sniff_format(img_bytes) not in profile.passthrough or len(img_bytes) > profile.max_bytes
+
+def _encoder_available(fmt):
+    Image.init()
+    return PIL_FORMATS.get(fmt) in Image.SAVE
+
+def _encode(img, fmt, quality):
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        img.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    elif fmt == "webp":
+        img.save(buffer, format="WEBP", quality=quality, method=4)
+    else:
+        img.save(buffer, format="AVIF", quality=quality)
+    return buffer.getvalue()
+
+def transcode_image(img_bytes, profile):
+    """
+    Dijalankan di proses worker. Return biner hasil konversi yang muat di
+    profile.max_bytes, atau None jika tetap terlalu besar setelah semua langkah.
+    """
+    fmt = profile.fmt
+    if not _encoder_available(fmt):
+        # Pillow tanpa encoder AVIF: WebP adalah pengganti terdekat
+        fmt = "webp" if _encoder_available("webp") else "jpeg"
+
+    img = Image.open(io.BytesIO(img_bytes))
+    # Handle transparansi: JPEG tidak punya kanal alpha
+    if fmt == "jpeg" and img.mode != "RGB":
+        img = img.convert("RGB")
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+
+    for _ in range(MAX_DOWNSCALES + 1):
+        quality = profile.quality
+        while True:
+            out = _encode(img, fmt, quality)
+            if len(out) <= profile.max_bytes:
+                return out
+            if quality - QUALITY_STEP < MIN_QUALITY:
+                break
+            quality -= QUALITY_STEP
+        # Kualitas minimum masih terlalu besar: perkecil dimensi
+        width, height = img.size
+        img = img.resize((max(1, int(width * DOWNSCALE_FACTOR)), max(1, int(height * DOWNSCALE_FACTOR))),
+                         Image.LANCZOS)
+    return None
+
+# --- PROCESS POOL BERSAMA ---
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: proses anak tidak mewarisi thread browser/upload milik induk
+            _pool = ProcessPoolExecutor(max_workers=TRANSCODE_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def submit_transcode(img_bytes, profile):
+    """Return Future berisi biner siap upload (None = melebihi batas). Pass-through tanpa proses."""
+    if not needs_transcode(img_bytes, profile):
+        future = Future()
+        future.set_result(img_bytes)
+        return future
+    return get_pool().submit(transcode_image, img_bytes, profile)
+
+def transcode_panel(img_bytes, profile):
+    """Versi blocking dari submit_transcode (dipakai uploader sekuensial)."""
+    return submit_transcode(img_bytes, profile).result()
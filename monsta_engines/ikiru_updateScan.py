@@ -0,0 +1,69 @@
+import os
+import json
+from ikiru_seriesStore import SeriesStore
+from ikiru_chapterKey import extract_number
+
+# ==============================================================================
+# MONSTA UPDATE SCAN: DETEKSI PERUBAHAN DARI LISTING (V1.0)
+# ------------------------------------------------------------------------------
+# 1. MODAL LISTING SAJA: Crawler sudah mencatat 'last_chapter_str' per judul
+#    dari /project/?the_page=X (sekitar 6 halaman untuk 121 judul).
+# 2. BANDINGKAN LOKAL: Chapter terbaru di listing vs ch_num tertinggi di
+#    database lokal (layout single maupun manifest sharded).
+# 3. ANTRIKAN YANG BERUBAH: Hanya judul yang tertinggal (atau belum punya
+#    database) yang laman detailnya perlu dibuka.
+# 4. STREAMING: ch_num tertinggi dibaca via SeriesStore.latest_chapter()
+#    (ikiru_jsonSummary), file seri tidak di-parse penuh.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TARGET_LIST_FILE = os.path.join(BASE_DIR, "..", "target_list.json")
+DATABASE_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "database")
+
+def latest_local_chapter(slug, database_dir=DATABASE_DIR):
+    """ch_num tertinggi di database lokal (single/sharded), atau None jika belum ada/korup."""
+    store = SeriesStore(slug, database_dir)
+    if not store.exists():
+        return None
+    try:
+        # Streaming: hanya ch_num yang dibaca, link gambar dilompati
+        return store.latest_chapter()
+    except Exception:
+        return None
+
+def find_changed_targets(targets, database_dir=DATABASE_DIR, verbose=True):
+    """
+    Mengembalikan target yang perlu dikunjungi:
+    - listing tidak punya info chapter (N/A) -> tidak bisa dibandingkan, ikut diantrikan
+    - database lokal belum ada / kosong
+    - chapter terbaru di listing > ch_num tertinggi lokal
+    """
+    changed = []
+    for t in targets:
+        listing_str = t.get('last_chapter_str') or "N/A"
+        local_max = latest_local_chapter(t['slug'], database_dir)
+
+        if listing_str == "N/A":
+            reason = "listing tanpa info chapter"
+        elif local_max is None:
+            reason = "database lokal belum ada"
+        elif extract_number(listing_str) > local_max:
+            reason = f"listing {extract_number(listing_str)} > lokal {local_max}"
+        else:
+            continue
+
+        changed.append(t)
+        if verbose:
+            print(f"    [UPDATE] {t['title']} ({reason})")
+
+    if verbose:
+        print(f"[UPDATE SCAN] {len(changed)} dari {len(targets)} judul perlu dipanen.")
+    return changed
+
+if __name__ == "__main__":
+    print("=== MONSTA UPDATE SCAN (LAPORAN KERING) ===")
+    if not os.path.exists(TARGET_LIST_FILE):
+        print("[!] File target_list.json tidak ditemukan.")
+    else:
+        with open(TARGET_LIST_FILE, 'r', encoding='utf-8') as f:
+            find_changed_targets(json.load(f))
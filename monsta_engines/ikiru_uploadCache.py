@@ -0,0 +1,115 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ==============================================================================
+# MONSTA UPLOAD CACHE: BITE YANG SAMA TIDAK PERNAH DIUPLOAD DUA KALI (V1.0)
+# ------------------------------------------------------------------------------
+# 1. CONTENT-ADDRESSED: Kunci = SHA-256 dari biner gambar + nama host.
+# 2. PERSISTEN: Disimpan di SQLite, bertahan antar run & antar crash.
+# 3. CEK SEBELUM UPLOAD: Cover berulang, panel iklan/kredit, dan panel dari
+#    chapter yang gagal di tengah jalan langsung memakai link lama.
+# 4. LRU EVICTION: Jejak file SQLite (halaman terpakai x page_size) dibatasi
+#    MAX_CACHE_DB_BYTES; entri yang paling lama tak dipakai dibuang lebih dulu.
+#    Halaman bebas dipakai ulang SQLite, jadi file tidak tumbuh melewati batas.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime")
+CACHE_DB_FILE = os.path.join(RUNTIME_DIR, "upload_cache.db")
+
+# Anggaran ukuran database cache di disk (default 256 MB ~ 1 juta entri @ ~250 byte)
+MAX_CACHE_DB_BYTES = int(float(os.environ.get("MONSTA_UPLOAD_CACHE_MB", "256")) * 1024 ** 2)
+EVICT_EVERY = 500           # Cek batas setiap 500 entri baru
+
+os.makedirs(RUNTIME_DIR, exist_ok=True)
+
+def content_digest(img_bytes):
+    return hashlib.sha256(img_bytes).hexdigest()
+
+class UploadCache:
+    def __init__(self, db_path=CACHE_DB_FILE, max_bytes=MAX_CACHE_DB_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._inserts = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    host TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (host, digest)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_uploads_lru ON uploads (last_used)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, host, digest):
+        """Return link hosting lama untuk digest ini, atau None."""
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute("SELECT url FROM uploads WHERE host = ? AND digest = ?",
+                                   (host, digest)).fetchone()
+                if row:
+                    conn.execute("UPDATE uploads SET last_used = ? WHERE host = ? AND digest = ?",
+                                 (time.time(), host, digest))
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def put(self, host, digest, url, size):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO uploads (host, digest, url, size, last_used)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (host, digest, url, size, time.time()))
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._inserts += 1
+            due = self._inserts % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def db_bytes(self, conn):
+        """Byte halaman SQLite yang terpakai (halaman freelist tidak dihitung)."""
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def evict(self):
+        """Membuang entri LRU sampai jejak database kembali di bawah anggaran byte. Return jumlah entri dibuang."""
+        conn = self._connect()
+        try:
+            with conn:
+                used = self.db_bytes(conn)
+                if used <= self.max_bytes:
+                    return 0
+                rows = conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+                # Entri berukuran hampir seragam: buang porsi baris sebanding kelebihan halaman
+                victims = min(rows, -(-rows * (used - self.max_bytes) // used))
+                removed = conn.execute("""
+                    DELETE FROM uploads WHERE rowid IN (
+                        SELECT rowid FROM uploads ORDER BY last_used, rowid LIMIT ?
+                    )
+                """, (victims,)).rowcount
+                print(f"      [CACHE] {removed} entri lama dibuang "
+                      f"({used / 1024 ** 2:.1f} MB > batas {self.max_bytes / 1024 ** 2:.1f} MB).")
+            return removed
+        finally:
+            conn.close()
+
+# Instance bersama untuk semua uploader dalam satu proses
+upload_cache = UploadCache()
@@ -0,0 +1,87 @@
+import os
+import io
+import requests
+from ikiru_panelPipeline import UPLOAD_WORKERS
+from ikiru_httpClient import USER_AGENT
+
+# httpx (+h2) opsional: HTTP/2 multiplexing ke host upload
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# requests_toolbelt opsional: body multipart di-stream, bukan dirakit utuh di RAM
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# ==============================================================================
+# MONSTA UPLOAD CLIENT: KONEKSI UPLOAD YANG DIPAKAI ULANG (V1.0)
+# ------------------------------------------------------------------------------
+# 1. POOLED KEEP-ALIVE: Satu client bersama untuk Catbox & Telegraph; TCP+TLS
+#    handshake hanya sekali per koneksi, bukan sekali per panel.
+# 2. POOL = KONKURENSI: Ukuran kolam mengikuti UPLOAD_WORKERS x judul paralel.
+# 3. HTTP/2 (opsional): MONSTA_UPLOAD_HTTP2=1 + httpx[http2] terpasang ->
+#    semua upload dimultipleks di atas sedikit koneksi.
+# 4. STREAMING MULTIPART (opsional): requests_toolbelt terpasang -> body
+#    dikirim bertahap dari buffer biner, tanpa salinan body kedua.
+# 5. FALLBACK: Tanpa library opsional tetap requests.Session + HTTPAdapter.
+# ==============================================================================
+
+# Judul diproses paralel (satu tab per core), masing-masing dengan UPLOAD_WORKERS
+UPLOAD_POOL_SIZE = int(os.environ.get("MONSTA_UPLOAD_POOL", UPLOAD_WORKERS * max(1, os.cpu_count() or 1)))
+USE_HTTP2 = os.environ.get("MONSTA_UPLOAD_HTTP2", "0") == "1"
+UPLOAD_TIMEOUT = 60
+
+class UploadClient:
+    def __init__(self, pool_size=UPLOAD_POOL_SIZE, http2=USE_HTTP2):
+        self.pool_size = pool_size
+        self.backend = "requests"
+        self._client = None
+
+        if http2 and httpx is not None:
+            try:
+                self._client = httpx.Client(
+                    http2=True,
+                    headers={"User-Agent": USER_AGENT},
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                    timeout=UPLOAD_TIMEOUT,
+                )
+                self.backend = "httpx-h2"
+            except ImportError:
+                # httpx ada tetapi paket h2 tidak: kembali ke requests
+                print("[UPLOAD CLIENT] Paket h2 tidak terpasang, HTTP/2 dimatikan.")
+
+        if self._client is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT})
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._client = session
+
+    def post_file(self, url, field, filename, content, mime="application/octet-stream",
+                  data=None, timeout=UPLOAD_TIMEOUT):
+        """
+        POST multipart satu file. Return response (status_code, text, json(), headers).
+        Aman dipakai sebagai send_fn request_with_retry: body dibangun ulang tiap panggilan.
+        """
+        data = data or {}
+        if self.backend == "httpx-h2":
+            return self._client.post(url, data=data, files={field: (filename, content, mime)}, timeout=timeout)
+
+        if MultipartEncoder is not None:
+            fields = dict(data)
+            fields[field] = (filename, io.BytesIO(content), mime)
+            encoder = MultipartEncoder(fields=fields)
+            return self._client.post(url, data=encoder, headers={"Content-Type": encoder.content_type},
+                                     timeout=timeout)
+
+        return self._client.post(url, data=data, files={field: (filename, content, mime)}, timeout=timeout)
+
+    def close(self):
+        self._client.close()
+
+# Instance bersama untuk semua uploader dalam satu proses
+upload_client = UploadClient()
@@ -2,23 +2,58 @@ import os
 import json
 import time
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from ikiru_compactFormat import serialize, write_precompressed, PRECOMPRESS
+from ikiru_seriesStore import SeriesStore, WAL_DIR, LAYOUT_SINGLE, LAYOUT_SHARDED
+
 # ==============================================================================
 # MONSTA BOT 3: THE MANAGER (V52.5 - PATH FINDER EDITION)
 # ------------------------------------------------------------------------------
 # PRINSIP: NO CHEAP SOLUTIONS - FULL CODE EXECUTION
 # TARGET: Fix WinError 2 & Auto-Push to GitHub
+# INDEXING: Inkremental (manifest mtime/size) + Process Pool untuk file berubah
+# SHARDED: Seri berlayout sharded diindeks dari <slug>/manifest.json saja
+# COMPACT: index.json mengikuti PUBLISH_FORMAT (minified) + sibling .gz/.br opsional
+# STREAMING: Ringkasan katalog dibaca via ikiru_jsonSummary (tanpa parse link gambar)
+# WAL-AWARE: Delta WAL yang belum dikompaksi ikut dirangkum & masuk tanda tangan
 # ==============================================================================
 
 # --- KONFIGURASI PATH ABSOLUT ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_REPO = os.path.abspath(os.path.join(BASE_DIR, "..")) 
 DB_FOLDER = os.path.join(ROOT_REPO, "monstacomics", "database")
+INDEX_MANIFEST = os.path.join(ROOT_REPO, "monstacomics", "runtime", "index_manifest.json")
 
 # Interval Sinkronisasi
 CHECK_INTERVAL = 60 
 
+# Kolam Proses Indexing (dipakai hanya jika file berubah cukup banyak)
+INDEX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PARALLEL_THRESHOLD = 4
+
+def _store_for(filepath):
+    """database/<slug>.json atau database/<slug>/manifest.json -> SeriesStore seri itu."""
+    if os.path.basename(filepath) == "manifest.json":
+        # Layout sharded: slug = nama folder seri
+        shard_dir = os.path.dirname(filepath)
+        return SeriesStore(os.path.basename(shard_dir), os.path.dirname(shard_dir), layout=LAYOUT_SHARDED)
+    slug = os.path.basename(filepath)[:-len(".json")]
+    return SeriesStore(slug, os.path.dirname(filepath), layout=LAYOUT_SINGLE)
+
+def summarize_series_file(filepath):
+    """Merangkum satu database/<slug>.json (+ delta WAL-nya) menjadi entri katalog (jalan di proses terpisah)."""
+    store = _store_for(filepath)
+    summary = store.summary()
+    return {
+        "title": summary.get("title", "Unknown"),
+        "slug": summary.get("slug", store.slug),
+        "cover": summary.get("cover", ""),
+        "last_updated": summary.get("last_updated", "N/A"),
+        "total_chapters": summary["chapter_count"]
+    }
+
 class MonstaManager:
     def __init__(self):
         print(f"--- [SYSTEM START] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
@@ -42,6 +77,31 @@ class MonstaManager:
             print("!"*50 + "\n")
             exit(1)
 
+        self.index_pool = None
+
+    def get_index_pool(self):
+        # Dibuat sekali lalu dipakai ulang tiap siklus (spawn di Windows itu mahal)
+        if self.index_pool is None:
+            self.index_pool = ProcessPoolExecutor(max_workers=INDEX_WORKERS)
+        return self.index_pool
+
+    def load_manifest(self):
+        if not os.path.exists(INDEX_MANIFEST):
+            return {}
+        try:
+            with open(INDEX_MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            print("      [WARN] Manifest index korup, membangun ulang dari nol.")
+            return {}
+
+    def save_manifest(self, manifest):
+        os.makedirs(os.path.dirname(INDEX_MANIFEST), exist_ok=True)
+        temp_path = INDEX_MANIFEST + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, INDEX_MANIFEST)
+
     def check_git(self):
         """Mengecek apakah perintah git bisa dipanggil."""
         try:
@@ -73,23 +133,56 @@ class MonstaManager:
 
     def create_index(self):
         print("   [STEP 1/3] Memperbarui Katalog (Indexing)...")
-        catalog = []
+        index_path = os.path.join(DB_FOLDER, "index.json")
         try:
-            files = [f for f in os.listdir(DB_FOLDER) if f.endswith(".json") and f != "index.json"]
+            files = []
+            for f in os.listdir(DB_FOLDER):
+                if f.endswith(".json") and f != "index.json":
+                    files.append(f)
+                elif os.path.isfile(os.path.join(DB_FOLDER, f, "manifest.json")):
+                    files.append(f + "/manifest.json")
+
+            # Bandingkan tanda tangan (mtime, size) dengan manifest siklus lalu
+            manifest = self.load_manifest()
+            new_manifest = {}
+            changed = []
             for filename in files:
-                filepath = os.path.join(DB_FOLDER, filename)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    catalog.append({
-                        "title": data.get("title", "Unknown"),
-                        "slug": data.get("slug", filename.replace(".json", "")),
-                        "cover": data.get("cover", ""),
-                        "last_updated": data.get("last_updated", "N/A"),
-                        "total_chapters": len(data.get("chapters", []))
-                    })
+                st = os.stat(os.path.join(DB_FOLDER, filename))
+                sig = [st.st_mtime_ns, st.st_size]
+                # Delta WAL yang belum dikompaksi juga mengubah entri katalog
+                wal_path = os.path.join(WAL_DIR, f"{filename.split('/')[0].removesuffix('.json')}.wal.jsonl")
+                if os.path.exists(wal_path):
+                    wal_st = os.stat(wal_path)
+                    sig += [wal_st.st_mtime_ns, wal_st.st_size]
+                cached = manifest.get(filename)
+                if cached and cached.get("sig") == sig:
+                    new_manifest[filename] = cached
+                else:
+                    changed.append((filename, sig))
+            removed = [f for f in manifest if f not in new_manifest and f not in dict(changed)]
+
+            print(f"      -> {len(changed)} berubah | {len(new_manifest)} dari cache | {len(removed)} terhapus.")
+            if not changed and not removed and os.path.exists(index_path):
+                print("      -> Katalog tidak berubah. Indexing dilewati.")
+                return True
+
+            # Hanya file yang berubah yang dibaca ulang (paralel jika cukup banyak)
+            paths = [os.path.join(DB_FOLDER, filename) for filename, _ in changed]
+            if len(paths) >= PARALLEL_THRESHOLD:
+                entries = list(self.get_index_pool().map(summarize_series_file, paths))
+            else:
+                entries = [summarize_series_file(path) for path in paths]
+            for (filename, sig), entry in zip(changed, entries):
+                new_manifest[filename] = {"sig": sig, "entry": entry}
+
+            catalog = [new_manifest[filename]["entry"] for filename in files]
             catalog.sort(key=lambda x: x["last_updated"], reverse=True)
-            with open(os.path.join(DB_FOLDER, "index.json"), 'w', encoding='utf-8') as f:
-                json.dump(catalog, f, indent=2)
+            text = serialize(catalog, indent=2)
+            with open(index_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            if PRECOMPRESS:
+                write_precompressed(index_path, text)
+            self.save_manifest(new_manifest)
             print(f"      -> Berhasil merangkum {len(catalog)} komik.")
             return True
         except Exception as e:
@@ -0,0 +1,318 @@
+import os
+import time
+import random
+import mimetypes
+import threading
+from pathlib import Path
+from ikiru_uploadCache import upload_cache, content_digest
+from ikiru_rateLimiter import request_with_retry, RETRY_ATTEMPTS
+from ikiru_uploadClient import upload_client
+from ikiru_transcode import sniff_format, TELEGRAPH_PROFILE
+
+# boto3 opsional: target S3-compatible (R2, B2, MinIO, Wasabi, ...)
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+# ==============================================================================
+# MONSTA UPLOADERS: MULTI-BACKEND DENGAN FAILOVER SADAR LATENSI (V1.0)
+# ------------------------------------------------------------------------------
+# 1. BACKEND PLUGGABLE: Catbox, Telegraph, folder lokal, dan S3-compatible
+#    (jika boto3 terpasang) dengan antarmuka upload() yang sama.
+# 2. STATISTIK BERJALAN: Latensi & tingkat error per backend (EWMA).
+# 3. ROUTING: Setiap panel dikirim ke backend paling sehat; gagal -> langsung
+#    pindah ke backend berikutnya, bukan menunggu retry host yang lambat.
+# 4. CIRCUIT BREAKER: Backend yang gagal beruntun diistirahatkan sementara.
+# 5. CACHE PER BACKEND: Kunci upload cache = nama host backend + SHA-256.
+# 6. FORMAT GUARD: Backend hanya dipilih jika format biner (magic bytes) ada
+#    di whitelist-nya; panel WebP tidak dikirim ke Telegraph (Error 400).
+#
+# Urutan & daftar backend: MONSTA_UPLOAD_BACKENDS="catbox,telegraph,local,s3"
+# (default hanya catbox = perilaku lama).
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+UPLOAD_BACKENDS = [name.strip() for name in os.environ.get("MONSTA_UPLOAD_BACKENDS", "catbox").split(",")
+                   if name.strip()]
+
+# --- ENDPOINT CATBOX (bisa dialihkan ke stub lokal) ---
+CATBOX_API_DEFAULT = "https://catbox.moe/user/api.php"
+CATBOX_API_URL = os.environ.get("MONSTA_CATBOX_API", CATBOX_API_DEFAULT)
+# Link hasil stub tidak boleh tercampur dengan link Catbox asli di upload cache
+CATBOX_CACHE_HOST = "catbox" if CATBOX_API_URL == CATBOX_API_DEFAULT else "catbox-stub"
+
+# --- ENDPOINT TELEGRAPH (bisa dialihkan ke stub lokal) ---
+TELEGRAPH_BASE = os.environ.get("MONSTA_TELEGRAPH_BASE", "https://telegra.ph").rstrip("/")
+TELEGRAPH_CACHE_HOST = "telegraph" if TELEGRAPH_BASE == "https://telegra.ph" else "telegraph-stub"
+TELEGRAPH_MAX_BYTES = 5 * 1024 * 1024
+
+# --- TARGET LOKAL (folder yang disajikan web server sendiri) ---
+LOCAL_UPLOAD_DIR = os.environ.get("MONSTA_LOCAL_UPLOAD_DIR",
+                                  os.path.join(BASE_DIR, "..", "monstacomics", "runtime", "panels"))
+LOCAL_PUBLIC_BASE = os.environ.get("MONSTA_LOCAL_PUBLIC_BASE",
+                                   Path(os.path.abspath(LOCAL_UPLOAD_DIR)).as_uri()).rstrip("/")
+
+# --- TARGET S3-COMPATIBLE ---
+S3_BUCKET = os.environ.get("MONSTA_S3_BUCKET", "")
+S3_ENDPOINT = os.environ.get("MONSTA_S3_ENDPOINT") or None
+S3_PREFIX = os.environ.get("MONSTA_S3_PREFIX", "panels").strip("/")
+S3_PUBLIC_BASE = os.environ.get("MONSTA_S3_PUBLIC_BASE", "").rstrip("/")
+
+# --- STATISTIK & ROUTING ---
+EWMA_ALPHA = 0.2                # Bobot sampel terbaru
+ERROR_PENALTY = 10.0            # Skor = latensi x (1 + penalti x error rate)
+BREAKER_THRESHOLD = 3           # Gagal beruntun sebelum backend diistirahatkan
+BREAKER_COOLDOWN = 60.0         # Detik istirahat
+EXPLORE_RATE = 0.05             # Sebagian kecil panel menguji backend lain
+FAILOVER_ATTEMPTS = 2           # Retry per backend jika masih ada backend cadangan
+
+class BackendStats:
+    """Latensi & error rate berjalan (EWMA) untuk satu backend."""
+
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        self.uploads = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, ok, elapsed):
+        with self._lock:
+            # Waktu yang habis untuk upload gagal (timeout, retry) ikut dihitung sebagai latensi
+            self.latency = elapsed if self.latency is None else \
+                EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * self.latency
+            if ok:
+                self.uploads += 1
+                self.failures = 0
+            else:
+                self.errors += 1
+                self.failures += 1
+                if self.failures >= BREAKER_THRESHOLD:
+                    self.open_until = time.monotonic() + BREAKER_COOLDOWN
+            self.error_rate = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+
+    def available(self):
+        return time.monotonic() >= self.open_until
+
+    def score(self):
+        # Backend yang belum pernah dipakai dianggap secepat apa pun: dicoba lebih dulu
+        return (self.latency or 0.0) * (1 + ERROR_PENALTY * self.error_rate)
+
+    def snapshot(self):
+        return {
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "uploads": self.uploads,
+            "errors": self.errors,
+            "open": not self.available(),
+        }
+
+# --- BACKEND ---
+
+class UploadBackend:
+    """Antarmuka backend: send() return URL publik atau None."""
+
+    name = "base"
+    cache_host = "base"
+    max_bytes = None
+    formats = None              # Format yang diterima host (None = semua)
+
+    def __init__(self):
+        self.attempts = RETRY_ATTEMPTS
+        self.stats = BackendStats()
+
+    def accepts(self, img_bytes):
+        if self.max_bytes is not None and len(img_bytes) >= self.max_bytes:
+            return False
+        return self.formats is None or sniff_format(img_bytes) in self.formats
+
+    def owns(self, url):
+        """True jika url adalah link hasil backend ini."""
+        raise NotImplementedError
+
+    def send(self, img_bytes, filename, mime):
+        raise NotImplementedError
+
+class CatboxBackend(UploadBackend):
+    name = "catbox"
+    cache_host = CATBOX_CACHE_HOST
+
+    def owns(self, url):
+        return "catbox.moe" in url
+
+    def send(self, img_bytes, filename, mime):
+        # Payload Standar Catbox (Anonim): userhash kosong tetap menghasilkan link abadi
+        payload = {'reqtype': 'fileupload', 'userhash': ''}
+        response = request_with_retry(upload_client.post_file, CATBOX_API_URL, 'fileToUpload', filename,
+                                      img_bytes, mime, data=payload, timeout=60, attempts=self.attempts)
+        if response.status_code != 200:
+            print(f"      [FAILURE] Catbox Server Error (Status {response.status_code})")
+            return None
+        # Catbox mengembalikan URL mentah (text/plain) di body
+        result_url = response.text.strip()
+        if not result_url.startswith("http"):
+            print(f"      [FAILURE] Respon Catbox Aneh: {result_url}")
+            return None
+        return result_url
+
+class TelegraphBackend(UploadBackend):
+    name = "telegraph"
+    cache_host = TELEGRAPH_CACHE_HOST
+    max_bytes = TELEGRAPH_MAX_BYTES
+    formats = TELEGRAPH_PROFILE.passthrough     # Hanya JPEG (sama dengan konversi Bot V1)
+
+    def owns(self, url):
+        return url.startswith(TELEGRAPH_BASE)
+
+    def send(self, img_bytes, filename, mime):
+        response = request_with_retry(upload_client.post_file, f"{TELEGRAPH_BASE}/upload", 'file', filename,
+                                      img_bytes, mime, timeout=60, attempts=self.attempts)
+        if response.status_code != 200:
+            print(f"      [FAILURE] Telegraph menolak (Status {response.status_code}): {response.text[:150]}")
+            return None
+        try:
+            res_json = response.json()
+            return TELEGRAPH_BASE + res_json[0]['src']
+        except (ValueError, LookupError, TypeError):
+            print(f"      [FAILURE] Respon Telegraph bukan JSON valid. Raw: {response.text[:150]}")
+            return None
+
+class LocalBackend(UploadBackend):
+    """Menyalin panel ke folder lokal (content-addressed) yang disajikan web server sendiri."""
+
+    name = "local"
+    cache_host = "local"
+
+    def __init__(self, root=LOCAL_UPLOAD_DIR, public_base=LOCAL_PUBLIC_BASE):
+        super().__init__()
+        self.root = root
+        self.public_base = public_base
+        os.makedirs(self.root, exist_ok=True)
+
+    def owns(self, url):
+        return url.startswith(self.public_base)
+
+    def send(self, img_bytes, filename, mime):
+        ext = os.path.splitext(filename)[1] or ".bin"
+        name = content_digest(img_bytes)[:32] + ext
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(img_bytes)
+            os.replace(temp_path, path)
+        return f"{self.public_base}/{name}"
+
+class S3Backend(UploadBackend):
+    """Bucket S3-compatible; objek dibaca publik lewat MONSTA_S3_PUBLIC_BASE (CDN/bucket URL)."""
+
+    name = "s3"
+
+    def __init__(self, bucket=S3_BUCKET, endpoint=S3_ENDPOINT, public_base=S3_PUBLIC_BASE):
+        super().__init__()
+        if boto3 is None:
+            raise RuntimeError("boto3 tidak terpasang")
+        if not bucket or not public_base:
+            raise RuntimeError("MONSTA_S3_BUCKET & MONSTA_S3_PUBLIC_BASE wajib diisi")
+        self.bucket = bucket
+        self.public_base = public_base
+        self.cache_host = f"s3:{bucket}"
+        self._client = boto3.client("s3", endpoint_url=endpoint)
+
+    def owns(self, url):
+        return url.startswith(self.public_base)
+
+    def send(self, img_bytes, filename, mime):
+        ext = os.path.splitext(filename)[1] or ".bin"
+        key = f"{S3_PREFIX}/{content_digest(img_bytes)[:32]}{ext}".lstrip("/")
+        self._client.put_object(Bucket=self.bucket, Key=key, Body=img_bytes, ContentType=mime)
+        return f"{self.public_base}/{key}"
+
+BACKEND_TYPES = {
+    "catbox": CatboxBackend,
+    "telegraph": TelegraphBackend,
+    "local": LocalBackend,
+    "s3": S3Backend,
+}
+
+def build_backends(names=None):
+    backends = []
+    for name in names or UPLOAD_BACKENDS:
+        backend_type = BACKEND_TYPES.get(name)
+        if backend_type is None:
+            print(f"[UPLOADERS] Backend tidak dikenal, dilewati: {name}")
+            continue
+        try:
+            backends.append(backend_type())
+        except Exception as e:
+            print(f"[UPLOADERS] Backend {name} dimatikan: {e}")
+    if not backends:
+        backends.append(CatboxBackend())
+    return backends
+
+# --- ROUTER ---
+
+class UploadRouter:
+    def __init__(self, backends=None):
+        self.backends = backends or build_backends()
+        # Dengan cadangan tersedia, gagal cepat lalu pindah host lebih murah daripada backoff panjang
+        if len(self.backends) > 1:
+            for backend in self.backends:
+                backend.attempts = min(backend.attempts, FAILOVER_ATTEMPTS)
+
+    def ranked(self, img_bytes):
+        """Backend yang boleh dipakai, paling sehat lebih dulu."""
+        candidates = [b for b in self.backends if b.accepts(img_bytes)]
+        ready = sorted((b for b in candidates if b.stats.available()), key=lambda b: b.stats.score())
+        if len(ready) > 1 and random.random() < EXPLORE_RATE:
+            # Statistik backend cadangan tetap segar
+            ready.insert(0, ready.pop(random.randrange(1, len(ready))))
+        # Backend yang sedang diistirahatkan tetap jadi pilihan terakhir
+        return ready + [b for b in candidates if not b.stats.available()]
+
+    def owns(self, url):
+        """True jika url sudah berada di salah satu backend aktif (cover tidak perlu diupload ulang)."""
+        return bool(url) and any(b.owns(url) for b in self.backends)
+
+    def upload(self, img_bytes, filename="image.webp"):
+        digest = content_digest(img_bytes)
+        candidates = self.ranked(img_bytes)
+        if not candidates:
+            print(f"      [FAILURE] Tidak ada backend yang menerima {len(img_bytes)} bytes.")
+            return None
+
+        # Cek Cache: biner identik di backend mana pun tidak perlu dikirim ulang
+        for backend in candidates:
+            cached_url = upload_cache.get(backend.cache_host, digest)
+            if cached_url:
+                print(f"      [CACHE HIT] Biner sudah pernah diupload ({backend.name}): {cached_url}")
+                return cached_url
+
+        mime = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        for backend in candidates:
+            print(f"      [UPLOAD] Mengirim {len(img_bytes)} bytes ke {backend.name}...")
+            start = time.monotonic()
+            try:
+                result_url = backend.send(img_bytes, filename, mime)
+            except Exception as e:
+                print(f"      [ERROR] Kendala koneksi {backend.name}: {e}")
+                result_url = None
+            backend.stats.record(bool(result_url), time.monotonic() - start)
+
+            if result_url:
+                print(f"      [SUCCESS] Link {backend.name} Tercipta: {result_url}")
+                upload_cache.put(backend.cache_host, digest, result_url, len(img_bytes))
+                return result_url
+            if backend is not candidates[-1]:
+                print(f"      [FAILOVER] {backend.name} gagal, pindah ke backend berikutnya.")
+        return None
+
+    def snapshot(self):
+        return {b.name: b.stats.snapshot() for b in self.backends}
+
+# Instance bersama untuk semua worker dalam satu proses
+upload_router = UploadRouter()
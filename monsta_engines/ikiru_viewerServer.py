@@ -0,0 +1,379 @@
+import io
+import os
+import re
+import json
+import zlib
+import struct
+import hashlib
+import zipfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Pillow opsional: tanpa Pillow endpoint thumbnail mengirim gambar penuh
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# rarfile opsional: tanpa rarfile arsip .cbr dijawab 501
+try:
+    import rarfile
+except ImportError:
+    rarfile = None
+
+# ==============================================================================
+# MONSTA VIEWER SERVER: BACKEND LOKAL UNTUK viewer.html (V1.0)
+# ------------------------------------------------------------------------------
+# 1. ENDPOINT VIEWER: /api/view-pages?path= (daftar halaman JSON) dan
+#    /api/view-image-full?path=&page= (biner halaman) untuk .cbz / .cbr.
+# 2. INDEX CENTRAL DIRECTORY: Isi zip dibaca sekali per arsip lalu disimpan
+#    (LRU di RAM); halaman diambil langsung lewat byte offset tanpa membuka
+#    ulang zip. Index dipinjam via checkout (refcount); yang tergusur LRU
+#    ditutup setelah pembaca terakhir selesai, bukan saat masih dibaca.
+# 3. THUMBNAIL: /api/view-image-thumb?path=&page= mengirim versi kecil untuk
+#    seekbar, dengan cache LRU di disk (scrub 200 halaman != 200 gambar penuh).
+# 4. CBR (opsional): Arsip RAR via rarfile jika terpasang; tanpa rarfile
+#    RarIndex melempar UnsupportedArchive -> 501.
+# 5. PATH GUARD: Semua path dikunci di dalam LIBRARY_DIR.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+VIEWER_HTML = os.path.join(BASE_DIR, "viewer.html")
+LIBRARY_DIR = os.environ.get("MONSTA_LIBRARY_DIR", os.path.join(BASE_DIR, "..", "monstacomics", "library"))
+THUMB_CACHE_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime", "thumbs")
+
+DEFAULT_PORT = 8780
+MAX_OPEN_ARCHIVES = 64          # Index arsip yang disimpan di RAM
+THUMB_SIZE = (130, 180)         # 2x ukuran kotak seekbar (65x90) untuk layar HiDPI
+THUMB_QUALITY = 70
+THUMB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+IMAGE_CACHE_SECONDS = 86400
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".avif", ".bmp")
+MIME_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".webp": "image/webp",
+              ".gif": "image/gif", ".avif": "image/avif", ".bmp": "image/bmp"}
+
+ZIP_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+def natural_key(name):
+    """'page2' < 'page10' (urutan manusia, bukan urutan string)."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+def is_page(name):
+    base = name.rsplit('/', 1)[-1]
+    return (name.lower().endswith(IMAGE_EXTS) and not base.startswith('.')
+            and not name.startswith('__MACOSX/'))
+
+def mime_of(name):
+    return MIME_TYPES.get(os.path.splitext(name)[1].lower(), "application/octet-stream")
+
+# --- INDEX ARSIP ---
+
+class UnsupportedArchive(Exception):
+    """Format arsip dikenali tetapi tidak bisa dibuka di node ini (dijawab 501)."""
+
+class ZipIndex:
+    """Central directory zip yang sudah dibaca; halaman dibaca per byte offset."""
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            infos = [info for info in zf.infolist() if not info.is_dir() and is_page(info.filename)]
+        self.entries = {info.filename: info for info in infos}
+        self.pages = sorted(self.entries, key=natural_key)
+        self._data_offsets = {}
+        self._file = open(path, 'rb')
+        self._lock = threading.Lock()
+
+    def read(self, name):
+        info = self.entries[name]
+        # Terenkripsi / metode selain stored & deflate: serahkan ke zipfile
+        if info.flag_bits & 0x1 or info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            with zipfile.ZipFile(self.path) as zf:
+                return zf.read(name)
+
+        with self._lock:
+            offset = self._data_offsets.get(name)
+            if offset is None:
+                self._file.seek(info.header_offset)
+                header = ZIP_LOCAL_HEADER.unpack(self._file.read(ZIP_LOCAL_HEADER.size))
+                if header[0] != b"PK\x03\x04":
+                    raise zipfile.BadZipFile(f"Local header rusak: {name}")
+                name_len, extra_len = header[-2], header[-1]
+                offset = self._data_offsets[name] = info.header_offset + ZIP_LOCAL_HEADER.size + name_len + extra_len
+            self._file.seek(offset)
+            raw = self._file.read(info.compress_size)
+
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(raw, -15)
+        return raw
+
+    def close(self):
+        self._file.close()
+
+class RarIndex:
+    def __init__(self, path):
+        if rarfile is None:
+            raise UnsupportedArchive("rarfile tidak terpasang, arsip CBR tidak didukung")
+        self.path = path
+        self._rf = rarfile.RarFile(path)
+        self.pages = sorted((info.filename for info in self._rf.infolist()
+                             if not info.is_dir() and is_page(info.filename)), key=natural_key)
+        self.entries = set(self.pages)
+        self._lock = threading.Lock()
+
+    def read(self, name):
+        with self._lock:
+            return self._rf.read(name)
+
+    def close(self):
+        self._rf.close()
+
+def open_index(path):
+    # Isi file yang menentukan format, bukan ekstensi (.cbz berisi RAR cukup sering)
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic == b"Rar!":
+        return RarIndex(path)
+    return ZipIndex(path)
+
+class ArchiveCache:
+    """
+    LRU index arsip; kunci ikut mtime & ukuran sehingga arsip yang diganti dibaca ulang.
+    Index dipinjam lewat checkout(): index yang tergusur LRU saat masih dibaca thread
+    lain baru ditutup ketika peminjam terakhir mengembalikannya.
+    """
+
+    def __init__(self, max_open=MAX_OPEN_ARCHIVES):
+        self.max_open = max_open
+        self._items = OrderedDict()
+        self._refs = {}             # index -> jumlah peminjam aktif
+        self._retired = set()       # Sudah tergusur, menunggu peminjam terakhir
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self, path):
+        index = self._acquire(path)
+        try:
+            yield index
+        finally:
+            self._release(index)
+
+    def _acquire(self, path):
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            index = self._items.get(key)
+            if index is not None:
+                self._items.move_to_end(key)
+                self._refs[index] = self._refs.get(index, 0) + 1
+                return index
+        index = open_index(path)
+        with self._lock:
+            # Thread lain bisa lebih dulu membuka arsip yang sama
+            if key in self._items:
+                index.close()
+                index = self._items[key]
+                self._items.move_to_end(key)
+            else:
+                self._items[key] = index
+                while len(self._items) > self.max_open:
+                    _, old = self._items.popitem(last=False)
+                    if self._refs.get(old):
+                        self._retired.add(old)
+                    else:
+                        old.close()
+            self._refs[index] = self._refs.get(index, 0) + 1
+        return index
+
+    def _release(self, index):
+        with self._lock:
+            remaining = self._refs[index] - 1
+            if remaining:
+                self._refs[index] = remaining
+                return
+            del self._refs[index]
+            if index not in self._retired:
+                return
+            self._retired.discard(index)
+        index.close()
+
+# --- CACHE THUMBNAIL DI DISK ---
+
+class ThumbCache:
+    def __init__(self, cache_dir=THUMB_CACHE_DIR, max_bytes=THUMB_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total = sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".jpg")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # mtime = waktu terakhir dipakai (atime sering dimatikan di filesystem)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self.total += len(data)
+            if self.total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted((e for e in os.scandir(self.cache_dir) if e.name.endswith(".jpg")),
+                         key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        # Buang yang paling lama tak dipakai sampai tersisa 90% kuota
+        for entry in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self.total = total
+
+def make_thumbnail(img_bytes, size=THUMB_SIZE):
+    img = Image.open(io.BytesIO(img_bytes))
+    # JPEG: decoder langsung menurunkan skala (jauh lebih cepat dari decode penuh)
+    img.draft("RGB", (size[0] * 2, size[1] * 2))
+    img = img.convert("RGB")
+    img.thumbnail(size)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=THUMB_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+# --- SERVER ---
+
+class ViewerServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=DEFAULT_PORT, library_dir=LIBRARY_DIR, host="127.0.0.1"):
+        super().__init__((host, port), _ViewerHandler)
+        self.base_url = f"http://{host}:{self.server_address[1]}"
+        self.library_dir = os.path.realpath(library_dir)
+        self.archives = ArchiveCache()
+        self.thumbs = ThumbCache()
+
+    def resolve(self, rel_path):
+        """Path dari viewer (boleh diawali /files/) -> path absolut di dalam library."""
+        rel_path = rel_path or ""
+        if rel_path.startswith("/files/"):
+            rel_path = rel_path[len("/files/"):]
+        full = os.path.realpath(os.path.join(self.library_dir, rel_path.lstrip("/")))
+        if os.path.commonpath([full, self.library_dir]) != self.library_dir or not os.path.isfile(full):
+            raise FileNotFoundError(rel_path)
+        return full
+
+class _ViewerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", content_type="text/html; charset=UTF-8", headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload), "application/json")
+
+    def _send_image(self, body, content_type):
+        self._send(200, body, content_type, {"Cache-Control": f"public, max-age={IMAGE_CACHE_SECONDS}"})
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        try:
+            if path in ("/", "/viewer.html"):
+                with open(VIEWER_HTML, 'rb') as f:
+                    return self._send(200, f.read())
+            if path == "/api/view-pages":
+                return self._view_pages(query)
+            if path == "/api/view-image-full":
+                return self._view_image(query, thumb=False)
+            if path == "/api/view-image-thumb":
+                return self._view_image(query, thumb=True)
+            self._send_json(404, {"error": "Not Found"})
+        except (FileNotFoundError, KeyError) as e:
+            self._send_json(404, {"error": f"Tidak ditemukan: {e}"})
+        except UnsupportedArchive as e:
+            self._send_json(501, {"error": str(e)})
+        except Exception as e:
+            print(f"[VIEWER ERROR] {self.path}: {e}")
+            self._send_json(500, {"error": str(e)})
+
+    def _view_pages(self, query):
+        archive_path = self.server.resolve(query.get("path", [""])[0])
+        with self.server.archives.checkout(archive_path) as index:
+            pages = index.pages
+        self._send_json(200, pages)
+
+    def _view_image(self, query, thumb):
+        srv = self.server
+        archive_path = srv.resolve(query.get("path", [""])[0])
+        page = query.get("page", [""])[0]
+        # Index dipinjam hanya selama membaca; kirim ke klien sesudah dikembalikan
+        with srv.archives.checkout(archive_path) as index:
+            if page not in index.entries:
+                raise KeyError(page)
+
+            if not thumb or Image is None:
+                data, mime = index.read(page), mime_of(page)
+            else:
+                stat = os.stat(archive_path)
+                key = f"{archive_path}|{stat.st_mtime_ns}|{stat.st_size}|{page}|{THUMB_SIZE[0]}x{THUMB_SIZE[1]}"
+                data, mime = srv.thumbs.get(key), "image/jpeg"
+                if data is None:
+                    data = make_thumbnail(index.read(page))
+                    srv.thumbs.put(key, data)
+        self._send_image(data, mime)
+
+def start_viewer_server(port=0, library_dir=LIBRARY_DIR):
+    """Menyalakan viewer server di thread latar. Return server (server.base_url, server.shutdown())."""
+    server = ViewerServer(port, library_dir)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    print("=== MONSTA VIEWER SERVER: CBZ / CBR LOKAL ===")
+    port = int(input(f"[?] Port [{DEFAULT_PORT}] : ").strip() or DEFAULT_PORT)
+    library_dir = input(f"[?] Folder library [{LIBRARY_DIR}] : ").strip() or LIBRARY_DIR
+
+    server = ViewerServer(port, library_dir)
+    print(f"[READY] Viewer aktif di {server.base_url}/viewer.html?path=/files/<arsip.cbz>")
+    print(f"        Library : {server.library_dir}")
+    print(f"        CBR     : {'aktif' if rarfile else 'mati (pip install rarfile)'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
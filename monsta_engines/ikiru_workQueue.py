@@ -0,0 +1,319 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+
+# ==============================================================================
+# MONSTA COORDINATOR: ANTRIAN KERJA BERSAMA (V1.0 - LEASE ENGINE)
+# ------------------------------------------------------------------------------
+# Pengganti input manual Start ID / End ID:
+# 1. SQLITE QUEUE: Semua node menyewa (lease) judul dari satu file antrian.
+# 2. LEASE + HEARTBEAT: Node aktif memperpanjang sewa secara berkala.
+# 3. AUTO-RELEASE: Sewa yang kedaluwarsa (node crash) kembali ke 'pending'.
+# 4. PULL MODEL: Node yang nganggur otomatis mengambil judul berikutnya,
+#    jadi judul 300 chapter tidak lagi membebani satu range ID saja.
+# 5. PRIORITAS: 'pending' dengan last_scanned tertua dikerjakan lebih dulu.
+# ==============================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TARGET_LIST_FILE = os.path.join(BASE_DIR, "..", "target_list.json")
+RUNTIME_DIR = os.path.join(BASE_DIR, "..", "monstacomics", "runtime")
+QUEUE_DB_FILE = os.path.join(RUNTIME_DIR, "work_queue.db")
+
+LEASE_SECONDS = 600         # Masa sewa satu judul (10 menit)
+HEARTBEAT_INTERVAL = 60     # Perpanjangan sewa tiap 1 menit
+MAX_ATTEMPTS = 3            # Setelah 3x gagal, judul ditandai 'failed'
+
+os.makedirs(RUNTIME_DIR, exist_ok=True)
+
+def default_node_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    def __init__(self, db_path=QUEUE_DB_FILE):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    slug TEXT PRIMARY KEY,
+                    id INTEGER,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    last_scanned TEXT,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def _connect(self):
+        # Koneksi baru per operasi: aman dipakai dari banyak thread & banyak proses
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, conn):
+        # BEGIN IMMEDIATE = kunci tulis sejak awal, mencegah dua node menyewa judul yang sama
+        conn.execute("BEGIN IMMEDIATE")
+
+    # --- KOORDINATOR ---
+
+    def seed(self, targets):
+        """
+        Memasukkan/menyegarkan judul dari target_list.json tanpa merusak sewa aktif.
+        Judul yang sudah ada hanya diperbarui id & payload-nya: status dan attempts
+        dipertahankan (setiap node men-seed saat start, judul 'done' tidak boleh
+        terulang di tengah putaran). Untuk mengulang judul pakai requeue()/requeue_done().
+        """
+        conn = self._connect()
+        try:
+            self._transaction(conn)
+            for t in targets:
+                status = t.get('status') or 'pending'
+                conn.execute("""
+                    INSERT INTO tasks (slug, id, payload, status, last_scanned)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(slug) DO UPDATE SET id = excluded.id, payload = excluded.payload
+                """, (t['slug'], t.get('id'), json.dumps(t, ensure_ascii=False), status, t.get('last_scanned')))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return len(targets)
+
+    def requeue(self, slugs):
+        """Mengembalikan judul tertentu ('done'/'failed'/'pending') ke 'pending' dengan attempts 0."""
+        if not slugs:
+            return 0
+        conn = self._connect()
+        try:
+            marks = ",".join("?" * len(slugs))
+            cur = conn.execute(f"""
+                UPDATE tasks SET status = 'pending', attempts = 0
+                WHERE status != 'leased' AND slug IN ({marks})
+            """, tuple(slugs))
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def requeue_done(self):
+        """Memulai putaran baru: semua judul 'done'/'failed' kembali ke 'pending'."""
+        conn = self._connect()
+        try:
+            cur = conn.execute("""
+                UPDATE tasks SET status = 'pending', attempts = 0
+                WHERE status IN ('done', 'failed')
+            """)
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def summary(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+            leases = conn.execute("""
+                SELECT slug, lease_owner, lease_expires FROM tasks WHERE status = 'leased'
+                ORDER BY lease_expires
+            """).fetchall()
+        finally:
+            conn.close()
+        return {r['status']: r['n'] for r in rows}, [dict(r) for r in leases]
+
+    def export_to_targets(self, targets):
+        """Menulis balik status & last_scanned dari antrian ke list target."""
+        conn = self._connect()
+        try:
+            state = {r['slug']: r for r in conn.execute("SELECT slug, status, last_scanned FROM tasks")}
+        finally:
+            conn.close()
+        for t in targets:
+            row = state.get(t['slug'])
+            if row:
+                t['status'] = 'pending' if row['status'] == 'leased' else row['status']
+                if row['last_scanned']:
+                    t['last_scanned'] = row['last_scanned']
+        return targets
+
+    # --- NODE WORKER ---
+
+    def release_expired(self, conn=None, max_attempts=MAX_ATTEMPTS):
+        """
+        Mengembalikan sewa kedaluwarsa (node crash / mati listrik) ke 'pending'.
+        Aturan sama dengan release(): judul yang sudah MAX_ATTEMPTS kali disewa
+        (misal selalu membuat node hang) ditandai 'failed', bukan disewa ulang selamanya.
+        """
+        own_conn = conn is None
+        conn = conn or self._connect()
+        try:
+            cur = conn.execute("""
+                UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                 lease_owner = NULL, lease_expires = NULL
+                WHERE status = 'leased' AND lease_expires < ?
+            """, (max_attempts, time.time()))
+            if cur.rowcount:
+                print(f"      [QUEUE] {cur.rowcount} sewa kedaluwarsa dilepas (pending, atau failed jika attempts habis).")
+            return cur.rowcount
+        finally:
+            if own_conn:
+                conn.close()
+
+    def lease(self, node_id, lease_seconds=LEASE_SECONDS):
+        """Menyewa satu judul 'pending'. Return dict target atau None jika antrian habis."""
+        conn = self._connect()
+        try:
+            self._transaction(conn)
+            self.release_expired(conn)
+            row = conn.execute("""
+                SELECT slug, payload FROM tasks WHERE status = 'pending'
+                ORDER BY last_scanned IS NOT NULL, last_scanned, id
+                LIMIT 1
+            """).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("""
+                UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                                 attempts = attempts + 1
+                WHERE slug = ?
+            """, (node_id, time.time() + lease_seconds, row['slug']))
+            conn.execute("COMMIT")
+            return json.loads(row['payload'])
+        except Exception:
+            # BEGIN IMMEDIATE yang gagal (database is locked) tidak membuka transaksi:
+            # ROLLBACK tanpa transaksi akan menutupi error kunci aslinya
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, node_id, slugs, lease_seconds=LEASE_SECONDS):
+        if not slugs:
+            return 0
+        conn = self._connect()
+        try:
+            marks = ",".join("?" * len(slugs))
+            cur = conn.execute(f"""
+                UPDATE tasks SET lease_expires = ?
+                WHERE status = 'leased' AND lease_owner = ? AND slug IN ({marks})
+            """, (time.time() + lease_seconds, node_id, *slugs))
+            return cur.rowcount
+        finally:
+            conn.close()
+
+    def complete(self, slug, node_id):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                UPDATE tasks SET status = 'done', last_scanned = ?, lease_owner = NULL,
+                                 lease_expires = NULL, attempts = 0
+                WHERE slug = ? AND lease_owner = ?
+            """, (datetime.now().isoformat(), slug, node_id))
+        finally:
+            conn.close()
+
+    def release(self, slug, node_id, max_attempts=MAX_ATTEMPTS):
+        """Judul gagal: kembali ke 'pending', atau 'failed' jika sudah terlalu sering gagal."""
+        conn = self._connect()
+        try:
+            conn.execute("""
+                UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                 lease_owner = NULL, lease_expires = NULL
+                WHERE slug = ? AND lease_owner = ?
+            """, (max_attempts, slug, node_id))
+        finally:
+            conn.close()
+
+class LeaseHeartbeat:
+    """Thread latar yang memperpanjang sewa semua judul yang sedang dipegang node ini."""
+
+    def __init__(self, work_queue, node_id, interval=HEARTBEAT_INTERVAL):
+        self.work_queue = work_queue
+        self.node_id = node_id
+        self.interval = interval
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease_heartbeat", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def track(self, slug):
+        with self._lock:
+            self._held.add(slug)
+
+    def untrack(self, slug):
+        with self._lock:
+            self._held.discard(slug)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                slugs = list(self._held)
+            try:
+                self.work_queue.heartbeat(self.node_id, slugs)
+            except Exception as e:
+                print(f"      [HEARTBEAT ERROR] {e}")
+
+# --- MODE KOORDINATOR (CLI) ---
+
+def run_coordinator():
+    print("====================================================")
+    print("   MONSTA COORDINATOR: ANTRIAN KERJA BERSAMA (V1.0)")
+    print("====================================================")
+    print(f"[PATH] Antrian : {os.path.abspath(QUEUE_DB_FILE)}")
+
+    if not os.path.exists(TARGET_LIST_FILE):
+        print("[!] ERROR: target_list.json tidak ditemukan!"); return
+
+    with open(TARGET_LIST_FILE, 'r', encoding='utf-8') as f:
+        all_targets = json.load(f)
+
+    work_queue = WorkQueue()
+    print("-" * 60)
+    print("1 = Seed antrian dari target_list.json")
+    print("2 = Laporan status antrian")
+    print("3 = Putaran baru (done/failed -> pending)")
+    print("4 = Tulis balik status & last_scanned ke target_list.json")
+    print("5 = Antrikan ulang slug tertentu (done/failed -> pending)")
+    choice = input("[?] Pilih mode : ").strip()
+
+    if choice == "1":
+        n = work_queue.seed(all_targets)
+        print(f"[QUEUE] {n} judul tersinkron ke antrian.")
+    elif choice == "2":
+        work_queue.release_expired()
+        counts, leases = work_queue.summary()
+        for status, n in sorted(counts.items()):
+            print(f"    {status:<8} : {n}")
+        for lease_row in leases:
+            sisa = int(lease_row['lease_expires'] - time.time())
+            print(f"    [LEASE] {lease_row['slug']} -> {lease_row['lease_owner']} (sisa {sisa}s)")
+    elif choice == "3":
+        print(f"[QUEUE] {work_queue.requeue_done()} judul dikembalikan ke 'pending'.")
+    elif choice == "4":
+        work_queue.export_to_targets(all_targets)
+        with open(TARGET_LIST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(all_targets, f, indent=4, ensure_ascii=False)
+        print(f"[SAVED] Status {len(all_targets)} judul ditulis ke target_list.json.")
+    elif choice == "5":
+        slugs = [s.strip() for s in input("[?] Slug (pisahkan koma) : ").split(",") if s.strip()]
+        print(f"[QUEUE] {work_queue.requeue(slugs)} judul dikembalikan ke 'pending'.")
+    else:
+        print("[!] Mode tidak dikenal.")
+
+if __name__ == "__main__":
+    run_coordinator()